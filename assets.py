@@ -0,0 +1,40 @@
+import os
+import threading
+
+from PyQt5.QtGui import QIcon, QImage, QPixmap, QPixmapCache
+
+ASSET_DIR = "assets"
+# Images on the first screens, decoded while the splash screen is up
+STARTUP_IMAGES = ("eye_closed.png", "eye_open.png")
+
+_images = {}
+_lock = threading.Lock()
+
+
+def asset_path(name):
+    return os.path.join(ASSET_DIR, name)
+
+
+def preload(names=STARTUP_IMAGES):
+    """Decode images ahead of their first use. Safe to call off the UI thread."""
+    for name in names:
+        image = QImage(asset_path(name))
+        with _lock:
+            _images[name] = image
+
+
+def pixmap(name):
+    """Return an asset as a QPixmap, shared through Qt's pixmap cache. UI thread only."""
+    key = "asset:" + name
+    cached = QPixmapCache.find(key)
+    if cached is not None and not cached.isNull():
+        return cached
+    with _lock:
+        image = _images.pop(name, None)
+    result = QPixmap.fromImage(image) if image is not None else QPixmap(asset_path(name))
+    QPixmapCache.insert(key, result)
+    return result
+
+
+def icon(name):
+    return QIcon(pixmap(name))
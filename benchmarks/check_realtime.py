@@ -0,0 +1,87 @@
+"""
+Drive live_updates.RealtimeListener against the local Realtime stand-in
+(fake_realtime.py): INSERT, UPDATE and DELETE events reach the listener,
+events for another restaurant don't, and after the server drops the
+connection the listener reconnects, says so, and keeps receiving.
+
+    python benchmarks/check_realtime.py
+
+Exits non-zero when a check fails.
+"""
+import os
+import sys
+
+from fake_realtime import FakeRealtimeServer
+from run_benchmarks import configure_environment, wait_until
+
+RESTAURANT_ID = 7
+OTHER_RESTAURANT_ID = 8
+# Long enough for one reconnect after MIN_RECONNECT_DELAY
+TIMEOUT = 15.0
+
+
+def check():
+    configure_environment()
+    from PyQt5.QtCore import QCoreApplication
+    from live_updates import RealtimeListener
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    server = FakeRealtimeServer().start()
+    # The listener finds the stand-in through the same override a developer would use
+    os.environ["REALTIME_URL"] = server.url
+
+    changes, events = [], []
+    listener = RealtimeListener(RESTAURANT_ID, tables=("tables", "inventory"))
+    listener.change.connect(lambda *change: changes.append(change))
+    for name in ("connected", "reconnected", "disconnected"):
+        getattr(listener, name).connect(lambda *args, name=name: events.append(name))
+    listener.start()
+    try:
+        wait_until(lambda: "connected" in events and server.joined("tables") and server.joined("inventory"), TIMEOUT)
+        filters = {table: expression for _, table, expression in server.joins}
+        assert filters == {
+            "tables": f"restaurant_id=eq.{RESTAURANT_ID}",
+            "inventory": f"restaurant_id=eq.{RESTAURANT_ID}",
+        }, filters
+        print("joined both channels")
+
+        item = {"item_id": 1, "restaurant_id": RESTAURANT_ID, "item_name": "Soup", "price": 90.0}
+        server.push("inventory", "INSERT", item)
+        server.push("inventory", "UPDATE", dict(item, price=120.0), {"item_id": 1})
+        server.push("inventory", "INSERT", {"item_id": 2, "restaurant_id": OTHER_RESTAURANT_ID})
+        server.push("tables", "DELETE", old_record={"table_id": 5})
+        wait_until(lambda: len(changes) >= 3, TIMEOUT)
+        app.processEvents()
+        assert changes == [
+            ("inventory", "INSERT", item, {}),
+            ("inventory", "UPDATE", dict(item, price=120.0), {"item_id": 1}),
+            ("tables", "DELETE", {}, {"table_id": 5}),
+        ], changes
+        print("INSERT, UPDATE and DELETE delivered; other restaurant filtered out")
+
+        server.drop()
+        wait_until(lambda: "reconnected" in events and server.joined("inventory"), TIMEOUT)
+        assert events[:3] == ["connected", "disconnected", "reconnected"], events
+        print("reconnected after the connection dropped")
+
+        server.push("tables", "INSERT", {"table_id": 6, "restaurant_id": RESTAURANT_ID})
+        wait_until(lambda: len(changes) == 4, TIMEOUT)
+        assert changes[-1] == ("tables", "INSERT", {"table_id": 6, "restaurant_id": RESTAURANT_ID}, {}), changes[-1]
+        print("changes delivered after the reconnect")
+    finally:
+        listener.stop()
+        server.stop()
+
+
+def main():
+    try:
+        check()
+    except (AssertionError, TimeoutError) as e:
+        print(f"FAILED: {e!r}")
+        return 1
+    print("ok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Hold common actions to a round-trip budget, headless against the
+in-process Supabase stand-in: opening the inventory and tables tabs, on a
+new device (empty mirror) and again once the mirror is synced, and
+deleting a menu item.
+
+    python benchmarks/check_round_trips.py
+
+Exits non-zero, listing the calls made, when an action goes over budget.
+"""
+import sys
+
+from run_benchmarks import Fixture, configure_environment, idle, install_fake_client
+
+SIZE = 500
+# Action name -> most Supabase calls it may make. Tab actions are named the
+# way HomeScreen.ensure_tab names them
+BUDGETS = {
+    # Categories, plus the first page of items with its count
+    "open inventory management": 2,
+    "open table management": 1,
+    "delete item": 1,
+}
+WARM_BUDGETS = {
+    # Categories are cached and the page comes from the synced mirror
+    "open inventory management": 0,
+    "open table management": 0,
+}
+
+
+def open_tab(factory, restaurant_id, title):
+    import tracing
+    with tracing.action(f"open {title.lower()}"):
+        tab = factory(restaurant_id)
+    idle(tab.query_runner)
+    return tab
+
+
+def open_tabs(fixture):
+    from inventory import create_inventory_tab
+    from tables import create_table_tab
+    inventory_tab = open_tab(create_inventory_tab, fixture.restaurant_id, "Inventory Management")
+    open_tab(create_table_tab, fixture.restaurant_id, "Table Management")
+    return inventory_tab
+
+
+def check():
+    configure_environment()
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+
+    client = install_fake_client(0.0)
+    app = QApplication.instance() or QApplication(sys.argv)
+    QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+    import tracing
+    from database import inventory_repo, table_repo
+
+    fixture = Fixture(client, SIZE)
+    with tracing.capture() as trace:
+        inventory_tab = open_tabs(fixture)
+        inventory_tab.delete_item(inventory_tab.table_model.item(inventory_tab.table_model.item_id_at(0)))
+        idle(inventory_tab.query_runner)
+    report(trace)
+    trace.check(BUDGETS)
+
+    for repo in (inventory_repo, table_repo):
+        fixture.ensure_synced(repo)
+    with tracing.capture() as trace:
+        open_tabs(fixture)
+    report(trace)
+    trace.check(WARM_BUDGETS)
+
+
+def report(trace):
+    for action in trace.actions:
+        print(action.summary())
+
+
+def main():
+    try:
+        check()
+    except AssertionError as e:  # tracing.RoundTripBudgetExceeded
+        print(f"Over budget:\n{e}")
+        return 1
+    print("ok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Local stand-in for Supabase Realtime, for exercising live_updates.RealtimeListener.
+
+Speaks the slice of the Phoenix channel protocol the listener uses: it
+acknowledges phx_join and heartbeat messages and pushes postgres_changes
+events to every channel that joined for the table. Like Supabase, a
+channel's `column=eq.value` filter is checked against the new record (the
+old one for deletes), and events whose row lacks the column are delivered
+regardless. The server runs its own event loop on a background thread;
+drop() closes every open connection so reconnects can be tested.
+"""
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+
+import websockets
+
+
+def filter_matches(expression, row):
+    if not expression:
+        return True
+    column, _, value = expression.partition("=eq.")
+    return column not in row or str(row[column]) == value
+
+
+class FakeRealtimeServer:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.joins = []  # (topic, table, filter) of every phx_join received
+        self.heartbeats = 0
+        self._channels = {}  # connection -> {topic: (table, filter)}
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/realtime/v1/websocket"
+
+    def start(self):
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        async def serve():
+            self._server = await websockets.serve(self._handle, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+            started.set()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(serve())
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="fake-realtime", daemon=True)
+        self._thread.start()
+        started.wait(5)
+        return self
+
+    def stop(self):
+        async def close():
+            self._server.close()
+            await self._server.wait_closed()
+
+        self._call(close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+    def connections(self):
+        with self._lock:
+            return len(self._channels)
+
+    def joined(self, table):
+        """How many open connections have a channel for the table."""
+        with self._lock:
+            return sum(
+                any(joined_table == table for joined_table, _ in channels.values())
+                for channels in self._channels.values()
+            )
+
+    def push(self, table, event_type, record=None, old_record=None):
+        """Send a row change to the channels watching the table. Returns how many got it."""
+        return self._call(self._push(table, event_type, record or {}, old_record or {}))
+
+    def drop(self):
+        """Close every connection, as when the network goes away."""
+        async def close_all():
+            for connection in list(self._channels):
+                await connection.close()
+
+        self._call(close_all())
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(5)
+
+    async def _handle(self, connection):
+        with self._lock:
+            self._channels[connection] = {}
+        try:
+            async for message in connection:
+                message = json.loads(message)
+                if message.get("event") == "phx_join":
+                    config = message["payload"]["config"]["postgres_changes"][0]
+                    with self._lock:
+                        self._channels[connection][message["topic"]] = (config["table"], config.get("filter"))
+                        self.joins.append((message["topic"], config["table"], config.get("filter")))
+                elif message.get("event") == "heartbeat":
+                    self.heartbeats += 1
+                await connection.send(json.dumps({
+                    "topic": message.get("topic"),
+                    "event": "phx_reply",
+                    "payload": {"status": "ok", "response": {}},
+                    "ref": message.get("ref"),
+                    "join_ref": message.get("join_ref"),
+                }))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            with self._lock:
+                self._channels.pop(connection, None)
+
+    async def _push(self, table, event_type, record, old_record):
+        row = old_record if event_type == "DELETE" else record
+        with self._lock:
+            targets = [
+                (connection, topic)
+                for connection, channels in self._channels.items()
+                for topic, (joined_table, expression) in channels.items()
+                if joined_table == table and filter_matches(expression, row)
+            ]
+        for connection, topic in targets:
+            await connection.send(json.dumps({
+                "topic": topic,
+                "event": "postgres_changes",
+                "payload": {
+                    "ids": [],
+                    "data": {
+                        "schema": "public",
+                        "table": table,
+                        "type": event_type,
+                        "commit_timestamp": datetime.now(timezone.utc).isoformat(),
+                        "record": record,
+                        "old_record": old_record,
+                        "columns": [],
+                        "errors": None,
+                    },
+                },
+                "ref": None,
+            }))
+        return len(targets)
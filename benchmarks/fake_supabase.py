@@ -0,0 +1,300 @@
+"""
+In-process stand-in for the Supabase client, for the benchmarks.
+
+Implements the slice of the PostgREST query builder the app uses (select
+with projection and exact counts, eq/neq/gt/gte/lt/lte/in_, the keyset
+`or_` filters built by database.keyset_filter, order with nullsfirst, limit,
+insert, update, upsert and delete) over plain lists of dicts. Every request can be
+delayed by a fixed latency to stand in for the network round trip.
+"""
+import copy
+import itertools
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+PRIMARY_KEYS = {
+    "restaurants": "restaurant_id",
+    "tables": "table_id",
+    "inventory": "item_id",
+    "categories": "category_id",
+}
+VEG_TYPES = ("Veg", "Non-Veg", "Egg")
+CATEGORY_NAMES = ("Starters", "Soups", "Mains", "Breads", "Rice", "Desserts", "Drinks")
+STAMP_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# One term of a logical filter: column.operator.value, the value optionally quoted
+FILTER_TERM = re.compile(r'([\w]+)\.(eq|neq|gt|gte|lt|lte|is)\.("(?:[^"\\]|\\.)*"|[^,()]*)')
+OPERATORS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+    "is": lambda a, b: a is b,
+}
+
+
+class Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def parse_value(text):
+    if text.startswith('"'):
+        return re.sub(r"\\(.)", r"\1", text[1:-1])
+    if text in ("true", "false"):
+        return text == "true"
+    if text == "null":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return text
+
+
+def parse_or(expression):
+    """Turn a PostgREST `or` filter into a predicate over a row."""
+    clauses = []
+    for group, single in re.findall(r'and\(((?:[^()"]|"(?:[^"\\]|\\.)*")*)\)|((?:[^,()"]|"(?:[^"\\]|\\.)*")+)', expression):
+        terms = [(column, OPERATORS[op], parse_value(value)) for column, op, value in FILTER_TERM.findall(group or single)]
+        clauses.append(terms)
+    return lambda row: any(all(test(row.get(column), value) for column, test, value in terms) for terms in clauses)
+
+
+def sort_rows(rows, orders):
+    # Without nullsfirst, Postgres puts NULLs last when ascending and first when descending
+    for column, descending, nullsfirst in reversed(orders):
+        if nullsfirst is None:
+            nullsfirst = descending
+        present = sorted((row for row in rows if row.get(column) is not None), key=lambda row: row[column], reverse=descending)
+        missing = [row for row in rows if row.get(column) is None]
+        rows[:] = missing + present if nullsfirst else present + missing
+    return rows
+
+
+class FakeQuery:
+    def __init__(self, client, table_name):
+        self.client = client
+        self.table_name = table_name
+        self.op = "select"
+        self.columns = "*"
+        self.count = None
+        self.payload = None
+        self.filters = []
+        self.orders = []
+        self.row_limit = None
+
+    def select(self, columns="*", count=None, **_):
+        self.op, self.columns, self.count = "select", columns, count
+        return self
+
+    def insert(self, payload, **_):
+        self.op, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload, **_):
+        self.op, self.payload = "upsert", payload
+        return self
+
+    def update(self, payload, **_):
+        self.op, self.payload = "update", payload
+        return self
+
+    def delete(self, **_):
+        self.op = "delete"
+        return self
+
+    def _filter(self, column, op, value):
+        test = OPERATORS[op]
+        self.filters.append(lambda row: test(row.get(column), value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def or_(self, expression):
+        self.filters.append(parse_or(expression))
+        return self
+
+    def order(self, column, desc=False, nullsfirst=None, **_):
+        self.orders.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size, **_):
+        self.row_limit = size
+        return self
+
+    def execute(self):
+        if self.client.latency:
+            time.sleep(self.client.latency)
+        with self.client.lock:
+            self.client.requests += 1
+            return getattr(self, "_" + self.op)(self.client.rows(self.table_name))
+
+    def _matches(self, rows):
+        return [row for row in rows if all(test(row) for test in self.filters)]
+
+    def _project(self, row):
+        if self.columns.strip() == "*":
+            return copy.deepcopy(row)
+        return {column: copy.deepcopy(row.get(column)) for column in (c.strip() for c in self.columns.split(","))}
+
+    def _select(self, rows):
+        matched = sort_rows(self._matches(rows), self.orders)
+        total = len(matched) if self.count else None
+        if self.row_limit is not None:
+            matched = matched[:self.row_limit]
+        return Response([self._project(row) for row in matched], total)
+
+    def _payloads(self):
+        return self.payload if isinstance(self.payload, list) else [self.payload]
+
+    def _create(self, rows, payload):
+        row = dict(payload)
+        row.setdefault(PRIMARY_KEYS[self.table_name], self.client.next_id())
+        row["updated_at"] = self.client.stamp()
+        rows.append(row)
+        return copy.deepcopy(row)
+
+    def _insert(self, rows):
+        return Response([self._create(rows, payload) for payload in self._payloads()])
+
+    def _upsert(self, rows):
+        primary_key = PRIMARY_KEYS[self.table_name]
+        by_key = {row[primary_key]: row for row in rows}
+        changed = []
+        for payload in self._payloads():
+            existing = by_key.get(payload.get(primary_key))
+            if existing is None:
+                changed.append(self._create(rows, payload))
+            else:
+                existing.update(payload, updated_at=self.client.stamp())
+                changed.append(copy.deepcopy(existing))
+        return Response(changed)
+
+    def _update(self, rows):
+        matched = self._matches(rows)
+        for row in matched:
+            row.update(self.payload, updated_at=self.client.stamp())
+        return Response(copy.deepcopy(matched))
+
+    def _delete(self, rows):
+        matched = self._matches(rows)
+        ids = {id(row) for row in matched}
+        rows[:] = [row for row in rows if id(row) not in ids]
+        return Response(copy.deepcopy(matched))
+
+
+class FakeHttpClient:
+    """Answers the connectivity probe in database.probe()."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def head(self, url, **_):
+        if self.client.latency:
+            time.sleep(self.client.latency)
+
+    def close(self):
+        pass
+
+
+class FakeOptions:
+    def __init__(self, client):
+        self.httpx_client = FakeHttpClient(client)
+
+
+class FakeClient:
+    """Drop-in for supabase.Client: assign it to database._client."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.tables = {name: [] for name in PRIMARY_KEYS}
+        self.options = FakeOptions(self)
+        self.requests = 0
+        self._ids = itertools.count(1)
+        self._stamps = itertools.count(1)
+
+    def table(self, table_name):
+        return FakeQuery(self, table_name)
+
+    def rows(self, table_name):
+        return self.tables.setdefault(table_name, [])
+
+    def next_id(self):
+        return next(self._ids)
+
+    def stamp(self):
+        # Strictly increasing, so delta syncs never miss a write
+        return (STAMP_EPOCH + timedelta(microseconds=next(self._stamps))).isoformat()
+
+    def seed_categories(self):
+        self.tables["categories"] = [
+            {"category_id": number, "category_name": name, "updated_at": self.stamp()}
+            for number, name in enumerate(CATEGORY_NAMES, 1)
+        ]
+
+    def seed_restaurant(self, email, password_hash, items=0, tables=0):
+        """Add a restaurant with the given number of menu items and tables. Returns its id."""
+        if not self.tables["categories"]:
+            self.seed_categories()
+        restaurant_id = self.next_id()
+        self.tables["restaurants"].append({
+            "restaurant_id": restaurant_id,
+            "restaurant_name": f"Benchmark {restaurant_id}",
+            "address": "1 Test Street",
+            "contact": "0123456789",
+            "email": email,
+            "password": password_hash,
+            "updated_at": self.stamp(),
+        })
+        for number in range(1, items + 1):
+            self.tables["inventory"].append({
+                "item_id": self.next_id(),
+                "restaurant_id": restaurant_id,
+                "category_id": number % len(CATEGORY_NAMES) + 1,
+                "is_veg": VEG_TYPES[number % len(VEG_TYPES)],
+                "item_name": f"Dish {number}",
+                "item_desc": f"House special number {number}",
+                "price": 50.0 + number % 400,
+                "is_out_of_stock": number % 17 == 0,
+                "updated_at": self.stamp(),
+            })
+        for number in range(1, tables + 1):
+            table_id = self.next_id()
+            self.tables["tables"].append({
+                "table_id": table_id,
+                "restaurant_id": restaurant_id,
+                "table_number": str(number),
+                "qr_code_data": f"https://example.com/?table={number}&restaurant={restaurant_id}",
+                "updated_at": self.stamp(),
+            })
+        return restaurant_id
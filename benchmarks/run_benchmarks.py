@@ -0,0 +1,419 @@
+"""
+Benchmarks for the app's hot paths, run headless against an in-process
+Supabase stand-in (fake_supabase.py).
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 100 1000 --latency-ms 40 --only inventory
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+
+Every benchmark runs once per data size (menu items and tables per
+restaurant) and is repeated after a warm-up run; results are written to a
+JSON file as milliseconds. With --baseline the medians are compared against
+an earlier results file and the run fails when any of them got slower by
+more than --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+SIZES = (100, 1000, 10000)
+PASSWORD = "benchmark"
+SEARCH_QUERY = "dish 12"
+# Slowest a single run may take before the benchmark is abandoned
+TIMEOUT = 300.0
+# Differences below this are noise, whatever the ratio
+NOISE_FLOOR_MS = 2.0
+
+
+def configure_environment(latency_ms=0.0):
+    """Point the app at throwaway data and cache directories and a headless Qt. Call before importing it."""
+    sys.path.insert(0, REPO_DIR)
+    os.chdir(REPO_DIR)  # Assets are loaded relative to the repository
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    os.environ["ROME_DATA_DIR"] = tempfile.mkdtemp(prefix="rome-bench-data-")
+    os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="rome-bench-cache-")
+    os.environ["SUPABASE_URL"] = "http://127.0.0.1:9"
+    os.environ["SUPABASE_KEY"] = "benchmark"
+    # Nothing listens here, so the realtime listener just keeps backing off
+    os.environ["REALTIME_URL"] = "ws://127.0.0.1:9/"
+    os.environ.pop("ROME_STARTUP_REPORT", None)
+    os.environ["ROME_BENCH_LATENCY_MS"] = str(latency_ms)
+
+
+def install_fake_client(latency_ms):
+    sys.path.insert(0, BENCH_DIR)
+    import database
+    from fake_supabase import FakeClient
+
+    database._client = FakeClient(latency=latency_ms / 1000)
+    return database._client
+
+
+def wait_until(condition, timeout=TIMEOUT):
+    """Run the Qt event loop until condition() holds."""
+    from PyQt5.QtCore import QEventLoop, QTimer
+
+    if condition():
+        return
+    loop = QEventLoop()
+    deadline = time.perf_counter() + timeout
+    timer = QTimer()
+    timer.setInterval(1)
+
+    def check():
+        if condition():
+            loop.quit()
+        elif time.perf_counter() > deadline:
+            loop.exit(1)
+
+    timer.timeout.connect(check)
+    timer.start()
+    failed = loop.exec_()
+    timer.stop()
+    if failed:
+        raise TimeoutError(f"Gave up after {timeout:.0f} s")
+
+
+def idle(runner):
+    wait_until(lambda: not runner.is_busy())
+
+
+def settle():
+    """Let the views handle the resets and repaints queued so far."""
+    from PyQt5.QtWidgets import QApplication
+    QApplication.processEvents()
+
+
+def timed(fn):
+    """Run fn and return how long it took in milliseconds."""
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+class Fixture:
+    """One seeded restaurant and the widgets its benchmarks drive, built on first use."""
+
+    def __init__(self, client, size):
+        import hashlib
+
+        self.size = size
+        self.email = f"bench{size}@example.com"
+        self.restaurant_id = client.seed_restaurant(
+            self.email, hashlib.sha256(PASSWORD.encode()).hexdigest(), items=size, tables=size
+        )
+        self._inventory_tab = None
+        self._table_tab = None
+
+    def _show(self, tab):
+        tab.resize(1280, 800)
+        tab.show()
+        idle(tab.query_runner)
+        return tab
+
+    def inventory_tab(self):
+        if self._inventory_tab is None:
+            from inventory import create_inventory_tab
+            self._inventory_tab = self._show(create_inventory_tab(self.restaurant_id))
+        return self._inventory_tab
+
+    def table_tab(self):
+        if self._table_tab is None:
+            from tables import create_table_tab
+            self._table_tab = self._show(create_table_tab(self.restaurant_id))
+        return self._table_tab
+
+    def ensure_synced(self, repo):
+        from local_store import get_store
+        if not get_store().is_synced(repo.table_name, self.restaurant_id):
+            repo.sync(self.restaurant_id)
+
+
+# Benchmarks: each takes a Fixture, does its own setup and returns the timed part in ms
+
+def load_inventory_cold(fixture):
+    """First page of inventory before the mirror holds it: read from Supabase."""
+    from local_store import get_store
+    tab = fixture.inventory_tab()
+    get_store().reset_sync("inventory")
+    tab.load_inventory()
+    return timed(lambda: idle(tab.query_runner))
+
+
+def load_inventory(fixture):
+    """First page of inventory from a synced mirror, the usual case."""
+    from database import inventory_repo
+    tab = fixture.inventory_tab()
+    fixture.ensure_synced(inventory_repo)
+    return timed(lambda: (tab.load_inventory(), idle(tab.query_runner)))
+
+
+def display_inventory(fixture):
+    """Model reset and search index rebuild for every item at once."""
+    from database import inventory_repo
+    tab = fixture.inventory_tab()
+    fixture.ensure_synced(inventory_repo)
+    items = inventory_repo.page(fixture.restaurant_id, limit=None).rows
+    return timed(lambda: (tab.display_inventory(items), settle()))
+
+
+def filter_inventory(fixture):
+    """Ranking every loaded item against a search query."""
+    tab = fixture.inventory_tab()
+    if tab.table_model.canFetchMore():
+        tab.table_model.fetch_rest()
+        idle(tab.query_runner)
+    tab.search_bar.blockSignals(True)
+    tab.search_bar.setText(SEARCH_QUERY)
+    elapsed = timed(lambda: (tab.filter_inventory(), settle()))
+    tab.search_bar.setText("")
+    tab.search_bar.blockSignals(False)
+    tab.filter_inventory()
+    return elapsed
+
+
+def load_tables_cold(fixture):
+    from local_store import get_store
+    tab = fixture.table_tab()
+    get_store().reset_sync("tables")
+    tab.load_tables()
+    return timed(lambda: idle(tab.query_runner))
+
+
+def load_tables(fixture):
+    from database import table_repo
+    tab = fixture.table_tab()
+    fixture.ensure_synced(table_repo)
+    return timed(lambda: (tab.load_tables(), idle(tab.query_runner)))
+
+
+def download_all_qr_codes(fixture):
+    """ZIP of every table's QR code with nothing cached, so every code is rendered."""
+    from PyQt5.QtWidgets import QFileDialog
+    from qr_cache import qr_cache
+    tab = fixture.table_tab()
+    path = os.path.join(os.environ["ROME_DATA_DIR"], "qr_codes.zip")
+    QFileDialog.getSaveFileName = staticmethod(lambda *args, **kwargs: (path, ""))
+    qr_cache.clear(disk=True)
+    return timed(lambda: (tab.download_all_qr_codes(), idle(tab.query_runner)))
+
+
+class LoginToHome:
+    """From pressing Login to the first tab showing its tables."""
+
+    window = None
+
+    def __call__(self, fixture):
+        if LoginToHome.window is None:
+            import main
+            LoginToHome.window = main.MainWindow()
+            LoginToHome.window.show()
+            wait_until(lambda: LoginToHome.window.login_screen is not None)
+        window = LoginToHome.window
+        login_screen = window.login_screen
+        login_screen.email.setText(fixture.email)
+        login_screen.password.setText(PASSWORD)
+
+        def interactive():
+            home = window.home_screen
+            return home is not None and home.tab_pages[0] is not None and home.tab_pages[0].table_model.rowCount() > 0
+
+        elapsed = timed(lambda: (login_screen.handle_login(), wait_until(interactive)))
+        window.home_screen.logout()
+        return elapsed
+
+
+BENCHMARKS = {
+    "inventory.load_inventory.cold": load_inventory_cold,
+    "inventory.load_inventory": load_inventory,
+    "inventory.display_inventory": display_inventory,
+    "inventory.filter_inventory": filter_inventory,
+    "tables.load_tables.cold": load_tables_cold,
+    "tables.load_tables": load_tables,
+    "tables.download_all_qr_codes": download_all_qr_codes,
+    "session.login_to_home": LoginToHome(),
+}
+STARTUP_BENCHMARK = "startup.main_window_cold"
+
+
+def startup_child():
+    """Entry point of the child process timed by cold_startup()."""
+    configure_environment(float(os.environ.get("ROME_BENCH_LATENCY_MS", "0")))
+    import main  # Starts main.STARTED_AT, before Qt or anything else is imported
+    from PyQt5.QtWidgets import QApplication
+    from startup import StartupReport
+
+    install_fake_client(float(os.environ["ROME_BENCH_LATENCY_MS"]))
+    app = QApplication(sys.argv)
+    report = StartupReport(main.STARTED_AT)
+    window = main.MainWindow(report)
+    window.show()
+    wait_until(lambda: "login shown" in report.marks)
+    print(json.dumps(report.marks))
+    app.quit()
+
+
+def cold_startup(latency_ms):
+    """Import main.py and show the login screen in a fresh interpreter."""
+    env = dict(os.environ, ROME_BENCH_LATENCY_MS=str(latency_ms))
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--startup-child"],
+        env=env, capture_output=True, text=True, timeout=TIMEOUT, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])["login shown"]
+
+
+def summarize(runs):
+    return {
+        "median_ms": round(statistics.median(runs), 2),
+        "min_ms": round(min(runs), 2),
+        "max_ms": round(max(runs), 2),
+        "runs_ms": [round(run, 2) for run in runs],
+    }
+
+
+def counting_round_trips(fn, counts):
+    """Wrap a benchmark so the Supabase calls each run makes are appended to counts."""
+    import tracing
+
+    def counted():
+        with tracing.capture() as trace:
+            elapsed = fn()
+        counts.append(trace.round_trips())
+        return elapsed
+
+    return counted
+
+
+def repeat(fn, times, warmup):
+    for _ in range(warmup):
+        fn()
+    return [fn() for _ in range(times)]
+
+
+def selected(name, only):
+    return not only or any(pattern in name for pattern in only)
+
+
+def run(args):
+    configure_environment(args.latency_ms)
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+
+    client = install_fake_client(args.latency_ms)
+    app = QApplication.instance() or QApplication(sys.argv)
+    # Nobody is there to dismiss message boxes
+    for name in ("information", "warning", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: QMessageBox.Ok))
+
+    results = {}
+    if selected(STARTUP_BENCHMARK, args.only):
+        print(f"{STARTUP_BENCHMARK} ...", flush=True)
+        results[STARTUP_BENCHMARK] = summarize(repeat(lambda: cold_startup(args.latency_ms), args.repeat, args.warmup))
+
+    for size in args.sizes:
+        fixture = None
+        for name, benchmark in BENCHMARKS.items():
+            if not selected(name, args.only):
+                continue
+            fixture = fixture or Fixture(client, size)
+            key = f"{name}[{size}]"
+            print(f"{key} ...", flush=True)
+            counts = []
+            results[key] = summarize(repeat(counting_round_trips(lambda: benchmark(fixture), counts), args.repeat, args.warmup))
+            results[key]["round_trips"] = counts[-1]
+    # Background syncs started by the login benchmark may still be running;
+    # let them finish before the QApplication goes away
+    from workers import query_pool
+    query_pool().waitForDone()
+    app.processEvents()
+
+    return {
+        "meta": {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_ms": args.latency_ms,
+            "repeat": args.repeat,
+            "sizes": args.sizes,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print current medians against the baseline's. Returns the names that regressed."""
+    regressions = []
+    if baseline["meta"].get("latency_ms") != results["meta"]["latency_ms"]:
+        print(f"Note: the baseline was run with --latency-ms {baseline['meta'].get('latency_ms')}")
+    print(f"\n{'benchmark':<44}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, result in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<44}{'-':>12}{result['median_ms']:>10.1f}ms{'new':>10}")
+            continue
+        old, new = before["median_ms"], result["median_ms"]
+        change = (new - old) / old if old else 0.0
+        regressed = change > tolerance and new - old > NOISE_FLOOR_MS
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<44}{old:>10.1f}ms{new:>10.1f}ms{change:>+9.0%}{'  REGRESSION' if regressed else ''}")
+        if before.get("round_trips") is not None and result.get("round_trips") != before["round_trips"]:
+            print(f"{'':<44}round trips {before['round_trips']} -> {result.get('round_trips')}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="rows per table to benchmark with")
+    parser.add_argument("--repeat", type=int, default=5, help="measured runs per benchmark")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured runs before them")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated round trip per request")
+    parser.add_argument("--only", nargs="+", default=[], help="run only benchmarks whose name contains one of these")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the results")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write the results to {DEFAULT_BASELINE}")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="slowdown allowed before a benchmark counts as regressed")
+    parser.add_argument("--startup-child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.startup_child:
+        startup_child()
+        return 0
+
+    results = run(args)
+    for path in [args.output] + ([DEFAULT_BASELINE] if args.save_baseline else []):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    # os._exit skips tearing down the Qt objects and worker threads still around
+    code = main()
+    sys.stdout.flush()
+    os._exit(code)
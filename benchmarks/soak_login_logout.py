@@ -0,0 +1,135 @@
+"""
+Log in and out over and over, headless against the in-process Supabase
+stand-in, and check that nothing piles up: after a few warm-up cycles the
+number of live widgets must stay put, and the thread count and resident
+memory may not grow beyond a small allowance.
+
+    python benchmarks/soak_login_logout.py
+    python benchmarks/soak_login_logout.py --cycles 200 --size 1000
+
+Each cycle logs in, opens every tab, waits for its rows and logs out.
+Exits non-zero when something grew.
+"""
+import argparse
+import gc
+import os
+import resource
+import sys
+import threading
+
+from run_benchmarks import PASSWORD, Fixture, configure_environment, install_fake_client, wait_until
+
+# Idle pool threads come and go, so allow a few on top of the warm-up count
+THREAD_ALLOWANCE = 4
+RSS_ALLOWANCE_MB = 16.0
+
+
+def thread_count():
+    """OS threads in this process; QThreads and Qt's pool threads included where /proc is available."""
+    try:
+        return len(os.listdir("/proc/self/task"))
+    except OSError:
+        return threading.active_count()
+
+
+def rss_mb():
+    """Current resident memory, or the peak where the current figure isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def cycle(window, fixture):
+    from PyQt5.QtCore import QCoreApplication, QEvent
+
+    login_screen = window.login_screen
+    login_screen.email.setText(fixture.email)
+    login_screen.password.setText(PASSWORD)
+    login_screen.handle_login()
+    wait_until(lambda: window.home_screen is not None)
+    home = window.home_screen
+    for index in range(home.tabs.count()):
+        home.tabs.setCurrentIndex(index)
+        page = home.tab_pages[index]
+        if page is not None and hasattr(page, "query_runner"):
+            wait_until(lambda: not page.query_runner.is_busy())
+    wait_until(lambda: not home.sync_service.query_runner.is_busy())
+    home.logout()
+    wait_until(lambda: window.login_screen is not None)
+    # The home screen is gone once its deferred delete has run
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def measure():
+    from PyQt5.QtWidgets import QApplication
+    return {"widgets": len(QApplication.allWidgets()), "threads": thread_count(), "rss_mb": rss_mb()}
+
+
+def soak(args):
+    configure_environment()
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+
+    client = install_fake_client(0.0)
+    app = QApplication.instance() or QApplication(sys.argv)
+    for name in ("information", "warning", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: QMessageBox.Ok))
+    import main
+
+    fixture = Fixture(client, args.size)
+    window = main.MainWindow()
+    window.show()
+    wait_until(lambda: window.login_screen is not None)
+
+    for _ in range(args.warmup):
+        cycle(window, fixture)
+    baseline = measure()
+    print(f"after {args.warmup} warm-up cycle(s): {baseline}")
+    peak = dict(baseline)
+    for number in range(1, args.cycles + 1):
+        cycle(window, fixture)
+        current = measure()
+        peak = {key: max(peak[key], value) for key, value in current.items()}
+        if number % 10 == 0 or number == args.cycles:
+            print(f"cycle {number}: {current}", flush=True)
+
+    from workers import query_pool
+    query_pool().waitForDone()
+    app.processEvents()
+
+    problems = []
+    if current["widgets"] != baseline["widgets"]:
+        problems.append(f"live widgets went from {baseline['widgets']} to {current['widgets']}")
+    if current["threads"] > baseline["threads"] + THREAD_ALLOWANCE:
+        problems.append(f"threads went from {baseline['threads']} to {current['threads']}")
+    if current["rss_mb"] > baseline["rss_mb"] + args.rss_allowance_mb:
+        problems.append(f"resident memory went from {baseline['rss_mb']:.1f} MB to {current['rss_mb']:.1f} MB")
+    return problems
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=50, help="measured login/logout cycles")
+    parser.add_argument("--warmup", type=int, default=5, help="cycles before the baseline is taken")
+    parser.add_argument("--size", type=int, default=500, help="menu items and tables in the restaurant")
+    parser.add_argument("--rss-allowance-mb", type=float, default=RSS_ALLOWANCE_MB, help="memory growth tolerated")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    problems = soak(parse_args(argv))
+    for problem in problems:
+        print(f"LEAK: {problem}")
+    if not problems:
+        print("ok")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    # os._exit skips tearing down the Qt objects and worker threads still around
+    code = main()
+    sys.stdout.flush()
+    os._exit(code)
@@ -0,0 +1,675 @@
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+
+from dotenv import load_dotenv
+
+import tracing
+from local_store import SHARED, get_store
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# supabase and httpx take a noticeable share of startup time to import, so
+# they are only imported when the client is created (behind the splash screen)
+
+# One keep-alive pool shared by every query the app makes
+MAX_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 120
+REQUEST_TIMEOUT, CONNECT_TIMEOUT = 30.0, 10.0
+# How long the startup connectivity check waits before treating us as offline
+PROBE_TIMEOUT = 3.0
+
+# Categories almost never change, so one fetch per hour is plenty
+CATEGORY_CACHE_TTL = float(os.getenv("CATEGORY_CACHE_TTL", "3600"))
+
+# Rows per page when a tab loads its data incrementally
+PAGE_SIZE = int(os.getenv("ROME_PAGE_SIZE", "100"))
+# Supabase caps every response (1000 rows by default), so bigger reads are made in batches
+FETCH_BATCH_SIZE = 1000
+
+_client: Optional["Client"] = None
+_client_lock = threading.Lock()
+# Held while the outbox is replayed and the mirror synced, so two syncs (the
+# timer's and one after a realtime reconnect) never send the same queued write twice
+_sync_lock = threading.RLock()
+
+
+def load_config():
+    """Read the Supabase settings from .env, raising if any are missing."""
+    load_dotenv()
+    missing = [name for name in ("SUPABASE_URL", "SUPABASE_KEY") if not os.getenv(name)]
+    if missing:
+        raise RuntimeError(f"Missing settings: {', '.join(missing)}")
+
+
+def get_client() -> "Client":
+    """Return the shared Supabase client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import httpx
+                from supabase import ClientOptions, create_client
+
+                load_dotenv()
+                supabase_url = os.getenv("SUPABASE_URL")
+                supabase_key = os.getenv("SUPABASE_KEY")
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY,
+                    ),
+                    timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+                    follow_redirects=True,
+                    http2=True,
+                )
+                _client = create_client(supabase_url, supabase_key, ClientOptions(httpx_client=http_client))
+    return _client
+
+
+def probe(timeout: float = PROBE_TIMEOUT) -> bool:
+    """
+    Check that Supabase is reachable. The connection this opens stays in the
+    shared pool, so the first real query skips the DNS and TLS handshake.
+    """
+    client = get_client()
+    try:
+        with tracing.span("rest", "probe"):
+            client.options.httpx_client.head(
+                f"{os.getenv('SUPABASE_URL').rstrip('/')}/rest/v1/",
+                headers={"apikey": os.getenv("SUPABASE_KEY")},
+                timeout=timeout,
+            )
+    except Exception as e:
+        if is_offline_error(e):
+            return False
+        raise
+    return True
+
+
+def close_client():
+    """Close the shared client's connection pool."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.options.httpx_client.close()
+            _client = None
+
+
+Row = Dict[str, Any]
+# (column, descending) pairs that define a sort order
+SortKeys = List[Tuple[str, bool]]
+
+
+class Page(NamedTuple):
+    rows: List[Row]
+    # Sort values of the last row, to pass as `after` for the next page; None on the last page
+    cursor: Optional[tuple]
+    # Total number of rows, counted for the first page only
+    total: Optional[int]
+
+
+def filter_value(value: Any) -> str:
+    """Format a value for a PostgREST logical filter, quoting strings."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return str(value)
+
+
+def equal_term(column: str, value: Any) -> str:
+    """PostgREST filter term for column = value, NULL included."""
+    return f"{column}.is.null" if value is None else f"{column}.eq.{filter_value(value)}"
+
+
+def keyset_filter(keys: SortKeys, after: tuple) -> str:
+    """
+    PostgREST `or` filter matching the rows that sort after `after` in keys
+    order, with NULLs sorting last in either direction (see fetch_sorted).
+    """
+    clauses = []
+    for depth, (column, descending) in enumerate(keys):
+        if after[depth] is None:
+            continue  # Nothing sorts after a NULL in this column
+        equal = [equal_term(previous, value) for (previous, _), value in zip(keys[:depth], after)]
+        for term in (f"{column}.{'lt' if descending else 'gt'}.{filter_value(after[depth])}", f"{column}.is.null"):
+            terms = equal + [term]
+            clauses.append(terms[0] if len(terms) == 1 else f"and({','.join(terms)})")
+    return ",".join(clauses)
+
+
+def is_offline_error(error: Exception) -> bool:
+    """True when a call failed because Supabase could not be reached at all."""
+    if isinstance(error, OSError):
+        return True
+    import httpx
+    return isinstance(error, httpx.TransportError)
+
+
+class Repository:
+    """
+    Base class for table-specific data access.
+
+    Reads are served from the local SQLite mirror, which is filled on first
+    use and kept fresh by sync(). Writes go straight to Supabase when it is
+    reachable and into the local outbox when it is not (or when earlier
+    writes are still queued, so ordering is preserved).
+    """
+
+    table_name = ""
+    primary_key = ""
+    mirror_columns = "*"
+    # Column used for delta syncs; None means the table is re-fetched in full
+    watermark_column: Optional[str] = "updated_at"
+    # SQL over the mirrored JSON `data` column, matching the remote ordering
+    local_order = ""
+    # Ordering used for paging; must end with the primary key so every row has a unique position
+    page_keys: Optional[SortKeys] = None
+
+    def query(self):
+        # Every request goes through here, so this is where calls are traced
+        return tracing.TracedQuery(get_client().table(self.table_name), self.table_name)
+
+    def scope(self, restaurant_id: int) -> int:
+        return restaurant_id
+
+    def scoped(self, query, restaurant_id: int):
+        return query.eq("restaurant_id", restaurant_id)
+
+    def sort_keys(self) -> SortKeys:
+        return self.page_keys or [(self.primary_key, False)]
+
+    def cursor(self, row: Row) -> tuple:
+        return tuple(row[column] for column, _ in self.sort_keys())
+
+    # Mirror
+
+    def fetch_sorted(self, restaurant_id: int, after: Optional[tuple] = None, limit: Optional[int] = None,
+                     with_total: bool = False, since: Optional[str] = None,
+                     columns: Optional[str] = None, keys: Optional[SortKeys] = None) -> Tuple[List[Row], Optional[int]]:
+        """
+        Fetch rows from Supabase in keys order (page_keys by default), starting
+        after the cursor `after`: at most `limit` of them, or all when limit is
+        None. Returns (rows, total); total is None unless with_total is set.
+        """
+        columns = columns or self.mirror_columns
+        keys = keys or self.sort_keys()
+        rows, total = [], None
+        while limit is None or len(rows) < limit:
+            batch = FETCH_BATCH_SIZE if limit is None else min(limit - len(rows), FETCH_BATCH_SIZE)
+            query = self.scoped(self.query().select(columns, count="exact" if with_total else None), restaurant_id)
+            if since is not None and self.watermark_column:
+                query = query.gt(self.watermark_column, since)
+            if after is not None:
+                query = query.or_(keyset_filter(keys, after))
+            for column, descending in keys:
+                # NULLs last both ways, matching keyset_filter, LocalStore.page and the inventory model
+                query = query.order(column, desc=descending, nullsfirst=False)
+            response = query.limit(batch).execute()
+            if with_total:
+                total, with_total = response.count, False
+            fetched = response.data or []
+            rows.extend(fetched)
+            if len(fetched) < batch:
+                break
+            after = tuple(fetched[-1][column] for column, _ in keys)
+        return rows, total
+
+    def fetch_remote(self, restaurant_id: int, since: Optional[str] = None) -> List[Row]:
+        return self.fetch_sorted(restaurant_id, since=since)[0]
+
+    def fetch_remote_keys(self, restaurant_id: int) -> set:
+        rows, _ = self.fetch_sorted(restaurant_id, columns=self.primary_key, keys=[(self.primary_key, False)])
+        return {row[self.primary_key] for row in rows}
+
+    def sync(self, restaurant_id: int, reconcile: bool = False) -> bool:
+        """
+        Pull changes since the last sync into the mirror. Returns True if
+        anything changed. Deletes don't show up in a delta; realtime DELETE
+        events cover them while the app is connected, and `reconcile` also
+        compares every primary key with Supabase to catch the ones it missed.
+        """
+        store = get_store()
+        scope = self.scope(restaurant_id)
+        watermark = store.watermark(self.table_name, scope)
+        delta = self.watermark_column is not None and store.is_synced(self.table_name, scope)
+
+        if not delta:
+            rows = self.fetch_remote(restaurant_id)
+            if store.is_synced(self.table_name, scope):
+                # Full refetches happen on every sync for unstamped tables, so only
+                # report a change when the rows actually differ
+                changed = self._differs(rows, scope)
+            else:
+                # Pages read before the first sync are mirrored already; the tabs
+                # showing them only need reloading if any of those rows changed
+                remote = {row[self.primary_key]: row for row in rows}
+                changed = any(
+                    row[self.primary_key] > 0 and remote.get(row[self.primary_key]) != row
+                    for row in store.rows(self.table_name, scope)
+                )
+            store.replace_rows(self.table_name, self.primary_key, rows, scope)
+        else:
+            rows = self.fetch_remote(restaurant_id, since=watermark)
+            changed = self._differs(rows, scope, full=False)
+            store.upsert_rows(self.table_name, self.primary_key, rows, scope)
+            if reconcile:
+                local_keys = {key for key in store.pks(self.table_name, scope) if key > 0}
+                removed = local_keys - self.fetch_remote_keys(restaurant_id)
+                store.delete_rows(self.table_name, removed)
+                changed = changed or bool(removed)
+
+        if self.watermark_column:
+            stamps = [row[self.watermark_column] for row in rows if row.get(self.watermark_column)]
+            watermark = max(stamps + ([watermark] if watermark else []), default=None)
+        store.set_watermark(self.table_name, scope, watermark)
+        return changed
+
+    def _differs(self, rows: List[Row], scope: int, full: bool = True) -> bool:
+        store = get_store()
+        local = {row[self.primary_key]: row for row in store.rows(self.table_name, scope)}
+        if full and {key for key in local if key > 0} != {row[self.primary_key] for row in rows}:
+            return True
+        return any(local.get(row[self.primary_key]) != row for row in rows)
+
+    def mirror_row(self, row: Row) -> Row:
+        """Drop any columns that aren't part of the mirrored projection."""
+        if self.mirror_columns == "*":
+            return row
+        columns = [column.strip() for column in self.mirror_columns.split(",")]
+        return {column: row[column] for column in columns if column in row}
+
+    def local_rows(self, restaurant_id: int) -> List[Row]:
+        store = get_store()
+        scope = self.scope(restaurant_id)
+        if not store.is_synced(self.table_name, scope):
+            self.sync(restaurant_id)
+        return store.rows(self.table_name, scope, self.local_order)
+
+    def page(self, restaurant_id: int, after: Optional[tuple] = None, limit: Optional[int] = PAGE_SIZE) -> Page:
+        """
+        Return the next `limit` rows in page_keys order after the cursor of the
+        previous page, or every remaining row when limit is None. The first
+        page also carries the total row count.
+        """
+        store = get_store()
+        scope = self.scope(restaurant_id)
+        wanted = None if limit is None else limit + 1  # one extra row tells whether there is another page
+        if store.is_synced(self.table_name, scope):
+            order = [
+                ("pk" if column == self.primary_key else f"json_extract(data, '$.{column}')", descending)
+                for column, descending in self.sort_keys()
+            ]
+            rows = store.page(self.table_name, scope, order, after, wanted)
+            total = store.count(self.table_name, scope) if after is None else None
+        else:
+            # Nothing mirrored yet: read just this page from Supabase instead of
+            # waiting for the whole table, and let the background sync do the rest
+            rows, total = self.fetch_sorted(restaurant_id, after, wanted, with_total=after is None)
+            store.upsert_rows(self.table_name, self.primary_key, rows, scope)
+        if limit is None or len(rows) <= limit:
+            return Page(rows, None, total)
+        rows = rows[:limit]
+        return Page(rows, self.cursor(rows[-1]), total)
+
+    def apply_remote_change(self, event_type: str, record: Row, old_record: Row):
+        """Mirror a change pushed over the realtime channel."""
+        store = get_store()
+        if event_type == "DELETE":
+            if old_record.get(self.primary_key) is not None:
+                store.delete_rows(self.table_name, [old_record[self.primary_key]])
+        elif record.get(self.primary_key) is not None:
+            store.upsert_rows(self.table_name, self.primary_key, [self.mirror_row(record)])
+
+    # Writes
+
+    def write(self, op: str, key: Any, payload: Any, remote) -> List[Row]:
+        """Run `remote` against Supabase, or queue the write if it can't be sent now."""
+        store = get_store()
+        if not store.pending_count(self.table_name):
+            try:
+                rows = remote()
+            except Exception as e:
+                if not is_offline_error(e):
+                    raise
+            else:
+                if op == "delete":
+                    store.delete_rows(self.table_name, [key])
+                elif rows:
+                    store.upsert_rows(self.table_name, self.primary_key, [self.mirror_row(row) for row in rows])
+                return rows
+        return self.queue(op, key, payload)
+
+    def queue(self, op: str, key: Any, payload: Any) -> List[Row]:
+        """Apply a write to the mirror and park it in the outbox."""
+        store = get_store()
+        if op == "insert_many":
+            return [row for data in payload for row in self.queue("insert", None, data)]
+        if op == "upsert_many":
+            return [
+                row
+                for data in payload
+                for row in self.queue(
+                    "update", data[self.primary_key],
+                    {column: value for column, value in data.items() if column != self.primary_key},
+                )
+            ]
+        if op == "update_many":
+            return [row for each_key in key for row in self.queue("update", each_key, payload)]
+        if op == "insert":
+            return [store.insert_local(self.table_name, self.primary_key, payload)]
+        if op == "update":
+            row = store.get(self.table_name, key) or {self.primary_key: key}
+            row.update(payload)
+        else:
+            row = store.get(self.table_name, key)
+            store.delete_rows(self.table_name, [key])
+            if key < 0:
+                # Never reached Supabase, so there is nothing to delete remotely
+                store.drop_pending_for(self.table_name, key)
+            else:
+                store.enqueue(self.table_name, op, key)
+            return [row] if row else []
+
+        store.upsert_rows(self.table_name, self.primary_key, [row])
+        store.enqueue(self.table_name, op, key, payload)
+        return [row]
+
+    def insert(self, data: Row) -> List[Row]:
+        return self.write("insert", None, data, lambda: self.query().insert(data).execute().data)
+
+    def insert_many(self, rows: List[Row]) -> List[Row]:
+        """Insert several rows in one request."""
+        return self.write("insert_many", None, rows, lambda: self.query().insert(rows).execute().data)
+
+    def upsert_many(self, rows: List[Row]) -> List[Row]:
+        """Overwrite several existing rows, identified by primary key, in one request."""
+        return self.write(
+            "upsert_many", None, rows,
+            lambda: self.query().upsert(rows, on_conflict=self.primary_key).execute().data,
+        )
+
+    def update_row(self, key: int, data: Row) -> List[Row]:
+        return self.write(
+            "update", key, data,
+            lambda: self.query().update(data).eq(self.primary_key, key).execute().data,
+        )
+
+    def update_many(self, keys: List[int], data: Row) -> List[Row]:
+        """Apply the same change to several rows in one request."""
+        return self.write(
+            "update_many", keys, data,
+            lambda: self.query().update(data).in_(self.primary_key, keys).execute().data,
+        )
+
+    def delete_row(self, key: int) -> List[Row]:
+        return self.write(
+            "delete", key, None,
+            lambda: self.query().delete().eq(self.primary_key, key).execute().data,
+        )
+
+
+class RestaurantRepository(Repository):
+    table_name = "restaurants"
+    primary_key = "restaurant_id"
+    # Never mirror the password hash to disk
+    mirror_columns = "restaurant_id, restaurant_name, address, contact, email, updated_at"
+
+    def find_by_email(self, email: str) -> Optional[Row]:
+        """Return the profile and password hash of the restaurant registered with this email."""
+        response = self.query().select(f"{self.mirror_columns}, password")\
+            .eq("email", email).execute()
+        return response.data[0] if response.data else None
+
+    def remember_profile(self, restaurant: Row):
+        """Mirror the row fetched at login so the profile needs no query of its own."""
+        store = get_store()
+        row = self.mirror_row(restaurant)
+        store.upsert_rows(self.table_name, self.primary_key, [row])
+        if not store.is_synced(self.table_name, row[self.primary_key]):
+            store.set_watermark(self.table_name, row[self.primary_key], row.get(self.watermark_column))
+
+    def email_exists(self, email: str) -> bool:
+        response = self.query().select("email").eq("email", email).execute()
+        return bool(response.data)
+
+    def create(self, data: Row) -> List[Row]:
+        return self.query().insert(data).execute().data
+
+    def get_profile(self, restaurant_id: int) -> Optional[Row]:
+        rows = self.local_rows(restaurant_id)
+        return rows[0] if rows else None
+
+    def update_profile(self, restaurant_id: int, data: Row) -> List[Row]:
+        return self.update_row(restaurant_id, data)
+
+
+class TableRepository(Repository):
+    table_name = "tables"
+    primary_key = "table_id"
+    mirror_columns = "table_id, restaurant_id, table_number, qr_code_data, updated_at"
+    local_order = "json_extract(data, '$.table_number')"
+    page_keys = [("table_number", False), ("table_id", False)]
+
+    def list(self, restaurant_id: int) -> List[Row]:
+        return self.local_rows(restaurant_id)
+
+    def has_any(self, restaurant_id: int) -> bool:
+        return bool(self.local_rows(restaurant_id))
+
+    def exists(self, restaurant_id: int, table_number: str) -> bool:
+        return any(str(table["table_number"]) == table_number for table in self.local_rows(restaurant_id))
+
+    def existing_numbers(self, restaurant_id: int, table_numbers: List[str]) -> set:
+        """Return which of the given table numbers are already taken, in one query."""
+        try:
+            response = self.query().select("table_number").eq("restaurant_id", restaurant_id)\
+                .in_("table_number", table_numbers).execute()
+            rows = response.data or []
+        except Exception as e:
+            if not is_offline_error(e):
+                raise
+            rows = self.local_rows(restaurant_id)
+        wanted = set(table_numbers)
+        return {str(row["table_number"]) for row in rows} & wanted
+
+    def create(self, data: Row) -> List[Row]:
+        return self.insert(data)
+
+    def create_many(self, rows: List[Row]) -> List[Row]:
+        return self.insert_many(rows)
+
+    def delete(self, table_id: int) -> List[Row]:
+        return self.delete_row(table_id)
+
+
+class InventoryRepository(Repository):
+    table_name = "inventory"
+    primary_key = "item_id"
+    mirror_columns = "item_id, restaurant_id, category_id, is_veg, item_name, item_desc, price, is_out_of_stock, updated_at"
+    local_order = (
+        "json_extract(data, '$.category_id') IS NULL, json_extract(data, '$.category_id'), "
+        "json_extract(data, '$.is_veg') IS NULL, json_extract(data, '$.is_veg') DESC"
+    )
+    page_keys = [("category_id", False), ("is_veg", True), ("item_id", False)]
+
+    def list(self, restaurant_id: int) -> List[Row]:
+        return self.with_category_names(self.local_rows(restaurant_id))
+
+    def page(self, restaurant_id: int, after: Optional[tuple] = None, limit: Optional[int] = PAGE_SIZE) -> Page:
+        page = super().page(restaurant_id, after, limit)
+        self.with_category_names(page.rows)
+        return page
+
+    @staticmethod
+    def with_category_names(items: List[Row]) -> List[Row]:
+        # Join category names locally instead of through PostgREST
+        names = {category["category_id"]: category["category_name"] for category in category_cache.categories()}
+        for item in items:
+            item["categories"] = {"category_name": names.get(item.get("category_id"), "Unknown")}
+        return items
+
+    def create(self, data: Row) -> List[Row]:
+        return self.insert(data)
+
+    def update(self, item_id: int, data: Row) -> List[Row]:
+        return self.update_row(item_id, data)
+
+    def set_out_of_stock(self, item_id: int, is_out_of_stock: bool) -> List[Row]:
+        return self.update(item_id, {"is_out_of_stock": is_out_of_stock})
+
+    def set_out_of_stock_many(self, item_ids: List[int], is_out_of_stock: bool) -> List[Row]:
+        return self.update_many(item_ids, {"is_out_of_stock": is_out_of_stock})
+
+    def delete(self, item_id: int) -> List[Row]:
+        return self.delete_row(item_id)
+
+
+class CategoryRepository(Repository):
+    table_name = "categories"
+    primary_key = "category_id"
+    mirror_columns = "category_id, category_name"
+    watermark_column = None
+    local_order = "json_extract(data, '$.category_id')"
+
+    def scope(self, restaurant_id: int) -> int:
+        return SHARED
+
+    def scoped(self, query, restaurant_id: int):
+        return query
+
+    def list(self) -> List[Row]:
+        return self.local_rows(SHARED)
+
+    def get_name(self, category_id: int) -> Optional[str]:
+        category = get_store().get(self.table_name, category_id)
+        return category["category_name"] if category else None
+
+
+class CategoryCache:
+    """
+    Process-wide cache of the categories table.
+    categories() and name_for() fetch on first use and again once the TTL has
+    passed; peek() and cached_name() never touch the network, so they are safe
+    to call from the UI thread.
+    """
+
+    def __init__(self, repo: CategoryRepository, ttl: float = CATEGORY_CACHE_TTL):
+        self.repo = repo
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._categories: Optional[List[Row]] = None
+        self._names: Dict[int, str] = {}
+        self._loaded_at = 0.0
+
+    def is_fresh(self) -> bool:
+        return self._categories is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def categories(self) -> List[Row]:
+        """Return all categories ordered by id, fetching them if the cache is stale."""
+        with self._lock:
+            if not self.is_fresh():
+                categories = self.repo.list()
+                self._categories = categories
+                self._names = {category["category_id"]: category["category_name"] for category in categories}
+                self._loaded_at = time.monotonic()
+            return self._categories
+
+    def name_for(self, category_id: int) -> Optional[str]:
+        self.categories()
+        return self._names.get(category_id)
+
+    def peek(self) -> Optional[List[Row]]:
+        """Return the cached categories if they are still fresh, without fetching."""
+        return self._categories if self.is_fresh() else None
+
+    def cached_name(self, category_id: int) -> Optional[str]:
+        return self._names.get(category_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._categories = None
+            self._names = {}
+
+
+restaurant_repo = RestaurantRepository()
+table_repo = TableRepository()
+inventory_repo = InventoryRepository()
+category_repo = CategoryRepository()
+category_cache = CategoryCache(category_repo)
+
+REPOSITORIES = {repo.table_name: repo for repo in (restaurant_repo, table_repo, inventory_repo, category_repo)}
+
+
+def flush_outbox(batch_size: int = 200) -> set:
+    """
+    Replay queued writes to Supabase, oldest first. Consecutive writes of the
+    same kind are sent as one request. Returns the tables that were touched.
+    Stops (raising) as soon as Supabase is unreachable again.
+    """
+    with _sync_lock:
+        return _replay_outbox(batch_size)
+
+
+def _replay_outbox(batch_size: int) -> set:
+    store = get_store()
+    touched = set()
+    while True:
+        pending = store.pending(batch_size)
+        if not pending:
+            return touched
+        batch = [pending[0]]
+        for entry in pending[1:]:
+            previous = batch[-1]
+            if entry[1:3] != previous[1:3] or (entry[2] == "update" and entry[4] != previous[4]):
+                break
+            batch.append(entry)
+
+        table_name, op = batch[0][1], batch[0][2]
+        repo = REPOSITORIES[table_name]
+        ids = [entry[0] for entry in batch]
+        keys = [entry[3] for entry in batch]
+        try:
+            if op == "insert":
+                rows = repo.query().insert([entry[4] for entry in batch]).execute().data or []
+                # PostgREST returns inserted rows in request order
+                for local_key, row in zip(keys, rows):
+                    store.change_pk(table_name, repo.primary_key, local_key, repo.mirror_row(row))
+            elif op == "update":
+                rows = repo.query().update(batch[0][4]).in_(repo.primary_key, keys).execute().data or []
+                store.upsert_rows(table_name, repo.primary_key, [repo.mirror_row(row) for row in rows])
+            else:
+                repo.query().delete().in_(repo.primary_key, keys).execute()
+        except Exception as e:
+            if is_offline_error(e):
+                raise
+            # Supabase rejected these writes; drop them and refetch the table
+            # so the mirror stops showing changes that will never land
+            print(f"Dropping {len(batch)} queued {op} on {table_name}: {e}")
+            if op == "insert":
+                # The rows only ever existed here, under their local keys;
+                # a refetch leaves those alone, so remove them (and any edits
+                # queued against them) now
+                store.delete_rows(table_name, keys)
+                for local_key in keys:
+                    store.drop_pending_for(table_name, local_key)
+            store.reset_sync(table_name)
+        store.drop_pending(ids)
+        touched.add(table_name)
+
+
+def sync_restaurant(restaurant_id: int, reconcile: bool = False) -> List[str]:
+    """
+    Flush the outbox, then pull remote changes (reconciling primary keys too
+    when asked). Returns the tables whose local rows changed.
+    """
+    with _sync_lock:
+        changed = flush_outbox()
+        for repo in (category_repo, restaurant_repo, table_repo, inventory_repo):
+            if repo.sync(restaurant_id, reconcile):
+                changed.add(repo.table_name)
+    return sorted(changed)
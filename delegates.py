@@ -0,0 +1,53 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtGui import QColor, QPainter
+from PyQt5.QtCore import Qt, QEvent, QRectF, pyqtSignal
+from theme import theme
+
+# Models answer this role with the id of the record shown in a row
+ID_ROLE = Qt.UserRole
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """
+    Paints a push button in every cell of a column without creating a widget per row.
+    The button label is the cell's DisplayRole text; clicks are reported with the
+    id the model gives for ID_ROLE, so nothing here refers to a row that may move.
+    """
+
+    clicked = pyqtSignal(object)
+
+    def __init__(self, parent=None, margin=4):
+        super().__init__(parent)
+        self.margin = margin
+        self._pressed = None
+
+    def button_rect(self, option):
+        return QRectF(option.rect.adjusted(self.margin, self.margin, -self.margin, -self.margin))
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        background = QColor(theme.color("accent"))
+        if self._pressed == (index.row(), index.column()):
+            background = QColor(theme.color("accent_dark"))
+        elif option.state & QStyle.State_MouseOver:
+            background = background.lighter(115)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(self.button_rect(option), 5, 5)
+        painter.setPen(QColor(theme.color("on_accent")))
+        painter.drawText(self.button_rect(option), Qt.AlignCenter, str(index.data(Qt.DisplayRole) or ""))
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            if self.button_rect(option).contains(event.pos()):
+                self._pressed = (index.row(), index.column())
+                return True
+        elif event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            was_pressed = self._pressed == (index.row(), index.column())
+            self._pressed = None
+            if was_pressed and self.button_rect(option).contains(event.pos()):
+                self.clicked.emit(index.data(ID_ROLE))
+            return True
+        return False
@@ -0,0 +1,132 @@
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+
+from local_store import data_dir, get_store
+
+try:
+    import keyring
+except ImportError:  # Without keyring the session lives in a file only this user can read
+    keyring = None
+
+SESSION_FILE = "session.json"
+KEYRING_SERVICE = "rome-desktop"
+KEYRING_USER = "remembered-session"
+
+_UNREAD = object()
+_saved = _UNREAD
+_lock = threading.Lock()
+
+
+def device_token(device_key, password_hash):
+    """
+    Proof that this device logged in with the current password. Neither the
+    password nor its hash is stored, and changing the password revokes it.
+    """
+    return hmac.new(bytes.fromhex(device_key), password_hash.encode(), hashlib.sha256).hexdigest()
+
+
+def _session_path():
+    return os.path.join(data_dir(), SESSION_FILE)
+
+
+def _read():
+    if keyring is not None:
+        try:
+            return keyring.get_password(KEYRING_SERVICE, KEYRING_USER)
+        except Exception as e:
+            print(f"Keyring unavailable, using {SESSION_FILE}: {e}")
+    try:
+        with open(_session_path(), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write(text):
+    if keyring is not None:
+        try:
+            keyring.set_password(KEYRING_SERVICE, KEYRING_USER, text)
+            return
+        except Exception as e:
+            print(f"Keyring unavailable, using {SESSION_FILE}: {e}")
+    fd = os.open(_session_path(), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _delete():
+    if keyring is not None:
+        try:
+            keyring.delete_password(KEYRING_SERVICE, KEYRING_USER)
+        except Exception:
+            pass
+    try:
+        os.remove(_session_path())
+    except OSError:
+        pass
+
+
+def saved_session():
+    """The session remembered on this device, or None. Read from disk once per run."""
+    global _saved
+    with _lock:
+        if _saved is _UNREAD:
+            try:
+                _saved = json.loads(_read() or "null")
+            except ValueError:
+                _saved = None
+        return _saved
+
+
+def remember(restaurant):
+    """Keep this restaurant logged in on this device. Takes the row fetched at login."""
+    global _saved
+    device_key = secrets.token_hex(32)
+    session = {
+        "restaurant_id": restaurant["restaurant_id"],
+        "email": restaurant["email"],
+        "device_key": device_key,
+        "token": device_token(device_key, restaurant["password"]),
+    }
+    with _lock:
+        try:
+            _write(json.dumps(session))
+        except OSError as e:
+            print(f"Could not remember this device: {e}")
+            return
+        _saved = session
+
+
+def forget():
+    global _saved
+    with _lock:
+        _delete()
+        _saved = None
+
+
+def restored_profile():
+    """
+    The mirrored profile of the remembered restaurant, or None when there is
+    no session to resume or nothing from it left in the local mirror.
+    """
+    session = saved_session()
+    if session is None:
+        return None
+    return get_store().get("restaurants", session["restaurant_id"])
+
+
+def verify(session):
+    """
+    Check a remembered session against Supabase. False means the account is
+    gone or its password changed since; connection errors propagate.
+    """
+    from database import restaurant_repo
+
+    restaurant = restaurant_repo.find_by_email(session["email"])
+    if restaurant is None or restaurant["restaurant_id"] != session["restaurant_id"]:
+        return False
+    return hmac.compare_digest(session["token"], device_token(session["device_key"], restaurant["password"]))
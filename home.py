@@ -1,15 +1,23 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QTabWidget, QFrame, QPushButton
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QTabWidget, QFrame, QPushButton, QComboBox
 from PyQt5.QtCore import Qt
-import colors
+import tracing
+from theme import THEMES, set_role, theme
 from user_profile import create_profile_tab
 from tables import create_table_tab
 from inventory import create_inventory_tab
+from live_updates import RealtimeListener
+from sync_service import SyncService
+from database import REPOSITORIES, category_cache
+from qr_cache import qr_cache
+from PyQt5.QtGui import QPixmapCache
 
 class HomeScreen(QWidget):
-    def __init__(self, restaurant_name, restaurant_id):  # Only these two parameters should be here
+    def __init__(self, session, switch_to_login):
         super().__init__()
-        self.restaurant_name = restaurant_name
-        self.restaurant_id = restaurant_id
+        self.session = session
+        self.switch_to_login = switch_to_login
+        self.restaurant_name = session.restaurant_name
+        self.restaurant_id = session.restaurant_id
         self.init_ui()
 
     def init_ui(self):
@@ -20,43 +28,138 @@ class HomeScreen(QWidget):
         # Header layout (Restaurant Name and Logout Button)
         header_layout = QHBoxLayout()
         header_frame = QFrame()
-        header_frame.setStyleSheet(f"background-color: {colors.color_4}; padding: 10px; border-radius: 5px;")
+        header_frame.setObjectName("homeHeader")
 
         restaurant_label = QLabel(self.restaurant_name)
-        restaurant_label.setStyleSheet(f"color: {colors.color_3}; font-size: 20px; font-weight: bold;")
+        restaurant_label.setObjectName("restaurantName")
         restaurant_label.setAlignment(Qt.AlignLeft)
 
         logout_button = QPushButton("Logout")
-        logout_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3}; padding: 10px;")
+        logout_button.setObjectName("logoutButton")
+        set_role(logout_button, "primary")
         logout_button.clicked.connect(self.logout)
 
+        # Connectivity / pending-sync indicator
+        self.sync_label = QLabel()
+        self.sync_label.setObjectName("syncStatus")
+
+        # Theme can be switched at runtime without rebuilding any widget
+        theme_selector = QComboBox()
+        theme_selector.setObjectName("themeSelector")
+        theme_selector.addItems(THEMES)
+        theme_selector.setCurrentText(theme.name)
+        theme_selector.currentTextChanged.connect(theme.apply)
+
         header_layout.addWidget(restaurant_label)
         header_layout.addStretch()
+        header_layout.addWidget(self.sync_label)
+        header_layout.addWidget(theme_selector)
         header_layout.addWidget(logout_button)
         header_frame.setLayout(header_layout)
 
         # Tab widget
-        tabs = QTabWidget()
-        tabs.setStyleSheet(f"background-color: {colors.color_3}; padding: 10px;")
+        self.tabs = QTabWidget()
+
+        # Tabs are only built (and loaded) the first time they are opened
+        self.tab_factories = [
+            (create_table_tab, "Table Management"),
+            (create_inventory_tab, "Inventory Management"),
+            (create_profile_tab, "Profile"),
+        ]
+        self.tab_pages = [None] * len(self.tab_factories)
+        for _, title in self.tab_factories:
+            self.tabs.addTab(QWidget(), title)
+        self.tabs.currentChanged.connect(self.ensure_tab)
+        self.ensure_tab(self.tabs.currentIndex())
 
-        # Adding tabs
-        tabs.addTab(create_table_tab(self.restaurant_id), "Table Management")
-        tabs.addTab(create_inventory_tab(self.restaurant_id), "Inventory Management")
-        tabs.addTab(create_profile_tab(self.restaurant_id), "Profile")  # Ensure restaurant_id is passed
+        # Keep the local mirror fresh and replay offline writes
+        self.sync_service = SyncService(self.restaurant_id, parent=self)
+        self.sync_service.synced.connect(self.reload_changed_tabs)
+        self.sync_service.status_changed.connect(self.show_sync_status)
+
+        # Keep the table and inventory tabs in sync with other terminals
+        self.realtime = RealtimeListener(self.restaurant_id, tables=("tables", "inventory"), parent=self)
+        self.realtime.change.connect(self.apply_remote_change)
+        # Changes (deletes included) made while disconnected were missed, so resync once
+        self.realtime.reconnected.connect(self.sync_service.reconcile_now)
+        self.realtime.start()
+        self.sync_service.start()
 
         # Add widgets to main layout
         main_layout.addWidget(header_frame)
-        main_layout.addWidget(tabs)
+        main_layout.addWidget(self.tabs)
 
         self.setLayout(main_layout)
         self.setWindowTitle("Home")
 
+    def ensure_tab(self, index):
+        """Build the tab at index the first time it is shown."""
+        if index < 0 or self.tab_pages[index] is not None:
+            return
+        factory, title = self.tab_factories[index]
+        # The tab's first queries are traced as one action, e.g. "open inventory management"
+        with tracing.action(f"open {title.lower()}"):
+            page = factory(self.restaurant_id, self.session)
+        self.tab_pages[index] = page
+        placeholder = self.tabs.widget(index)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, page, title)
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+
+    def apply_remote_change(self, table, event_type, record, old_record):
+        REPOSITORIES[table].apply_remote_change(event_type, record, old_record)
+        page = self.tab_pages[0] if table == "tables" else self.tab_pages[1]
+        if page is not None:
+            page.apply_remote_change(event_type, record, old_record)
+        else:
+            # Not opened yet; it will read the updated mirror when it is
+            self.session.discard(table)
+
+    def reload_changed_tabs(self, tables):
+        """Re-read tabs from the local mirror after a sync changed their rows."""
+        table_tab, inventory_tab, profile_tab = self.tab_pages
+        if "categories" in tables:
+            category_cache.invalidate()
+            self.session.discard("categories")
+            if inventory_tab is not None:
+                inventory_tab.load_categories()
+        if "tables" in tables:
+            self.session.discard("tables")
+            if table_tab is not None:
+                table_tab.load_tables()
+        if "inventory" in tables or "categories" in tables:
+            self.session.discard("inventory")
+            if inventory_tab is not None:
+                inventory_tab.load_inventory()
+        if "restaurants" in tables:
+            self.session.discard("profile")
+            if profile_tab is not None:
+                profile_tab.load_profile()
+
+    def show_sync_status(self, online, pending):
+        if online and not pending:
+            self.sync_label.clear()
+        elif online:
+            self.sync_label.setText(f"Syncing {pending} change(s)...")
+        else:
+            self.sync_label.setText(f"Offline - {pending} change(s) waiting to sync" if pending else "Offline")
+
     def logout(self):
         """Log out the user and navigate back to the login screen."""
-        self.parentWidget().setCurrentWidget(self.parentWidget().parent().login_screen)
-        self.parentWidget().parent().show_login()
+        self.close_session()
+        self.switch_to_login()
 
-    def show_home(self, restaurant_id):
-        # Pass the restaurant ID after login
-        self.restaurant_id = restaurant_id
-        self.init_ui()
+    def close_session(self):
+        """Stop this session's threads and queries and drop its caches."""
+        self.realtime.stop()
+        self.sync_service.stop()
+        self.session.cancel()
+        for page in self.tab_pages:
+            if page is not None:
+                page.query_runner.cancel()
+        category_cache.invalidate()
+        qr_cache.clear()
+        QPixmapCache.clear()
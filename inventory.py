@@ -1,28 +1,55 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView,
-    QPushButton, QLineEdit, QHBoxLayout, QComboBox, QMessageBox, QDialog, QLabel, QCheckBox
+    QWidget, QVBoxLayout, QTableView, QHeaderView,
+    QPushButton, QLineEdit, QHBoxLayout, QComboBox, QMessageBox, QDialog, QLabel, QCheckBox,
+    QFileDialog, QProgressDialog
 )
-from PyQt5.QtGui import QColor, QDoubleValidator
-from PyQt5.QtCore import Qt
-from supabase import create_client, Client
-import colors
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(supabase_url, supabase_key)
-
-def create_inventory_tab(restaurant_id):
+from PyQt5.QtCore import Qt, QTimer
+import itertools
+from theme import set_role, theme
+from database import PAGE_SIZE, inventory_repo, category_cache
+from workers import QueryRunner
+import tracing
+from inventory_model import (
+    InventoryTableModel, InventoryFilterProxyModel, UPDATE_COLUMN, DELETE_COLUMN, VEG_TYPES, price_validator
+)
+from search_index import SearchIndex, search_fields
+from delegates import ButtonDelegate
+from menu_import import import_menu, default_report_path
+
+def create_inventory_tab(restaurant_id, session=None):
     class InventoryTab(QWidget):
         def __init__(self):
             super().__init__()
             self.restaurant_id = restaurant_id
-            self.setStyleSheet("background-color: white;")
+            self.search_index = SearchIndex()
+
+            # Wait for a pause in typing before running the search
+            self.search_timer = QTimer(self)
+            self.search_timer.setSingleShot(True)
+            self.search_timer.setInterval(150)
+            self.search_timer.timeout.connect(self.filter_inventory)
+
+            # Out-of-stock clicks are collected briefly and sent as one bulk update
+            self.pending_stock = {}
+            self.stock_batches = itertools.count(1)
+            self.stock_timer = QTimer(self)
+            self.stock_timer.setSingleShot(True)
+            self.stock_timer.setInterval(400)
+            self.stock_timer.timeout.connect(self.flush_stock_changes)
+            self.query_runner = QueryRunner(self)
+            self.total_items = None
+            set_role(self, "page")
             self.init_ui()
-            self.load_inventory()
+            if session is None or not session.request(
+                "categories", self.populate_categories,
+                on_error=lambda e: self.show_error("Failed to load categories", e),
+            ):
+                self.load_categories()
+            if session is None or not session.request(
+                "inventory", self.on_inventory_loaded,
+                on_error=lambda e: self.show_error("Failed to load inventory", e),
+            ):
+                self.load_inventory()
 
         def init_ui(self):
             layout = QVBoxLayout()
@@ -30,16 +57,35 @@ def create_inventory_tab(restaurant_id):
             # Search Bar
             search_layout = QHBoxLayout()
             self.search_bar = QLineEdit()
-            self.search_bar.setPlaceholderText("Find an item by name...")
-            self.search_bar.textChanged.connect(self.filter_inventory)
+            self.search_bar.setPlaceholderText("Find an item by name, description, category or type...")
+            self.search_bar.textChanged.connect(self.search_timer.start)
             search_layout.addWidget(self.search_bar)
+
+            out_of_stock_button = QPushButton("Mark Out of Stock")
+            set_role(out_of_stock_button, "action")
+            out_of_stock_button.clicked.connect(lambda: self.set_selected_out_of_stock(True))
+            search_layout.addWidget(out_of_stock_button)
+
+            in_stock_button = QPushButton("Mark In Stock")
+            set_role(in_stock_button, "action")
+            in_stock_button.clicked.connect(lambda: self.set_selected_out_of_stock(False))
+            search_layout.addWidget(in_stock_button)
             layout.addLayout(search_layout)
+
+            # Inline loading state, and how much of the inventory is loaded
+            status_layout = QHBoxLayout()
+            self.status_label = QLabel()
+            status_layout.addWidget(self.status_label)
+            self.count_label = QLabel()
+            self.count_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            status_layout.addWidget(self.count_label)
+            layout.addLayout(status_layout)
             
             # Form layout
             form_layout = QHBoxLayout()
             
             self.is_veg_dropdown = QComboBox()
-            self.is_veg_dropdown.addItems(["Veg", "Non-Veg", "Egg"])
+            self.is_veg_dropdown.addItems(VEG_TYPES)
             form_layout.addWidget(self.is_veg_dropdown)
             
             self.item_name_input = QLineEdit()
@@ -52,145 +98,194 @@ def create_inventory_tab(restaurant_id):
             
             self.price_input = QLineEdit()
             self.price_input.setPlaceholderText("Price")
-            self.price_input.setValidator(QDoubleValidator(0.00, 99999.99, 2))
+            self.price_input.setValidator(price_validator())
             form_layout.addWidget(self.price_input)
             
             self.category_dropdown = QComboBox()
-            self.load_categories()
             form_layout.addWidget(self.category_dropdown)
             
             add_button = QPushButton("Add Item")
-            add_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3}; border-radius: 5px; padding: 5px;")
+            set_role(add_button, "action")
             add_button.clicked.connect(self.add_item)
             form_layout.addWidget(add_button)
 
+            import_button = QPushButton("Import Menu")
+            set_role(import_button, "action")
+            import_button.clicked.connect(self.import_menu_file)
+            form_layout.addWidget(import_button)
+
             layout.addLayout(form_layout)
             
-            # Table setup
-            self.table_widget = QTableWidget()
-            self.table_widget.setColumnCount(9)
-            self.table_widget.setRowCount(1)
-            self.table_widget.setHorizontalHeaderLabels(["", "", "", "", "", "", "", "", ""])
-            self.table_widget.horizontalHeader().setVisible(False)
-            self.table_widget.verticalHeader().setVisible(False)
-            
-            header = self.table_widget.horizontalHeader()
+            # Table setup: a model/view grid, so rows cost nothing until they are painted
+            self.table_model = InventoryTableModel(self)
+            self.table_model.stock_toggled.connect(self.update_out_of_stock_status)
+            self.table_model.fetch_more_requested.connect(self.load_more_inventory)
+
+            self.proxy_model = InventoryFilterProxyModel(self)
+            self.proxy_model.setSourceModel(self.table_model)
+
+            self.table_view = QTableView()
+            self.table_view.setModel(self.proxy_model)
+            self.table_view.verticalHeader().setVisible(False)
+            self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+            self.table_view.verticalHeader().setDefaultSectionSize(40)
+            self.table_view.setSelectionBehavior(QTableView.SelectRows)
+            self.table_view.setSelectionMode(QTableView.ExtendedSelection)
+
+            header = self.table_view.horizontalHeader()
             header.setSectionResizeMode(QHeaderView.Stretch)
-            
-            header_items = [
-                "Sr. No.", "Category", "Veg", "Item Name", 
-                "Item Description", "Price (₹)", "Out of Stock", 
-                "Update", "Delete"
-            ]
-            for col, header_text in enumerate(header_items):
-                header_item = QTableWidgetItem(header_text)
-                header_item.setTextAlignment(Qt.AlignCenter)
-                header_item.setFlags(Qt.ItemIsEnabled)
-                header_item.setBackground(QColor(colors.color_1))
-                header_item.setForeground(QColor(colors.color_3))
-                self.table_widget.setItem(0, col, header_item)
-            
-            layout.addWidget(self.table_widget)
+
+            self.update_delegate = ButtonDelegate(self.table_view)
+            self.update_delegate.clicked.connect(lambda item_id: self.show_update_dialog(self.table_model.item(item_id)))
+            self.table_view.setItemDelegateForColumn(UPDATE_COLUMN, self.update_delegate)
+
+            self.delete_delegate = ButtonDelegate(self.table_view)
+            self.delete_delegate.clicked.connect(lambda item_id: self.delete_item(self.table_model.item(item_id)))
+            self.table_view.setItemDelegateForColumn(DELETE_COLUMN, self.delete_delegate)
+            # The delegates paint with theme colours, which the stylesheet doesn't reach
+            theme.changed.connect(self.repaint_buttons)
+
+            layout.addWidget(self.table_view)
             self.setLayout(layout)
         
         def load_categories(self):
             """Load categories from the database"""
-            response = supabase.table("categories").select("category_id", "category_name").order("category_id", desc=False).execute()
-            categories = response.data or []
-            self.category_dropdown.clear()
-            for category in categories:
-                self.category_dropdown.addItem(category["category_name"], category["category_id"])
+            self.query_runner.submit(
+                "load_categories", category_cache.categories,
+                on_success=self.populate_categories,
+                on_error=lambda e: self.show_error("Failed to load categories", e),
+            )
+
+        def populate_categories(self, categories):
+            self.load_categories_into_dropdown(self.category_dropdown, categories)
         
         def load_inventory(self):
-            """Load inventory items from the database"""
-            response = supabase.table("inventory").select("*", "categories(category_name)")\
-                .eq("restaurant_id", self.restaurant_id)\
-                .order("category_id", desc=False)\
-                .order("is_veg", desc=True)\
-                .execute()
-            
-            self.inventory_items = response.data or []
-            
-            self.table_widget.setRowCount(len(self.inventory_items) + 1)
-            
-            for row, item in enumerate(self.inventory_items, start=1):
-                self.table_widget.setItem(row, 0, QTableWidgetItem(str(row)))
-                self.table_widget.setItem(row, 1, QTableWidgetItem(item.get("categories", {}).get("category_name", "Unknown")))
-                self.table_widget.setItem(row, 2, QTableWidgetItem(item.get("is_veg", "Unknown")))
-                self.table_widget.setItem(row, 3, QTableWidgetItem(item.get("item_name", "Unknown")))
-                self.table_widget.setItem(row, 4, QTableWidgetItem(item.get("item_desc", "Unknown")))
-                self.table_widget.setItem(row, 5, QTableWidgetItem(f"₹{item.get('price', 0):.2f}"))
-
-                # Out of Stock Checkbox
-                out_of_stock_checkbox = QCheckBox()
-                out_of_stock_checkbox.setChecked(item.get("is_out_of_stock", False))
-                out_of_stock_checkbox.setEnabled(False)
-                out_of_stock_checkbox.stateChanged.connect(
-                    lambda state, item_id=item["item_id"]: self.update_out_of_stock_status(item_id, state == Qt.Checked)
-                )
-                self.table_widget.setCellWidget(row, 6, out_of_stock_checkbox)
+            """Load the first page of inventory items from the database"""
+            self.status_label.setText("Loading inventory...")
+            self.query_runner.cancel("more_inventory")
+            self.query_runner.submit(
+                "load_inventory", inventory_repo.page, self.restaurant_id,
+                on_success=self.on_inventory_loaded,
+                on_error=lambda e: self.show_error("Failed to load inventory", e),
+            )
+
+        def on_inventory_loaded(self, page):
+            self.status_label.clear()
+            self.total_items = page.total
+            self.display_inventory(page.rows, page.cursor)
+            self.filter_inventory()
+
+        def load_more_inventory(self, cursor, everything=False):
+            """Load the page after cursor, or every item after it"""
+            self.query_runner.submit(
+                "more_inventory", inventory_repo.page, self.restaurant_id, cursor, None if everything else PAGE_SIZE,
+                on_success=self.on_more_inventory_loaded,
+                on_error=self.on_more_inventory_failed,
+            )
+
+        def on_more_inventory_loaded(self, page):
+            self.status_label.clear()
+            self.table_model.append_items(page.rows, page.cursor)
+            for item in page.rows:
+                self.search_index.add(item["item_id"], search_fields(item))
+            self.update_count_label()
+            if self.search_bar.text().strip():
+                self.filter_inventory()
 
-                update_button = QPushButton("Update")
-                update_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3}; border-radius: 5px; padding: 5px;")
-                update_button.clicked.connect(lambda _, i=item: self.show_update_dialog(i))
-                self.table_widget.setCellWidget(row, 7, update_button)
+        def on_more_inventory_failed(self, error):
+            self.table_model.fetch_failed()
+            self.show_error("Failed to load more items", error)
 
-                delete_button = QPushButton("Delete")
-                delete_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3}; border-radius: 5px; padding: 5px;")
-                delete_button.clicked.connect(lambda _, i=item: self.delete_item(i))
-                self.table_widget.setCellWidget(row, 8, delete_button)
+        def repaint_buttons(self, _theme_name=None):
+            self.table_view.viewport().update()
+
+        def update_count_label(self):
+            loaded = self.table_model.rowCount()
+            total = max(self.total_items or 0, loaded)
+            self.count_label.setText(f"{total} items" if loaded == total else f"Showing {loaded} of {total} items")
+
+        def apply_item_change(self, rows, inserted=False):
+            """
+            Patch the item returned by a write into the model instead of
+            refetching the whole inventory. An empty result means the row no
+            longer matches what we hold locally, so fall back to a full reload.
+            `inserted` marks a new item, which is the only kind that adds to
+            the count (updated items may just be on a page not loaded yet).
+            """
+            self.status_label.clear()
+            if not rows:
+                self.load_inventory()
+                return
+            item = rows[0]
+            if inserted and self.table_model.row_of(item["item_id"]) is None and self.total_items is not None:
+                self.total_items += 1
+            if not item.get("categories"):
+                # Writes don't return the categories join; resolve it locally
+                category_name = category_cache.cached_name(item.get("category_id")) or "Unknown"
+                item["categories"] = {"category_name": category_name}
+            if self.table_model.upsert_item(item) is not None:
+                self.search_index.add(item["item_id"], search_fields(item))
+            self.update_count_label()
+            if self.search_bar.text().strip():
+                self.filter_inventory()
         
         def update_out_of_stock_status(self, item_id, is_out_of_stock):
-            """Update the out of stock status for an item"""
-            try:
-                supabase.table("inventory").update({"is_out_of_stock": is_out_of_stock})\
-                    .eq("item_id", item_id).execute()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to update status: {str(e)}")
-                self.load_inventory()  # Reload to revert any UI changes
+            """Queue an out of stock change; the checkbox has already been updated"""
+            self.pending_stock[item_id] = is_out_of_stock
+            if not self.stock_timer.isActive():
+                self.stock_timer.start()
+
+        def set_selected_out_of_stock(self, is_out_of_stock):
+            """Mark every selected item out of stock (or back in stock) in one request"""
+            source_rows = {self.proxy_model.mapToSource(index).row() for index in self.table_view.selectionModel().selectedRows()}
+            if not source_rows:
+                QMessageBox.warning(self, "Warning", "Select the items to update first!")
+                return
+            for row in source_rows:
+                if self.table_model.is_out_of_stock(row) != is_out_of_stock:
+                    self.table_model.set_out_of_stock(row, is_out_of_stock)
+                    self.pending_stock[self.table_model.item_id_at(row)] = is_out_of_stock
+            self.flush_stock_changes()
+
+        def flush_stock_changes(self):
+            """Send the queued out of stock changes, one bulk update per new status"""
+            self.stock_timer.stop()
+            changes, self.pending_stock = self.pending_stock, {}
+            for is_out_of_stock in (True, False):
+                item_ids = [item_id for item_id, value in changes.items() if value == is_out_of_stock]
+                if item_ids:
+                    self.query_runner.submit(
+                        f"stock:{next(self.stock_batches)}",
+                        inventory_repo.set_out_of_stock_many, item_ids, is_out_of_stock,
+                        on_error=lambda e, item_ids=item_ids, is_out_of_stock=is_out_of_stock:
+                            self.on_stock_update_failed(item_ids, is_out_of_stock, e),
+                    )
+
+        def on_stock_update_failed(self, item_ids, is_out_of_stock, error):
+            QMessageBox.critical(self, "Error", f"Failed to update status: {str(error)}")
+            # Revert the checkboxes locally, unless they were toggled again since
+            for item_id in item_ids:
+                row = self.table_model.row_of(item_id)
+                if row is None:
+                    self.load_inventory()
+                    return
+                if item_id not in self.pending_stock and self.table_model.is_out_of_stock(row) == is_out_of_stock:
+                    self.table_model.set_out_of_stock(row, not is_out_of_stock)
         
         def filter_inventory(self):
             """Filter inventory items based on search query"""
-            search_text = self.search_bar.text().strip().lower()
-            if not search_text:
-                self.display_inventory(self.inventory_items)
-                return
-            
-            filtered_items = [
-                item for item in self.inventory_items
-                if search_text in item.get("item_name", "").lower()
-            ]
-            self.display_inventory(filtered_items)
+            self.search_timer.stop()
+            if self.search_bar.text().strip() and self.table_model.canFetchMore():
+                # Searching has to cover every item, so load the rest in one go
+                self.status_label.setText("Searching all items...")
+                self.table_model.fetch_rest()
+            self.proxy_model.set_scores(self.search_index.search(self.search_bar.text()))
         
-        def display_inventory(self, items):
+        def display_inventory(self, items, cursor=None):
             """Display filtered inventory items in the table"""
-            self.table_widget.setRowCount(len(items) + 1)
-            
-            for row, item in enumerate(items, start=1):
-                self.table_widget.setItem(row, 0, QTableWidgetItem(str(row)))
-                self.table_widget.setItem(row, 1, QTableWidgetItem(item.get("categories", {}).get("category_name", "Unknown")))
-                self.table_widget.setItem(row, 2, QTableWidgetItem(item.get("is_veg", "Unknown")))
-                self.table_widget.setItem(row, 3, QTableWidgetItem(item.get("item_name", "Unknown")))
-                self.table_widget.setItem(row, 4, QTableWidgetItem(item.get("item_desc", "Unknown")))
-                self.table_widget.setItem(row, 5, QTableWidgetItem(f"₹{item.get('price', 0):.2f}"))
-                
-                # Out of Stock Checkbox
-                out_of_stock_checkbox = QCheckBox()
-                out_of_stock_checkbox.setChecked(item.get("is_out_of_stock", False))
-                out_of_stock_checkbox.stateChanged.connect(
-                    lambda state, item_id=item["item_id"]: self.update_out_of_stock_status(item_id, state == Qt.Checked)
-                )
-                self.table_widget.setCellWidget(row, 6, out_of_stock_checkbox)
-                
-                update_button = QPushButton("Update")
-                update_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3}; border-radius: 5px; padding: 5px;")
-                update_button.clicked.connect(lambda _, i=item: self.show_update_dialog(i))
-                self.table_widget.setCellWidget(row, 7, update_button)
-                
-                delete_button = QPushButton("Delete")
-                delete_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3}; border-radius: 5px; padding: 5px;")
-                delete_button.clicked.connect(lambda _, i=item: self.delete_item(i))
-                self.table_widget.setCellWidget(row, 8, delete_button)
+            self.table_model.set_items(items, cursor)
+            self.search_index.rebuild(items)
+            self.update_count_label()
         
         def add_item(self):
             """Add a new item to the inventory"""
@@ -213,21 +308,91 @@ def create_inventory_tab(restaurant_id):
                     "is_out_of_stock": False  # Default to in stock
                 }
                 
-                supabase.table("inventory").insert(item_data).execute()
+            except ValueError:
+                QMessageBox.critical(self, "Error", "Price must be valid numbers!")
+                return
+
+            self.status_label.setText("Adding item...")
+            self.query_runner.submit(
+                "add_item", inventory_repo.create, item_data,
+                on_success=self.on_item_added,
+                on_error=lambda e: self.show_error("Failed to add item", e),
+            )
+
+        def on_item_added(self, rows):
+            self.apply_item_change(rows, inserted=True)
+            QMessageBox.information(self, "Success", "Item added successfully!")
+
+            # Clear input fields
+            self.is_veg_dropdown.setCurrentIndex(0)
+            self.item_name_input.clear()
+            self.item_desc_input.clear()
+            self.price_input.clear()
+            self.category_dropdown.setCurrentIndex(0)
+
+        def import_menu_file(self):
+            """Bulk-load dishes from a CSV or Excel file"""
+            path, _ = QFileDialog.getOpenFileName(
+                self, "Import Menu", "", "Menu Files (*.csv *.xlsx);;CSV Files (*.csv);;Excel Files (*.xlsx)"
+            )
+            if not path:
+                return
+
+            choice = QMessageBox(self)
+            choice.setWindowTitle("Import Menu")
+            choice.setText("Check the file for errors first, or import it now?")
+            check_button = choice.addButton("Check Only", QMessageBox.ActionRole)
+            import_button = choice.addButton("Import", QMessageBox.AcceptRole)
+            choice.addButton(QMessageBox.Cancel)
+            choice.exec_()
+            if choice.clickedButton() not in (check_button, import_button):
+                return
+            dry_run = choice.clickedButton() is check_button
+
+            self.import_progress = QProgressDialog("Reading menu...", None, 0, 0, self)
+            self.import_progress.setWindowTitle("Import Menu")
+            self.import_progress.setWindowModality(Qt.WindowModal)
+            self.import_progress.setMinimumDuration(0)
+            self.import_progress.show()
+
+            self.query_runner.submit(
+                "import_menu", import_menu, path, self.restaurant_id, dry_run=dry_run,
+                on_success=lambda report: self.on_menu_imported(report, path),
+                on_error=self.on_menu_import_failed,
+                on_progress=self.on_import_progress,
+            )
+
+        def on_import_progress(self, value):
+            done, total = value
+            self.import_progress.setMaximum(total)
+            self.import_progress.setValue(done)
+            self.import_progress.setLabelText(f"Processed {done} of {total} rows...")
+
+        def on_menu_imported(self, report, path):
+            self.import_progress.close()
+            if not report.dry_run and report.inserted + report.updated:
+                # One refresh for the whole import
                 self.load_inventory()
-                QMessageBox.information(self, "Success", "Item added successfully!")
 
-                # Clear input fields
-                self.is_veg_dropdown.setCurrentIndex(0)
-                self.item_name_input.clear()
-                self.item_desc_input.clear()
-                self.price_input.clear()
-                self.category_dropdown.setCurrentIndex(0)
+            if not report.errors:
+                QMessageBox.information(self, "Import Menu", report.summary())
+                return
+            answer = QMessageBox.question(
+                self, "Import Menu", f"{report.summary()}\n\nSave a report of the skipped rows?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes
+            )
+            if answer == QMessageBox.Yes:
+                report_path, _ = QFileDialog.getSaveFileName(
+                    self, "Save Error Report", default_report_path(path), "CSV Files (*.csv)"
+                )
+                if report_path:
+                    report.write_errors(report_path)
 
-            except ValueError:
-                QMessageBox.critical(self, "Error", "Price must be valid numbers!")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to add item: {str(e)}")
+        def on_menu_import_failed(self, error):
+            self.import_progress.close()
+            # Rows before the failure may already be saved
+            self.load_inventory()
+            self.show_error("Failed to import menu", error)
 
         def show_update_dialog(self, item):
             """Show dialog to update item details"""
@@ -239,15 +404,27 @@ def create_inventory_tab(restaurant_id):
 
             # Veg/Non-Veg Dropdown
             is_veg_dropdown = QComboBox()
-            is_veg_dropdown.addItems(["Veg", "Non-Veg", "Egg"])
+            is_veg_dropdown.addItems(VEG_TYPES)
             is_veg_dropdown.setCurrentText(item["is_veg"])
             layout.addWidget(QLabel("Veg/Non-Veg:"))
             layout.addWidget(is_veg_dropdown)
 
             # Category Dropdown
             category_dropdown = QComboBox()
-            self.load_categories_into_dropdown(category_dropdown)
-            category_dropdown.setCurrentText(self.get_category_name(item["category_id"]))
+            categories = category_cache.peek()
+            if categories is not None:
+                self.fill_dialog_categories(category_dropdown, categories, item["category_id"])
+            else:
+                # Cache expired; refetch once off the UI thread
+                category_dropdown.addItem("Loading...")
+                category_dropdown.setEnabled(False)
+                with tracing.action("open update dialog"):
+                    self.query_runner.submit(
+                        "dialog_categories", category_cache.categories,
+                        on_success=lambda result: self.fill_dialog_categories(category_dropdown, result, item["category_id"]),
+                        on_error=lambda e: self.show_error("Failed to load categories", e),
+                    )
+                dialog.finished.connect(lambda _: self.query_runner.cancel("dialog_categories"))
             layout.addWidget(QLabel("Category:"))
             layout.addWidget(category_dropdown)
 
@@ -263,7 +440,7 @@ def create_inventory_tab(restaurant_id):
 
             # Price
             price_input = QLineEdit(str(item["price"]))
-            price_input.setValidator(QDoubleValidator(0.00, 99999.99, 2))
+            price_input.setValidator(price_validator())
             layout.addWidget(QLabel("Price (₹):"))
             layout.addWidget(price_input)
 
@@ -274,7 +451,7 @@ def create_inventory_tab(restaurant_id):
 
             # Update Button
             update_button = QPushButton("Save Changes")
-            update_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3};")
+            set_role(update_button, "primary")
             update_button.clicked.connect(lambda: self.update_item(
                 item["item_id"], 
                 category_dropdown.currentData(), 
@@ -290,19 +467,20 @@ def create_inventory_tab(restaurant_id):
             dialog.setLayout(layout)
             dialog.exec_()
 
-        def load_categories_into_dropdown(self, dropdown):
+        def fill_dialog_categories(self, dropdown, categories, category_id):
+            self.load_categories_into_dropdown(dropdown, categories)
+            dropdown.setCurrentText(self.get_category_name(category_id))
+            dropdown.setEnabled(True)
+
+        def load_categories_into_dropdown(self, dropdown, categories):
             """Load categories into a given dropdown"""
-            response = supabase.table("categories").select("category_id", "category_name").execute()
-            categories = response.data or []
             dropdown.clear()
             for category in categories:
                 dropdown.addItem(category["category_name"], category["category_id"])
         
         def get_category_name(self, category_id):
-            """Fetch category name using category_id"""
-            response = supabase.table("categories").select("category_name").eq("category_id", category_id).execute()
-            category = response.data
-            return category[0]["category_name"] if category else "Unknown"
+            """Look up category name using category_id"""
+            return category_cache.cached_name(category_id) or "Unknown"
 
         def update_item(self, item_id, category_id, is_veg, name, desc, price, is_out_of_stock, dialog):
             """Update an inventory item"""
@@ -315,12 +493,20 @@ def create_inventory_tab(restaurant_id):
                     "price": float(price.strip()),
                     "is_out_of_stock": is_out_of_stock
                 }
-                supabase.table("inventory").update(updated_data).eq("item_id", item_id).execute()
-                self.load_inventory()
-                QMessageBox.information(self, "Success", "Item updated successfully!")
-                dialog.accept()
             except ValueError:
                 QMessageBox.critical(self, "Error", "Price must be numbers!")
+                return
+
+            self.query_runner.submit(
+                f"update_item:{item_id}", inventory_repo.update, item_id, updated_data,
+                on_success=lambda rows: self.on_item_updated(rows, dialog),
+                on_error=lambda e: self.show_error("Failed to update item", e),
+            )
+
+        def on_item_updated(self, rows, dialog):
+            self.apply_item_change(rows)
+            QMessageBox.information(self, "Success", "Item updated successfully!")
+            dialog.accept()
 
         def delete_item(self, item):
             """Ask for confirmation before deleting an item"""
@@ -330,7 +516,32 @@ def create_inventory_tab(restaurant_id):
                 QMessageBox.Yes | QMessageBox.No, QMessageBox.No
             )
             if confirmation == QMessageBox.Yes:
-                supabase.table("inventory").delete().eq("item_id", item["item_id"]).execute()
-                self.load_inventory()
+                self.query_runner.submit(
+                    f"delete_item:{item['item_id']}", inventory_repo.delete, item["item_id"],
+                    on_success=lambda _: self.remove_item_locally(item["item_id"]),
+                    on_error=lambda e: self.show_error("Failed to delete item", e),
+                )
+
+        def remove_item_locally(self, item_id):
+            # Only count items we held: the echo of our own delete, and deletes
+            # from other restaurants, arrive for items that aren't in the model
+            known = self.table_model.remove_item(item_id)
+            if known and self.total_items is not None:
+                self.total_items -= 1
+            self.search_index.remove(item_id)
+            self.update_count_label()
+
+        def apply_remote_change(self, event_type, record, old_record):
+            """Apply an insert/update/delete pushed by another terminal."""
+            if event_type == "DELETE":
+                item_id = old_record.get("item_id")
+                if item_id is not None:
+                    self.remove_item_locally(item_id)
+            elif record:
+                self.apply_item_change([record], inserted=event_type == "INSERT")
+
+        def show_error(self, message, error):
+            self.status_label.clear()
+            QMessageBox.critical(self, "Error", f"{message}: {str(error)}")
     
     return InventoryTab()
@@ -0,0 +1,368 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QDoubleValidator
+
+from delegates import ID_ROLE
+
+# Positions of the fields kept for every row in the model's row store
+ITEM_ID, CATEGORY_ID, CATEGORY_NAME, IS_VEG, ITEM_NAME, ITEM_DESC, PRICE, IS_OUT_OF_STOCK = range(8)
+
+COLUMNS = [
+    "Sr. No.", "Category", "Veg", "Item Name",
+    "Item Description", "Price (₹)", "Out of Stock",
+    "Update", "Delete"
+]
+SR_NO_COLUMN, OUT_OF_STOCK_COLUMN, UPDATE_COLUMN, DELETE_COLUMN = 0, 6, 7, 8
+
+VEG_TYPES = ["Veg", "Non-Veg", "Egg"]
+PRICE_MIN, PRICE_MAX, PRICE_DECIMALS = 0.00, 99999.99, 2
+
+
+def price_validator(parent=None):
+    """Validator for prices typed into the inventory forms."""
+    return QDoubleValidator(PRICE_MIN, PRICE_MAX, PRICE_DECIMALS, parent)
+
+
+def to_row(item):
+    """Pack an inventory record from Supabase into a compact tuple."""
+    category = item.get("categories") or {}
+    return (
+        item["item_id"],
+        item.get("category_id"),
+        category.get("category_name", "Unknown"),
+        item.get("is_veg", "Unknown"),
+        item.get("item_name", "Unknown"),
+        item.get("item_desc", "Unknown"),
+        item.get("price", 0),
+        bool(item.get("is_out_of_stock", False)),
+    )
+
+
+class InventoryTableModel(QAbstractTableModel):
+    """
+    Table model over the restaurant's inventory.
+    Rows are kept as plain tuples indexed by item_id, so a single row can be
+    patched in place after a write. The out-of-stock column is a check state and
+    the Update/Delete columns are painted by ButtonDelegate, so no widgets are
+    created per row.
+
+    Items arrive a page at a time: while `cursor` is set the view's
+    fetchMore() asks for the next page through fetch_more_requested.
+    """
+
+    stock_toggled = pyqtSignal(object, bool)  # item_id, is_out_of_stock
+    fetch_more_requested = pyqtSignal(object, bool)  # cursor of the last loaded page, load everything after it
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_of = {}
+        self.cursor = None
+        self._fetching = False
+
+    def set_items(self, items, cursor=None):
+        self.beginResetModel()
+        self._rows = [to_row(item) for item in items]
+        self._reindex()
+        self.cursor = cursor
+        self._fetching = False
+        self.endResetModel()
+
+    def append_items(self, items, cursor=None):
+        """Add the next page of items after the loaded ones."""
+        values = [to_row(item) for item in items]
+        values = [row for row in values if row[ITEM_ID] not in self._row_of]
+        self.cursor = cursor
+        self._fetching = False
+        if not values:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(values) - 1)
+        self._rows.extend(values)
+        self._reindex(first)
+        self.endInsertRows()
+
+    def fetch_failed(self):
+        """Let the view ask for the next page again."""
+        self._fetching = False
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.cursor is not None and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._fetching = True
+            self.fetch_more_requested.emit(self.cursor, False)
+
+    def fetch_rest(self):
+        """Ask for every item that has not been loaded yet in one go."""
+        if self.canFetchMore():
+            self._fetching = True
+            self.fetch_more_requested.emit(self.cursor, True)
+
+    def _reindex(self, start=0):
+        if start == 0:
+            self._row_of = {}
+        for row in range(start, len(self._rows)):
+            self._row_of[self._rows[row][ITEM_ID]] = row
+
+    def row_of(self, item_id):
+        return self._row_of.get(item_id)
+
+    def upsert_item(self, item):
+        """
+        Insert or replace a single item, keeping the category/veg sort order.
+        Returns the row the item ends up in, or None if it belongs to a page
+        that has not been loaded yet.
+        """
+        values = to_row(item)
+        row = self.row_of(values[ITEM_ID])
+        if row is None and self._beyond_loaded(values):
+            # It will arrive with a later page
+            return None
+        if row is not None:
+            if self._sort_key(self._rows[row]) == self._sort_key(values):
+                self._rows[row] = values
+                self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+                return row
+            self.remove_item(values[ITEM_ID])
+
+        row = self._insert_position(values)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, values)
+        self._reindex(row)
+        self.endInsertRows()
+        return row
+
+    def remove_item(self, item_id):
+        row = self.row_of(item_id)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        del self._row_of[item_id]
+        self._reindex(row)
+        self.endRemoveRows()
+        return True
+
+    @staticmethod
+    def _sort_key(values):
+        # Same order as the inventory query: category ascending, then is_veg
+        # descending, NULLs last in both ("" already sorts last descending)
+        category_id = values[CATEGORY_ID]
+        return (category_id is None, category_id or 0), values[IS_VEG] or ""
+
+    def _beyond_loaded(self, values):
+        """True when values sort after the last loaded row and more pages are still to come."""
+        if self.cursor is None or not self._rows:
+            return False
+        last = self._rows[-1]
+        category_id, is_veg = self._sort_key(values)
+        last_category, last_veg = self._sort_key(last)
+        if category_id != last_category:
+            return category_id > last_category
+        if is_veg != last_veg:
+            return is_veg < last_veg
+        return values[ITEM_ID] > last[ITEM_ID]
+
+    def _insert_position(self, values):
+        category_id, is_veg = self._sort_key(values)
+        for row, existing in enumerate(self._rows):
+            existing_category, existing_veg = self._sort_key(existing)
+            if existing_category > category_id or (existing_category == category_id and existing_veg < is_veg):
+                return row
+        return len(self._rows)
+
+    def item_id_at(self, row):
+        return self._rows[row][ITEM_ID]
+
+    def item_ids(self):
+        return [values[ITEM_ID] for values in self._rows]
+
+    def item(self, item_id):
+        """Return the item as a dict shaped like the Supabase record."""
+        values = self._rows[self._row_of[item_id]]
+        return {
+            "item_id": values[ITEM_ID],
+            "category_id": values[CATEGORY_ID],
+            "categories": {"category_name": values[CATEGORY_NAME]},
+            "is_veg": values[IS_VEG],
+            "item_name": values[ITEM_NAME],
+            "item_desc": values[ITEM_DESC],
+            "price": values[PRICE],
+            "is_out_of_stock": values[IS_OUT_OF_STOCK],
+        }
+
+    def is_out_of_stock(self, row):
+        return self._rows[row][IS_OUT_OF_STOCK]
+
+    def set_out_of_stock(self, row, is_out_of_stock):
+        values = self._rows[row]
+        self._rows[row] = values[:IS_OUT_OF_STOCK] + (is_out_of_stock,)
+        index = self.index(row, OUT_OF_STOCK_COLUMN)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        values = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == SR_NO_COLUMN:
+                return str(index.row() + 1)
+            if column == 1:
+                return values[CATEGORY_NAME]
+            if column == 2:
+                return values[IS_VEG]
+            if column == 3:
+                return values[ITEM_NAME]
+            if column == 4:
+                return values[ITEM_DESC]
+            if column == 5:
+                return f"₹{values[PRICE] or 0:.2f}"
+            if column == UPDATE_COLUMN:
+                return "Update"
+            if column == DELETE_COLUMN:
+                return "Delete"
+        elif role == ID_ROLE:
+            return values[ITEM_ID]
+        elif role == Qt.CheckStateRole and column == OUT_OF_STOCK_COLUMN:
+            return Qt.Checked if values[IS_OUT_OF_STOCK] else Qt.Unchecked
+        elif role == Qt.TextAlignmentRole and column != OUT_OF_STOCK_COLUMN:
+            return Qt.AlignCenter
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == OUT_OF_STOCK_COLUMN:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or index.column() != OUT_OF_STOCK_COLUMN:
+            return False
+        is_out_of_stock = value == Qt.Checked
+        self.set_out_of_stock(index.row(), is_out_of_stock)
+        self.stock_toggled.emit(self._rows[index.row()][ITEM_ID], is_out_of_stock)
+        return True
+
+
+class InventoryFilterProxyModel(QAbstractProxyModel):
+    """
+    Shows the inventory rows matching the current search, best match first.
+    With no search active every row is shown in the source order.
+
+    The visible rows are kept as a plain list of source rows, so applying a
+    search is a single sort in Python rather than a comparator call per pair.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._scores = None
+        self._visible = []
+        self._position_of = {}
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.dataChanged.connect(self._on_source_data_changed)
+        model.modelReset.connect(self._refresh)
+        model.rowsInserted.connect(self._on_source_rows_inserted)
+        model.rowsRemoved.connect(self._refresh)
+        model.layoutChanged.connect(self._refresh)
+        self._update_mapping()
+        self.endResetModel()
+
+    def set_scores(self, scores):
+        """Apply a {item_id: score} search result, or None to show everything."""
+        self._scores = scores
+        self._refresh()
+
+    def _refresh(self, *args):
+        self.beginResetModel()
+        self._update_mapping()
+        self.endResetModel()
+
+    def _on_source_rows_inserted(self, parent, first, last):
+        if self._scores is not None or first != len(self._visible):
+            self._refresh()
+            return
+        # A page appended with no search active: extend the view instead of
+        # resetting it, so the scroll position and selection are kept
+        self.beginInsertRows(QModelIndex(), first, last)
+        for row in range(first, last + 1):
+            self._position_of[row] = len(self._visible)
+            self._visible.append(row)
+        self.endInsertRows()
+
+    def _update_mapping(self):
+        model = self.sourceModel()
+        if model is None:
+            self._visible = []
+        elif self._scores is None:
+            self._visible = list(range(model.rowCount()))
+        else:
+            scores = self._scores
+            matches = [(-scores[item_id], row) for row, item_id in enumerate(model.item_ids()) if item_id in scores]
+            matches.sort()
+            self._visible = [row for _, row in matches]
+        self._position_of = {row: position for position, row in enumerate(self._visible)}
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        for source_row in range(top_left.row(), bottom_right.row() + 1):
+            position = self._position_of.get(source_row)
+            if position is not None:
+                self.dataChanged.emit(
+                    self.index(position, top_left.column()),
+                    self.index(position, bottom_right.column()),
+                    roles,
+                )
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or proxy_index.row() >= len(self._visible):
+            return QModelIndex()
+        return self.sourceModel().index(self._visible[proxy_index.row()], proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        position = self._position_of.get(source_index.row())
+        if position is None:
+            return QModelIndex()
+        return self.index(position, source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self.sourceModel() is None else self.sourceModel().columnCount()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        return self.sourceModel().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        # Number rows by their position in the filtered view
+        if role == Qt.DisplayRole and index.isValid() and index.column() == SR_NO_COLUMN:
+            return str(index.row() + 1)
+        return super().data(index, role)
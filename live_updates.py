@@ -0,0 +1,151 @@
+import asyncio
+import itertools
+import json
+import os
+from urllib.parse import urlencode
+
+import websockets
+from dotenv import load_dotenv
+from PyQt5.QtCore import QThread, pyqtSignal
+
+HEARTBEAT_INTERVAL = 25
+MIN_RECONNECT_DELAY = 1
+MAX_RECONNECT_DELAY = 30
+
+
+def realtime_url():
+    """
+    Websocket endpoint for Supabase Realtime. REALTIME_URL overrides it, which
+    lets the listener run against a local websocket stand-in.
+    """
+    load_dotenv()
+    url = os.getenv("REALTIME_URL")
+    if url:
+        return url
+    supabase_url = os.getenv("SUPABASE_URL").rstrip("/")
+    ws_url = supabase_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+    query = urlencode({"apikey": os.getenv("SUPABASE_KEY"), "vsn": "1.0.0"})
+    return f"{ws_url}/realtime/v1/websocket?{query}"
+
+
+class RealtimeListener(QThread):
+    """
+    Streams row-level changes for one restaurant over a single websocket.
+
+    Each watched table gets its own channel filtered on restaurant_id. The
+    connection is retried with backoff when it drops; changes made while it
+    was down are not replayed, so `reconnected` tells listeners to resync once.
+    """
+
+    change = pyqtSignal(str, str, dict, dict)  # table, INSERT/UPDATE/DELETE, record, old_record
+    connected = pyqtSignal()
+    reconnected = pyqtSignal()
+    disconnected = pyqtSignal(str)
+
+    def __init__(self, restaurant_id, tables=("inventory", "tables"), url=None, parent=None):
+        super().__init__(parent)
+        self.restaurant_id = restaurant_id
+        self.tables = tables
+        self.url = url
+        self._loop = None
+        self._stopping = False
+        self._refs = itertools.count(1)
+
+    def stop(self):
+        """Close the connection and wait for the thread to exit."""
+        self._stopping = True
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._cancel_tasks)
+        self.wait(5000)
+
+    def _cancel_tasks(self):
+        for task in asyncio.all_tasks(self._loop):
+            task.cancel()
+
+    def run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._listen_forever())
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _listen_forever(self):
+        url = self.url or realtime_url()
+        delay = MIN_RECONNECT_DELAY
+        has_connected = False
+        while not self._stopping:
+            try:
+                async with websockets.connect(url) as socket:
+                    await self._join_channels(socket)
+                    delay = MIN_RECONNECT_DELAY
+                    if has_connected:
+                        self.reconnected.emit()
+                    else:
+                        self.connected.emit()
+                    has_connected = True
+                    heartbeat = asyncio.ensure_future(self._heartbeat(socket))
+                    try:
+                        async for message in socket:
+                            self._handle_message(message)
+                    finally:
+                        heartbeat.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                reason = str(e)
+            else:
+                reason = "Connection closed"
+
+            if self._stopping:
+                break
+            self.disconnected.emit(reason)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def _message(self, topic, event, payload, join_ref=None):
+        ref = str(next(self._refs))
+        return json.dumps({
+            "topic": topic,
+            "event": event,
+            "payload": payload,
+            "ref": ref,
+            "join_ref": join_ref or ref,
+        })
+
+    async def _join_channels(self, socket):
+        access_token = os.getenv("SUPABASE_KEY")
+        for table in self.tables:
+            payload = {
+                "config": {
+                    "postgres_changes": [{
+                        "event": "*",
+                        "schema": "public",
+                        "table": table,
+                        "filter": f"restaurant_id=eq.{self.restaurant_id}",
+                    }],
+                },
+                "access_token": access_token,
+            }
+            await socket.send(self._message(f"realtime:{table}:{self.restaurant_id}", "phx_join", payload))
+
+    async def _heartbeat(self, socket):
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            await socket.send(self._message("phoenix", "heartbeat", {}))
+
+    def _handle_message(self, message):
+        try:
+            message = json.loads(message)
+        except ValueError:
+            return
+        if message.get("event") != "postgres_changes":
+            return
+        data = (message.get("payload") or {}).get("data") or {}
+        table = data.get("table")
+        if table not in self.tables:
+            return
+        self.change.emit(table, data.get("type", ""), data.get("record") or {}, data.get("old_record") or {})
@@ -0,0 +1,259 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    table_name TEXT NOT NULL,
+    pk INTEGER NOT NULL,
+    restaurant_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (table_name, pk)
+);
+CREATE INDEX IF NOT EXISTS rows_by_restaurant ON rows (table_name, restaurant_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    table_name TEXT NOT NULL,
+    restaurant_id INTEGER NOT NULL,
+    watermark TEXT,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (table_name, restaurant_id)
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    op TEXT NOT NULL,
+    pk INTEGER,
+    payload TEXT,
+    created_at REAL NOT NULL
+);
+"""
+
+# Tables that are not owned by a single restaurant are mirrored under this id
+SHARED = 0
+
+
+def data_dir():
+    path = os.getenv("ROME_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".rome")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class LocalStore:
+    """
+    SQLite mirror of the restaurant's rows plus a durable outbox of writes
+    that still have to reach Supabase. Rows are stored as JSON keyed by
+    (table, primary key); negative primary keys belong to rows created
+    offline that Supabase has not assigned an id to yet.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "mirror.sqlite3")
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # Mirrored rows
+
+    def is_synced(self, table_name, restaurant_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM sync_state WHERE table_name = ? AND restaurant_id = ?",
+                (table_name, restaurant_id),
+            ).fetchone()
+        return row is not None
+
+    def watermark(self, table_name, restaurant_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT watermark FROM sync_state WHERE table_name = ? AND restaurant_id = ?",
+                (table_name, restaurant_id),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, table_name, restaurant_id, watermark):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state (table_name, restaurant_id, watermark, synced_at) VALUES (?, ?, ?, ?)",
+                (table_name, restaurant_id, watermark, time.time()),
+            )
+
+    def reset_sync(self, table_name):
+        """Force the next read of a table to refetch it in full."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM sync_state WHERE table_name = ?", (table_name,))
+
+    def rows(self, table_name, restaurant_id, order_by=""):
+        """Return the mirrored rows, optionally ordered by an SQL expression over `data`."""
+        sql = "SELECT data FROM rows WHERE table_name = ? AND restaurant_id = ?"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        with self._lock:
+            result = self._db.execute(sql, (table_name, restaurant_id)).fetchall()
+        return [json.loads(data) for data, in result]
+
+    def page(self, table_name, restaurant_id, order, after=None, limit=None):
+        """
+        Return up to limit mirrored rows sorted by order, a list of
+        (SQL expression, descending) pairs, starting after the row whose sort
+        values are `after`. NULLs sort last either way, as they do remotely.
+        """
+        sql = "SELECT data FROM rows WHERE table_name = ? AND restaurant_id = ?"
+        args = [table_name, restaurant_id]
+        if after is not None:
+            clauses = []
+            for depth, (expression, descending) in enumerate(order):
+                if after[depth] is None:
+                    continue  # Nothing sorts after a NULL in this column
+                terms = [f"{equal} IS ?" for equal, _ in order[:depth]]
+                terms.append(f"({expression} {'<' if descending else '>'} ? OR {expression} IS NULL)")
+                clauses.append("(" + " AND ".join(terms) + ")")
+                args.extend(after[:depth + 1])
+            sql += " AND (" + (" OR ".join(clauses) or "0") + ")"
+        # `x IS NULL` first rather than NULLS LAST, which older SQLite builds lack
+        sql += " ORDER BY " + ", ".join(
+            f"{expression} IS NULL, {expression}{' DESC' if descending else ''}" for expression, descending in order
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            result = self._db.execute(sql, args).fetchall()
+        return [json.loads(data) for data, in result]
+
+    def count(self, table_name, restaurant_id):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM rows WHERE table_name = ? AND restaurant_id = ?", (table_name, restaurant_id)
+            ).fetchone()[0]
+
+    def get(self, table_name, pk):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM rows WHERE table_name = ? AND pk = ?", (table_name, pk)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def pks(self, table_name, restaurant_id):
+        with self._lock:
+            result = self._db.execute(
+                "SELECT pk FROM rows WHERE table_name = ? AND restaurant_id = ?", (table_name, restaurant_id)
+            ).fetchall()
+        return {pk for pk, in result}
+
+    def upsert_rows(self, table_name, primary_key, rows, restaurant_id=None):
+        with self._lock, self._db:
+            self._upsert_rows(table_name, primary_key, rows, restaurant_id)
+
+    def _upsert_rows(self, table_name, primary_key, rows, restaurant_id=None):
+        self._db.executemany(
+            "INSERT OR REPLACE INTO rows (table_name, pk, restaurant_id, data) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    table_name,
+                    row[primary_key],
+                    restaurant_id if restaurant_id is not None else row.get("restaurant_id", SHARED),
+                    json.dumps(row),
+                )
+                for row in rows
+            ],
+        )
+
+    def replace_rows(self, table_name, primary_key, rows, restaurant_id):
+        """Swap the whole mirror of a table for the given rows."""
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM rows WHERE table_name = ? AND restaurant_id = ? AND pk >= 0",
+                (table_name, restaurant_id),
+            )
+            self._upsert_rows(table_name, primary_key, rows, restaurant_id)
+
+    def delete_rows(self, table_name, pks):
+        with self._lock, self._db:
+            self._delete_rows(table_name, pks)
+
+    def _delete_rows(self, table_name, pks):
+        self._db.executemany(
+            "DELETE FROM rows WHERE table_name = ? AND pk = ?", [(table_name, pk) for pk in pks]
+        )
+
+    def change_pk(self, table_name, primary_key, old_pk, row):
+        """Replace a row created offline with the row Supabase returned for it."""
+        with self._lock, self._db:
+            self._delete_rows(table_name, [old_pk])
+            self._upsert_rows(table_name, primary_key, [row])
+            self._db.execute(
+                "UPDATE outbox SET pk = ? WHERE table_name = ? AND pk = ?", (row[primary_key], table_name, old_pk)
+            )
+
+    def insert_local(self, table_name, primary_key, payload):
+        """
+        Mirror a row created offline under the next free negative key and
+        queue its insert, in one transaction so concurrent inserts can't
+        pick the same key. Returns the row as mirrored.
+        """
+        with self._lock, self._db:
+            lowest, = self._db.execute(
+                "SELECT MIN(pk) FROM rows WHERE table_name = ?", (table_name,)
+            ).fetchone()
+            row = dict(payload, **{primary_key: min(lowest or 0, 0) - 1})
+            self._upsert_rows(table_name, primary_key, [row])
+            self._enqueue(table_name, "insert", row[primary_key], payload)
+        return row
+
+    # Outbox
+
+    def enqueue(self, table_name, op, pk, payload=None):
+        with self._lock, self._db:
+            self._enqueue(table_name, op, pk, payload)
+
+    def _enqueue(self, table_name, op, pk, payload=None):
+        self._db.execute(
+            "INSERT INTO outbox (table_name, op, pk, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+            (table_name, op, pk, json.dumps(payload) if payload is not None else None, time.time()),
+        )
+
+    def pending(self, limit=500):
+        """Return queued writes, oldest first, as (id, table_name, op, pk, payload) tuples."""
+        with self._lock:
+            result = self._db.execute(
+                "SELECT id, table_name, op, pk, payload FROM outbox ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [(id_, table_name, op, pk, json.loads(payload) if payload else None) for id_, table_name, op, pk, payload in result]
+
+    def pending_count(self, table_name=None):
+        sql, args = "SELECT COUNT(*) FROM outbox", ()
+        if table_name is not None:
+            sql, args = sql + " WHERE table_name = ?", (table_name,)
+        with self._lock:
+            return self._db.execute(sql, args).fetchone()[0]
+
+    def drop_pending(self, ids):
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM outbox WHERE id = ?", [(id_,) for id_ in ids])
+
+    def drop_pending_for(self, table_name, pk):
+        """Forget queued writes for a row created offline that was deleted before it was sent."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM outbox WHERE table_name = ? AND pk = ?", (table_name, pk))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the shared local store, opening it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = LocalStore()
+    return _store
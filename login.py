@@ -8,18 +8,15 @@ from PyQt5.QtWidgets import (
     QFrame,
     QMessageBox,
     QHBoxLayout,
+    QCheckBox,
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QPixmap
-import colors
-from supabase import create_client, Client
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(supabase_url, supabase_key)
+from theme import set_role
+import assets
+from database import restaurant_repo
+import device_session
+from session import SessionContext
+from workers import QueryRunner
 
 class LoginScreen(QWidget):
     def __init__(self, switch_to_signup, switch_to_home):
@@ -27,6 +24,7 @@ class LoginScreen(QWidget):
         self.switch_to_signup = switch_to_signup
         self.switch_to_home = switch_to_home
         self.password_shown = False  # Default state: password hidden
+        self.query_runner = QueryRunner(self)
         self.init_ui()
 
     def init_ui(self):
@@ -34,28 +32,16 @@ class LoginScreen(QWidget):
         layout.setAlignment(Qt.AlignCenter)
 
         card = QFrame()
-        card.setStyleSheet(
-            f"""
-            background-color: {colors.color_4};
-            border-radius: 10px;
-            padding: 20px;
-            max-width: 500px;
-        """
-        )
+        card.setObjectName("authCard")
         card_layout = QVBoxLayout()
 
         title = QLabel("Login")
-        title.setStyleSheet(
-            f"color: {colors.color_3}; font-size: 28px; font-weight: bold;"
-        )
+        title.setObjectName("loginTitle")
         title.setAlignment(Qt.AlignCenter)
         card_layout.addWidget(title)
 
         self.email = QLineEdit()
         self.email.setPlaceholderText("Email")
-        self.email.setStyleSheet(
-            f"background-color: {colors.color_3}; padding: 15px; font-size: 20px;"
-        )
         card_layout.addWidget(self.email)
 
         # Password field with toggle visibility button
@@ -63,39 +49,29 @@ class LoginScreen(QWidget):
         self.password = QLineEdit()
         self.password.setPlaceholderText("Password")
         self.password.setEchoMode(QLineEdit.Password)  # Default to hidden
-        self.password.setStyleSheet(
-            f"background-color: {colors.color_3}; padding: 15px; font-size: 20px;"
-        )
         password_layout.addWidget(self.password)
 
         # Eye button for toggling password visibility
         self.toggle_password_button = QPushButton()
-        self.toggle_password_button.setIcon(QIcon("assets/eye_closed.png"))  # Path to the closed eye icon
+        self.toggle_password_button.setIcon(assets.icon("eye_closed.png"))  # Path to the closed eye icon
         self.toggle_password_button.setIconSize(self.toggle_password_button.sizeHint())
-        self.toggle_password_button.setStyleSheet(
-            f"""
-            background-color: {colors.color_3};
-            border: 2px solid {colors.color_5};
-            border-radius: 5px;
-            padding: 5px;
-        """
-        )
+        set_role(self.toggle_password_button, "eye")
         self.toggle_password_button.clicked.connect(self.toggle_password_visibility)
         password_layout.addWidget(self.toggle_password_button)
 
         card_layout.addLayout(password_layout)
 
-        login_button = QPushButton("Login")
-        login_button.setStyleSheet(
-            f"background-color: {colors.color_1}; color: {colors.color_3}; padding: 15px; font-size: 20px;"
-        )
-        login_button.clicked.connect(self.handle_login)
-        card_layout.addWidget(login_button)
+        # Skip this screen on the next launch; cleared again by logging out
+        self.remember_checkbox = QCheckBox("Remember this device")
+        card_layout.addWidget(self.remember_checkbox)
+
+        self.login_button = QPushButton("Login")
+        set_role(self.login_button, "large")
+        self.login_button.clicked.connect(self.handle_login)
+        card_layout.addWidget(self.login_button)
 
         switch_button = QPushButton("Go to Signup")
-        switch_button.setStyleSheet(
-            f"background-color: {colors.color_1}; color: {colors.color_3}; padding: 15px; font-size: 20px;"
-        )
+        set_role(switch_button, "large")
         switch_button.clicked.connect(self.switch_to_signup)
         card_layout.addWidget(switch_button)
 
@@ -107,10 +83,10 @@ class LoginScreen(QWidget):
         """Toggle password visibility."""
         if self.password_shown:
             self.password.setEchoMode(QLineEdit.Password)
-            self.toggle_password_button.setIcon(QIcon("assets/eye_closed.png"))
+            self.toggle_password_button.setIcon(assets.icon("eye_closed.png"))
         else:
             self.password.setEchoMode(QLineEdit.Normal)
-            self.toggle_password_button.setIcon(QIcon("assets/eye_open.png"))
+            self.toggle_password_button.setIcon(assets.icon("eye_open.png"))
         self.password_shown = not self.password_shown
 
     def handle_login(self):
@@ -121,54 +97,64 @@ class LoginScreen(QWidget):
             QMessageBox.warning(self, "Input Error", "Please fill in both fields.")
             return
 
-        try:
-            # Fetch user data from Supabase
-            response = supabase.table("restaurants").select(
-                "email, password, restaurant_name, restaurant_id"
-            ).eq("email", email).execute()
-            if not response.data:
-                QMessageBox.warning(
-                    self, "Error", "Email not found. Please sign up first."
-                )
-                return
-
-            # Retrieve the stored hashed password
-            stored_password = response.data[0]["password"]
-            restaurant_name = response.data[0]["restaurant_name"]
-            restaurant_id = response.data[0]["restaurant_id"]
-
-            # Hash the entered password using the same method as during signup
-            hashed_password = hashlib.sha256(password.encode()).hexdigest()
-
-            # Compare the hashed entered password with the stored hashed password
-            if hashed_password == stored_password:
-                # Fetch tables for the restaurant
-                tables_response = (
-                    supabase.table("tables")
-                    .select("table_id")
-                    .eq("restaurant_id", restaurant_id)
-                    .execute()
-                )
-
-                if tables_response.data is None or len(tables_response.data) == 0:
-                    has_tables = False  # No tables added
-                else:
-                    has_tables = True  # Tables exist
-
-                # Login success, pass restaurant info and table availability to HomeScreen
-                self.switch_to_home(restaurant_name, restaurant_id, has_tables)
-
-            else:
-                QMessageBox.warning(self, "Error", "Incorrect password.")
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Database Error", f"Error during login: {str(e)}"
-            )
+        self.set_loading(True)
+        self.query_runner.submit(
+            "login", self.verify_credentials, email, password, self.remember_checkbox.isChecked(),
+            on_success=self.on_login_result,
+            on_error=self.on_login_error,
+        )
+
+    @staticmethod
+    def verify_credentials(email, password, remember=False):
+        """Check the credentials against Supabase. Runs on a worker thread."""
+        # Fetch user data from Supabase
+        restaurant = restaurant_repo.find_by_email(email)
+        if not restaurant:
+            return None, "Email not found. Please sign up first."
+
+        # Hash the entered password using the same method as during signup
+        hashed_password = hashlib.sha256(password.encode()).hexdigest()
+
+        # Compare the hashed entered password with the stored hashed password
+        if hashed_password != restaurant["password"]:
+            return None, "Incorrect password."
+
+        # Keep the row for the session; the profile tab reuses it
+        restaurant_repo.remember_profile(restaurant)
+        if remember:
+            device_session.remember(restaurant)
+        return restaurant_repo.mirror_row(restaurant), None
+
+    def on_login_result(self, result):
+        self.set_loading(False)
+        login_data, error = result
+        if error:
+            QMessageBox.warning(self, "Error", error)
+            return
+
+        # Login success: start loading every tab's data now, in parallel
+        session = SessionContext(login_data)
+        session.prefetch()
+        self.switch_to_home(session)
+
+    def on_login_error(self, error):
+        self.set_loading(False)
+        QMessageBox.critical(
+            self, "Database Error", f"Error during login: {str(error)}"
+        )
+
+    def set_loading(self, loading):
+        """Show an inline loading state while credentials are being checked."""
+        self.login_button.setEnabled(not loading)
+        self.login_button.setText("Logging in..." if loading else "Login")
 
     def clear_fields(self):
         """Clear the input fields and reset UI elements."""
+        self.query_runner.cancel()
+        self.set_loading(False)
         self.email.clear()
         self.password.clear()
         self.password.setEchoMode(QLineEdit.Password)  # Reset password visibility
         self.password_shown = False  # Reset password visibility state
-        self.toggle_password_button.setIcon(QIcon("assets/eye_closed.png"))  # Reset icon to closed eye
\ No newline at end of file
+        self.remember_checkbox.setChecked(False)
+        self.toggle_password_button.setIcon(assets.icon("eye_closed.png"))  # Reset icon to closed eye
\ No newline at end of file
@@ -1,56 +1,148 @@
-from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget
-from PyQt5.QtGui import QIcon
+import time
+STARTED_AT = time.perf_counter()  # Taken before anything heavy is imported, for the startup report
+
+from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget, QMessageBox, QShortcut
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import QTimer
 from splash_screen import SplashScreen
-from login import LoginScreen
-from signup import SignupScreen
-from home import HomeScreen
+from startup import StartupReport
 import sys
-import colors
+import multiprocessing
+from theme import theme
+import assets
+import device_session
+import os
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup_report=None):
         super().__init__()
         self.setWindowTitle("R.O.M.E - Restaurant Orders Made Easy Desktop Application")
         self.setGeometry(0, 0, 1920, 1080)
-        self.setStyleSheet(f"background-color: {colors.color_3};")
-        self.setWindowIcon(QIcon("assets/logo.png"))
+        self.setWindowIcon(assets.icon("logo.png"))
+        self.startup_report = startup_report or StartupReport()
 
         # Create the stacked widget to manage screens
         self.stacked_widget = QStackedWidget()
         self.setCentralWidget(self.stacked_widget)
 
-        # Create instances of screens
-        self.splash_screen = SplashScreen(self.show_login)
-        self.login_screen = LoginScreen(self.show_signup, self.login_success)  # Pass the login_success callback
-        self.signup_screen = SignupScreen(self.show_login)
-
-        # Add screens to the stacked widget
-        self.stacked_widget.addWidget(self.splash_screen)
-        self.stacked_widget.addWidget(self.login_screen)
-        self.stacked_widget.addWidget(self.signup_screen)
+        # Only the splash screen is built up front; the others (and the modules
+        # behind them) are created the first time they are shown
+        self.splash_screen = SplashScreen(self.finish_startup, self.startup_report)
+        self.login_screen = None
+        self.signup_screen = None
+        self.home_screen = None
 
         # Show the splash screen
+        self.stacked_widget.addWidget(self.splash_screen)
         self.stacked_widget.setCurrentWidget(self.splash_screen)
 
+        # Developer overlay listing the Supabase calls behind each action
+        self.trace_overlay = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.toggle_trace_overlay)
+
+    def toggle_trace_overlay(self):
+        if self.trace_overlay is None:
+            from trace_overlay import TraceOverlay
+            self.trace_overlay = TraceOverlay(self)
+        self.trace_overlay.toggle()
+
+    def finish_startup(self):
+        profile = device_session.restored_profile()
+        if profile is not None:
+            self.resume_session(profile)
+            self.startup_report.mark("home shown")
+        else:
+            self.show_login()
+            self.startup_report.mark("login shown")
+        self.startup_report.save()
+        # The splash screen is never shown again
+        self.stacked_widget.removeWidget(self.splash_screen)
+        self.splash_screen.deleteLater()
+        self.splash_screen = None
+
+    def resume_session(self, profile):
+        """
+        Open the remembered restaurant straight away from the local mirror,
+        which still holds the last session's profile, tables and inventory.
+        The sync service refreshes it in the background while the device's
+        session is checked against Supabase.
+        """
+        from session import SessionContext
+        session = SessionContext(profile)
+        session.prefetch()
+        self.login_success(session)
+        session.query_runner.submit(
+            "verify_device", device_session.verify, device_session.saved_session(),
+            on_success=self.on_device_verified,
+            on_error=self.on_device_verify_failed,
+        )
+
+    def on_device_verified(self, trusted):
+        if trusted or self.home_screen is None:
+            return
+        device_session.forget()
+        self.home_screen.logout()
+        QMessageBox.information(self, "Session Expired", "Please log in again.")
+
+    def on_device_verify_failed(self, error):
+        from database import is_offline_error
+        # Offline the remembered session stands; it is checked on the next launch
+        if not is_offline_error(error):
+            print(f"Could not verify the remembered session: {error}")
+
     def show_login(self):
+        if self.login_screen is None:
+            from login import LoginScreen
+            self.login_screen = LoginScreen(self.show_signup, self.login_success)  # Pass the login_success callback
+            self.stacked_widget.addWidget(self.login_screen)
         self.login_screen.clear_fields()  # Clear input fields
         self.stacked_widget.setCurrentWidget(self.login_screen)
 
     def show_signup(self):
+        if self.signup_screen is None:
+            from signup import SignupScreen
+            self.signup_screen = SignupScreen(self.show_login)
+            self.stacked_widget.addWidget(self.signup_screen)
         self.stacked_widget.setCurrentWidget(self.signup_screen)
 
-    def login_success(self, restaurant_name, restaurant_id, has_tables):
+    def login_success(self, session):
         """
         Callback for successful login.
-        Switches to HomeScreen and passes the restaurant_name, restaurant_id, and has_tables.
+        Switches to HomeScreen, which takes its data from the session's prefetch.
         """
-        # Make sure only three arguments are passed when calling this method
-        self.home_screen = HomeScreen(restaurant_name=restaurant_name, restaurant_id=restaurant_id)  # Pass has_tables if needed
+        from home import HomeScreen
+        self.home_screen = HomeScreen(session, self.logout)
         self.stacked_widget.addWidget(self.home_screen)
         self.stacked_widget.setCurrentWidget(self.home_screen)
 
+    def logout(self):
+        """Dispose of the home screen (its session has already been closed) and return to login."""
+        device_session.forget()
+        self.show_login()
+        self.stacked_widget.removeWidget(self.home_screen)
+        self.home_screen.session.deleteLater()
+        self.home_screen.deleteLater()
+        self.home_screen = None
+
+    def closeEvent(self, event):
+        # Stop the realtime connection and queries before the window goes away
+        if self.home_screen is not None:
+            self.home_screen.close_session()
+        super().closeEvent(event)
+
 if __name__ == "__main__":
+    # QR export renders in worker processes; needed when the app is frozen
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
-    window = MainWindow()
+    startup_report = StartupReport(STARTED_AT)
+    theme.apply(os.getenv("ROME_THEME", "Classic"))
+    # Report handlers that block the event loop
+    from stall_watchdog import StallWatchdog
+    watchdog = StallWatchdog()
+    watchdog.start()
+    app.aboutToQuit.connect(watchdog.stop)
+    window = MainWindow(startup_report)
     window.show()
+    # Runs once the event loop has painted the window for the first time
+    QTimer.singleShot(0, lambda: startup_report.mark("window shown"))
     sys.exit(app.exec_())
\ No newline at end of file
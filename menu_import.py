@@ -0,0 +1,242 @@
+import csv
+import os
+import re
+
+from PyQt5.QtGui import QValidator
+
+from database import category_cache, inventory_repo
+from inventory_model import VEG_TYPES, price_validator
+
+try:
+    import openpyxl
+except ImportError:  # XLSX import is optional
+    openpyxl = None
+
+IMPORT_CHUNK_SIZE = 100
+
+# Accepted spellings of each column header, after normalising to snake_case.
+# The inventory grid's own headers ("Item Name", "Price (₹)", ...) are included.
+HEADER_ALIASES = {
+    "category": "category",
+    "category_name": "category",
+    "veg": "is_veg",
+    "is_veg": "is_veg",
+    "type": "is_veg",
+    "name": "item_name",
+    "item": "item_name",
+    "item_name": "item_name",
+    "description": "item_desc",
+    "item_desc": "item_desc",
+    "item_description": "item_desc",
+    "price": "price",
+    "out_of_stock": "is_out_of_stock",
+    "is_out_of_stock": "is_out_of_stock",
+}
+REQUIRED_COLUMNS = ("category", "is_veg", "item_name", "price")
+# Values for the optional columns when a new dish comes from a file without them;
+# existing dishes keep what they have
+INSERT_DEFAULTS = {"item_desc": "", "is_out_of_stock": False}
+
+TRUE_VALUES = {"1", "true", "yes", "y", "x"}
+FALSE_VALUES = {"", "0", "false", "no", "n"}
+
+
+def normalise_header(header):
+    key = re.sub(r"[^a-z]+", "_", str(header or "").lower()).strip("_")
+    return HEADER_ALIASES.get(key)
+
+
+def read_rows(path):
+    """
+    Stream a CSV or XLSX menu as (line number, {column: text}) pairs.
+    The first row must be a header row.
+    """
+    if path.lower().endswith(".xlsx"):
+        yield from _read_xlsx(path)
+    else:
+        yield from _read_csv(path)
+
+
+def count_rows(path):
+    """Number of data rows in the file, for progress reporting."""
+    if path.lower().endswith(".xlsx"):
+        workbook = _open_workbook(path)
+        try:
+            return max(workbook.active.max_row - 1, 0)
+        finally:
+            workbook.close()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        columns = _columns(next(reader, []))
+        for values in reader:
+            yield reader.line_num, _row(columns, values)
+
+
+def _open_workbook(path):
+    if openpyxl is None:
+        raise ImportError("Reading .xlsx files needs the openpyxl package (pip install openpyxl)")
+    return openpyxl.load_workbook(path, read_only=True, data_only=True)
+
+
+def _read_xlsx(path):
+    workbook = _open_workbook(path)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        columns = _columns(next(rows, ()))
+        for line, values in enumerate(rows, start=2):
+            yield line, _row(columns, ["" if value is None else str(value) for value in values])
+    finally:
+        workbook.close()
+
+
+def _columns(header):
+    columns = [normalise_header(name) for name in header]
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    return columns
+
+
+def _row(columns, values):
+    # Every header column is present, so a short row can't look like a file without it
+    values = list(values) + [""] * (len(columns) - len(values))
+    return {column: value.strip() for column, value in zip(columns, values) if column}
+
+
+class ImportReport:
+    """Outcome of a menu import: what was (or would be) written and which rows were rejected."""
+
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.rows_read = 0
+        self.inserted = 0
+        self.updated = 0
+        self.errors = []  # (line, item name, message)
+
+    def add_error(self, line, raw, message):
+        self.errors.append((line, raw.get("item_name", ""), message))
+
+    def summary(self):
+        verb = "Would import" if self.dry_run else "Imported"
+        text = f"{verb} {self.inserted} new and {self.updated} existing item(s) from {self.rows_read} row(s)."
+        if self.errors:
+            text += f"\n{len(self.errors)} row(s) were skipped because of errors."
+        return text
+
+    def write_errors(self, path):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Line", "Item Name", "Error"])
+            writer.writerows(self.errors)
+
+
+class RowValidator:
+    """Checks imported rows with the same rules as the Add Item form."""
+
+    def __init__(self, categories):
+        self.category_ids = {category["category_name"].strip().lower(): category["category_id"] for category in categories}
+        self.veg_types = {veg_type.lower(): veg_type for veg_type in VEG_TYPES}
+        self.price_validator = price_validator()
+
+    def validate(self, raw):
+        """
+        Return the inventory fields for a row, or raise ValueError describing
+        the problem. Optional fields are only included when the file has their column.
+        """
+        item_name = raw.get("item_name", "")
+        if not item_name:
+            raise ValueError("Item name is empty")
+
+        category_id = self.category_ids.get(raw.get("category", "").lower())
+        if category_id is None:
+            raise ValueError(f"Unknown category '{raw.get('category', '')}'")
+
+        is_veg = self.veg_types.get(raw.get("is_veg", "").lower())
+        if is_veg is None:
+            raise ValueError(f"Type must be one of {', '.join(VEG_TYPES)}")
+
+        price = raw.get("price", "")
+        state, _, _ = self.price_validator.validate(price, 0)
+        if state != QValidator.Acceptable:
+            raise ValueError(f"Invalid price '{price}'")
+
+        item = {
+            "category_id": category_id,
+            "is_veg": is_veg,
+            "item_name": item_name,
+            "price": self.price_validator.locale().toDouble(price)[0],
+        }
+        if "item_desc" in raw:
+            item["item_desc"] = raw["item_desc"]
+        if "is_out_of_stock" in raw:
+            out_of_stock = raw["is_out_of_stock"].lower()
+            if out_of_stock not in TRUE_VALUES | FALSE_VALUES:
+                raise ValueError(f"Out of stock must be yes or no, not '{raw['is_out_of_stock']}'")
+            item["is_out_of_stock"] = out_of_stock in TRUE_VALUES
+        return item
+
+
+def import_menu(path, restaurant_id, dry_run=False, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+    """
+    Stream a menu file into the restaurant's inventory.
+
+    Rows are validated one at a time and written in batches of chunk_size: new
+    dishes with one insert per batch, dishes whose name already exists with one
+    upsert per batch. Updates only touch the columns the file has, so a price
+    list leaves descriptions and stock flags alone. With dry_run nothing is
+    written, but the report still says what would happen.
+    """
+    report = ImportReport(dry_run)
+    validator = RowValidator(category_cache.categories())
+    existing = {item["item_name"].strip().lower(): item["item_id"] for item in inventory_repo.list(restaurant_id)}
+    seen = {}
+    inserts, updates = [], []
+    total = count_rows(path) if progress is not None else 0
+
+    def flush():
+        if not dry_run:
+            if inserts:
+                inventory_repo.insert_many(inserts)
+            if updates:
+                inventory_repo.upsert_many(updates)
+        report.inserted += len(inserts)
+        report.updated += len(updates)
+        inserts.clear()
+        updates.clear()
+
+    for line, raw in read_rows(path):
+        if not any(raw.values()):
+            continue  # Blank line
+        report.rows_read += 1
+        try:
+            item = validator.validate(raw)
+            key = item["item_name"].lower()
+            if key in seen:
+                raise ValueError(f"Duplicate of line {seen[key]}")
+            seen[key] = line
+        except ValueError as e:
+            report.add_error(line, raw, str(e))
+        else:
+            item["restaurant_id"] = restaurant_id
+            if key in existing:
+                updates.append(dict(item, item_id=existing[key]))
+            else:
+                inserts.append(dict(INSERT_DEFAULTS, **item))
+            if len(inserts) + len(updates) >= chunk_size:
+                flush()
+
+        if progress is not None:
+            progress((report.rows_read, max(total, report.rows_read)))
+
+    flush()
+    return report
+
+
+def default_report_path(path):
+    root, _ = os.path.splitext(path)
+    return f"{root}_errors.csv"
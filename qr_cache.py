@@ -0,0 +1,203 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from PyQt5.QtGui import QPixmap, QPixmapCache
+
+# qrcode (and PIL behind it) is imported on the first render, not at startup
+ERROR_CORRECTION_LEVELS = ("L", "M", "Q", "H")
+
+# Same output as qrcode.make() with its defaults
+DEFAULT_OPTIONS = {"box_size": 10, "border": 4, "error_correction": "M"}
+
+QR_CACHE_BYTES = int(float(os.getenv("QR_CACHE_MB", "32")) * 1024 * 1024)
+QR_DISK_CACHE_BYTES = int(float(os.getenv("QR_DISK_CACHE_MB", "256")) * 1024 * 1024)
+# Pruning the disk cache frees down to this share of its limit, so it doesn't run on every write
+DISK_PRUNE_TO = 0.8
+
+
+def cache_dir():
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "rome", "qr")
+
+
+def error_correction_constant(level):
+    """The qrcode constant for an error correction level ("L", "M", "Q" or "H")."""
+    from qrcode import constants
+    return getattr(constants, f"ERROR_CORRECT_{level}")
+
+
+def render_png(data, box_size=10, border=4, error_correction="M"):
+    """Encode a QR code for data as PNG bytes."""
+    import qrcode
+    qr = qrcode.QRCode(box_size=box_size, border=border, error_correction=error_correction_constant(error_correction))
+    qr.add_data(data)
+    qr.make(fit=True)
+    buffer = BytesIO()
+    qr.make_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class QRCache:
+    """
+    Rendered QR codes keyed by payload and render options.
+
+    PNG bytes are kept in a memory LRU bounded by total size, backed by an
+    optional directory on disk that survives restarts. The directory is
+    bounded too: once a write takes it past max_disk_bytes, the files used
+    longest ago (by mtime, refreshed on every hit) are removed. png() is
+    thread-safe; pixmap() builds QPixmaps and must be called on the UI thread.
+    """
+
+    def __init__(self, max_bytes=QR_CACHE_BYTES, disk_dir=None, max_disk_bytes=QR_DISK_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        self._disk_lock = threading.Lock()
+        self._disk_size = None  # Measured on the first write
+
+    @staticmethod
+    def key(data, **options):
+        options = dict(DEFAULT_OPTIONS, **options)
+        return (data,) + tuple(sorted(options.items()))
+
+    def png(self, data, **options):
+        """Return the PNG bytes for data, rendering them only on a miss."""
+        png = self.cached_png(data, **options)
+        if png is None:
+            png = render_png(data, **dict(DEFAULT_OPTIONS, **options))
+            self.put(data, png, **options)
+        return png
+
+    def cached_png(self, data, **options):
+        """Return the PNG bytes for data if they are cached in memory or on disk, else None."""
+        key = self.key(data, **options)
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+                return png
+        png = self._read_disk(key)
+        if png is not None:
+            self._remember(key, png)
+        return png
+
+    def put(self, data, png, **options):
+        """Store PNG bytes rendered elsewhere, e.g. in a worker process."""
+        key = self.key(data, **options)
+        self._write_disk(key, png)
+        self._remember(key, png)
+
+    def warm(self, payloads, **options):
+        """Render any of the payloads that aren't cached yet."""
+        for data in payloads:
+            self.png(data, **options)
+
+    def pixmap(self, data, **options):
+        """Return a QPixmap for data, shared through Qt's pixmap cache."""
+        pixmap_key = "qr:" + self._digest(self.key(data, **options))
+        pixmap = QPixmapCache.find(pixmap_key)
+        if pixmap is None or pixmap.isNull():
+            pixmap = QPixmap()
+            pixmap.loadFromData(self.png(data, **options), "PNG")
+            QPixmapCache.insert(pixmap_key, pixmap)
+        return pixmap
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if disk and self.disk_dir and os.path.isdir(self.disk_dir):
+            with self._disk_lock:
+                for name in os.listdir(self.disk_dir):
+                    os.remove(os.path.join(self.disk_dir, name))
+                self._disk_size = 0
+
+    def _remember(self, key, png):
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = png
+            self._size += len(png)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, self._digest(key) + ".png")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                png = f.read()
+            os.utime(path)  # Recently used, so pruned last
+        except OSError:
+            return None
+        return png
+
+    def _write_disk(self, key, png):
+        if not self.disk_dir:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            # Write then rename so a crash never leaves a truncated PNG behind
+            path = self._disk_path(key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(png)
+            with self._disk_lock:
+                replaced = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(temp_path, path)
+                if self._disk_size is None:
+                    self._disk_size = self._measure_disk()
+                else:
+                    self._disk_size += len(png) - replaced
+                if self._disk_size > self.max_disk_bytes:
+                    self._prune_disk()
+        except OSError as e:
+            print(f"Could not write QR cache file: {e}")
+
+    def _disk_files(self):
+        """(mtime, size, path) of every cached PNG. Call with _disk_lock held."""
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".png"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Removed meanwhile
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _measure_disk(self):
+        return sum(size for _, size, _ in self._disk_files())
+
+    def _prune_disk(self):
+        """Remove the least recently used files until the directory is well under its limit."""
+        files = sorted(self._disk_files())
+        size = sum(file_size for _, file_size, _ in files)
+        target = self.max_disk_bytes * DISK_PRUNE_TO
+        for _, file_size, path in files:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= file_size
+        self._disk_size = size
+
+
+qr_cache = QRCache(disk_dir=None if os.getenv("QR_DISK_CACHE") == "0" else cache_dir())
@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from qr_cache import DEFAULT_OPTIONS, qr_cache, render_png
+
+# Below this many uncached codes, starting worker processes costs more than it saves
+MIN_PARALLEL_RENDERS = 16
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def table_filename(table):
+    # Replace invalid filename characters
+    return re.sub(r'[<>:"/\\|?*]', "_", f"Table_{table['table_number']}.png")
+
+
+def export_qr_zip(tables, path, progress=None, cancelled=None, max_workers=None, **options):
+    """
+    Write every table's QR code into a ZIP at path.
+
+    Cached codes are copied straight in; the rest are rendered in a process
+    pool with a bounded number of renders in flight, and each PNG is written
+    to the archive as soon as it is ready. The archive is built next to path
+    and only moved into place once complete, so cancelling (or a failure)
+    never leaves a half-written file behind. Returns the number of codes written.
+    """
+    options = {name: value for name, value in options.items() if name in DEFAULT_OPTIONS}
+    total = len(tables)
+    temp_path = f"{path}.part"
+    done = 0
+
+    def report():
+        if cancelled is not None and cancelled():
+            raise ExportCancelled()
+        if progress is not None:
+            progress((done, total))
+
+    try:
+        # PNGs are already compressed, so store them as-is
+        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_STORED) as archive:
+            missing = []
+            for table in tables:
+                png = qr_cache.cached_png(table["qr_code_data"], **options)
+                if png is None:
+                    missing.append(table)
+                    continue
+                archive.writestr(table_filename(table), png)
+                done += 1
+                report()
+
+            if len(missing) < MIN_PARALLEL_RENDERS:
+                for table in missing:
+                    archive.writestr(table_filename(table), qr_cache.png(table["qr_code_data"], **options))
+                    done += 1
+                    report()
+            else:
+                max_workers = max_workers or os.cpu_count() or 1
+                queue = deque(missing)
+                in_flight = {}
+                # Never fork the running Qt process; start clean interpreters instead
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+                    try:
+                        while queue or in_flight:
+                            # Keep a few renders per process queued, never the whole list
+                            while queue and len(in_flight) < max_workers * 2:
+                                table = queue.popleft()
+                                in_flight[pool.submit(render_png, table["qr_code_data"], **dict(DEFAULT_OPTIONS, **options))] = table
+                            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in finished:
+                                table = in_flight.pop(future)
+                                png = future.result()
+                                qr_cache.put(table["qr_code_data"], png, **options)
+                                archive.writestr(table_filename(table), png)
+                                done += 1
+                            report()
+                    except BaseException:
+                        for future in in_flight:
+                            future.cancel()
+                        raise
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return done
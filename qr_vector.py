@@ -0,0 +1,187 @@
+import os
+from contextlib import contextmanager
+
+from PyQt5.QtCore import QMarginsF, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QPageLayout, QPageSize, QPainter, QPainterPath, QPdfWriter
+
+from qr_cache import error_correction_constant
+
+# Print defaults: a 50 mm code with the standard four-module quiet zone
+DEFAULT_VECTOR_OPTIONS = {"size_mm": 50.0, "error_correction": "M", "border": 4}
+
+PAGE_SIZES = {"A4": QPageSize.A4, "Letter": QPageSize.Letter}
+PDF_RESOLUTION = 1200  # dpi; only affects coordinate precision, output stays vector
+
+
+def qr_matrix(data, error_correction="M", border=4):
+    """Module grid for data, quiet zone included, as rows of booleans."""
+    import qrcode
+    qr = qrcode.QRCode(border=border, error_correction=error_correction_constant(error_correction))
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def dark_runs(matrix):
+    """Yield (x, y, length) for each horizontal run of dark modules."""
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < len(row):
+            if row[x]:
+                start = x
+                while x < len(row) and row[x]:
+                    x += 1
+                yield start, y, x - start
+            else:
+                x += 1
+
+
+def render_svg(data, size_mm=50.0, error_correction="M", border=4):
+    """Return an SVG document for data, size_mm wide including the quiet zone."""
+    matrix = qr_matrix(data, error_correction, border)
+    modules = len(matrix)
+    path = "".join(f"M{x} {y}h{length}v1h-{length}z" for x, y, length in dark_runs(matrix))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size_mm}mm" height="{size_mm}mm" '
+        f'viewBox="0 0 {modules} {modules}" shape-rendering="crispEdges">'
+        f'<rect width="{modules}" height="{modules}" fill="#fff"/>'
+        f'<path d="{path}" fill="#000"/></svg>\n'
+    )
+
+
+def draw_qr(painter, matrix, rect):
+    """Paint a module grid into rect (a square, in painter units) as vector shapes."""
+    module = rect.width() / len(matrix)
+    path = QPainterPath()
+    for x, y, length in dark_runs(matrix):
+        path.addRect(QRectF(rect.x() + x * module, rect.y() + y * module, length * module, module))
+    painter.fillRect(rect, Qt.white)
+    painter.fillPath(path, QColor(Qt.black))
+
+
+def mm_to_units(writer, mm):
+    return mm / 25.4 * writer.resolution()
+
+
+def new_pdf_writer(path, page_size="A4"):
+    writer = QPdfWriter(path)
+    writer.setResolution(PDF_RESOLUTION)
+    writer.setPageLayout(QPageLayout(
+        QPageSize(PAGE_SIZES[page_size]), QPageLayout.Portrait, QMarginsF(0, 0, 0, 0), QPageLayout.Millimeter
+    ))
+    writer.setCreator("R.O.M.E.")
+    return writer
+
+
+@contextmanager
+def pdf_painter(path, page_size="A4"):
+    """
+    Yield (writer, painter) for a PDF at path. The file is written next to
+    path and only moved into place if the block completes.
+    """
+    temp_path = f"{path}.part"
+    writer = new_pdf_writer(temp_path, page_size)
+    painter = QPainter()
+    if not painter.begin(writer):
+        raise OSError(f"Could not write {path}")
+    completed = False
+    try:
+        yield writer, painter
+        completed = True
+    finally:
+        painter.end()
+        if completed:
+            os.replace(temp_path, path)
+        elif os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def write_qr_pdf(tables, path, size_mm=50.0, error_correction="M", border=4, page_size="A4",
+                 progress=None, cancelled=None):
+    """
+    Write one vector QR code per page, centred with its table number below.
+    Pages are emitted as they are drawn, so memory does not grow with the
+    number of tables. Returns the number of pages written.
+    """
+    from qr_export import ExportCancelled
+
+    with pdf_painter(path, page_size) as (writer, painter):
+        page = writer.pageLayout().fullRectPixels(writer.resolution())
+        side = mm_to_units(writer, size_mm)
+        font = QFont("Arial")
+        font.setPixelSize(int(mm_to_units(writer, 8)))
+        painter.setFont(font)
+
+        for done, table in enumerate(tables):
+            if cancelled is not None and cancelled():
+                raise ExportCancelled()
+            if done:
+                writer.newPage()
+            rect = QRectF((page.width() - side) / 2, (page.height() - side) / 2, side, side)
+            draw_qr(painter, qr_matrix(table["qr_code_data"], error_correction, border), rect)
+            caption = QRectF(0, rect.bottom(), page.width(), mm_to_units(writer, 14))
+            painter.drawText(caption, Qt.AlignCenter, f"Table {table['table_number']}")
+            if progress is not None:
+                progress((done + 1, len(tables)))
+    return len(tables)
+
+
+# Label sheets: page size, columns x rows, and the page margin in mm
+SHEET_LAYOUTS = {
+    "A4 - 3 x 4 labels": ("A4", 3, 4, 10),
+    "A4 - 2 x 3 labels": ("A4", 2, 3, 12),
+    "A4 - 4 x 6 labels": ("A4", 4, 6, 8),
+    "Letter - 3 x 4 labels": ("Letter", 3, 4, 10),
+    "Letter - 2 x 3 labels": ("Letter", 2, 3, 12),
+    "Letter - 4 x 5 labels": ("Letter", 4, 5, 8),
+}
+
+
+def write_qr_sheet(tables, path, layout="A4 - 3 x 4 labels", error_correction="M", border=4,
+                   progress=None, cancelled=None, **options):
+    """
+    Tile QR codes and their table numbers onto label sheets in a PDF.
+    Each page is drawn and handed to the writer before the next one starts,
+    so memory stays flat however many tables there are. Returns the number
+    of labels written.
+    """
+    from qr_export import ExportCancelled
+
+    page_size, columns, rows, margin_mm = SHEET_LAYOUTS[layout]
+    per_page = columns * rows
+    with pdf_painter(path, page_size) as (writer, painter):
+        page = writer.pageLayout().fullRectPixels(writer.resolution())
+        margin = mm_to_units(writer, margin_mm)
+        cell_width = (page.width() - 2 * margin) / columns
+        cell_height = (page.height() - 2 * margin) / rows
+        caption_height = min(cell_height * 0.18, mm_to_units(writer, 10))
+        side = min(cell_width, cell_height - caption_height) * 0.9
+
+        font = QFont("Arial")
+        font.setPixelSize(int(caption_height * 0.6))
+        painter.setFont(font)
+        painter.setPen(QColor(Qt.lightGray))
+
+        for done, table in enumerate(tables):
+            if cancelled is not None and cancelled():
+                raise ExportCancelled()
+            slot = done % per_page
+            if done and slot == 0:
+                writer.newPage()
+            cell = QRectF(
+                margin + (slot % columns) * cell_width,
+                margin + (slot // columns) * cell_height,
+                cell_width, cell_height,
+            )
+            # Cut guide around each label
+            painter.drawRect(cell)
+            rect = QRectF(cell.center().x() - side / 2, cell.y() + (cell_height - caption_height - side) / 2, side, side)
+            draw_qr(painter, qr_matrix(table["qr_code_data"], error_correction, border), rect)
+            painter.setPen(QColor(Qt.black))
+            caption = QRectF(cell.x(), cell.bottom() - caption_height, cell_width, caption_height)
+            painter.drawText(caption, Qt.AlignCenter, f"Table {table['table_number']}")
+            painter.setPen(QColor(Qt.lightGray))
+            if progress is not None:
+                progress((done + 1, len(tables)))
+    return len(tables)
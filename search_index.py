@@ -0,0 +1,138 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# How much a hit in each field counts towards an item's rank
+FIELD_WEIGHTS = {
+    "item_name": 3.0,
+    "category_name": 2.0,
+    "is_veg": 1.5,
+    "item_desc": 1.0,
+}
+
+EXACT, PREFIX, FUZZY = 1.0, 0.8, 0.5
+MIN_FUZZY_SIMILARITY = 0.5
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def search_fields(item):
+    """Pull the searchable fields out of an inventory record."""
+    category = item.get("categories") or {}
+    return {
+        "item_name": item.get("item_name"),
+        "item_desc": item.get("item_desc"),
+        "category_name": category.get("category_name"),
+        "is_veg": item.get("is_veg"),
+    }
+
+
+class SearchIndex:
+    """
+    In-memory token index over inventory items.
+
+    Every query token must match some token of the item, either exactly, as a
+    prefix, or fuzzily by trigram similarity. Matches are ranked by match
+    quality times the weight of the field they were found in.
+    """
+
+    def __init__(self, field_weights=None):
+        self.field_weights = field_weights or FIELD_WEIGHTS
+        self.clear()
+
+    def clear(self):
+        self._postings = defaultdict(dict)  # token -> {item_id: best field weight}
+        self._item_tokens = {}  # item_id -> set of tokens
+        self._trigram_tokens = defaultdict(set)  # trigram -> tokens containing it
+        self._sorted_tokens = []
+        self._dirty = False
+
+    def rebuild(self, items):
+        self.clear()
+        for item in items:
+            self.add(item["item_id"], search_fields(item))
+
+    def add(self, item_id, fields):
+        """Index (or re-index) one item from a dict of field name -> text."""
+        self.remove(item_id)
+        tokens = set()
+        for field, text in fields.items():
+            weight = self.field_weights.get(field, 1.0)
+            for token in tokenize(text):
+                postings = self._postings[token]
+                if not postings:
+                    self._dirty = True
+                    for gram in trigrams(token):
+                        self._trigram_tokens[gram].add(token)
+                postings[item_id] = max(postings.get(item_id, 0), weight)
+                tokens.add(token)
+        self._item_tokens[item_id] = tokens
+
+    def remove(self, item_id):
+        for token in self._item_tokens.pop(item_id, ()):
+            postings = self._postings[token]
+            postings.pop(item_id, None)
+            if not postings:
+                del self._postings[token]
+                self._dirty = True
+                for gram in trigrams(token):
+                    self._trigram_tokens[gram].discard(token)
+
+    def search(self, query):
+        """Return {item_id: score} for items matching every token of the query."""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return None
+
+        scores = None
+        for query_token in query_tokens:
+            token_scores = {}
+            for token, quality in self._matching_tokens(query_token):
+                for item_id, weight in self._postings[token].items():
+                    score = quality * weight
+                    if score > token_scores.get(item_id, 0):
+                        token_scores[item_id] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {item_id: scores[item_id] + score for item_id, score in token_scores.items() if item_id in scores}
+            if not scores:
+                return {}
+        return scores
+
+    def _matching_tokens(self, query_token):
+        if self._dirty:
+            self._sorted_tokens = sorted(self._postings)
+            self._dirty = False
+
+        matches = {}
+        # Prefix matches (includes the exact token) from the sorted vocabulary
+        start = bisect_left(self._sorted_tokens, query_token)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(query_token):
+                break
+            matches[token] = EXACT if token == query_token else PREFIX
+
+        # Fuzzy matches for typos and mid-word fragments
+        if len(query_token) >= 3:
+            query_grams = trigrams(query_token)
+            overlap = defaultdict(int)
+            for gram in query_grams:
+                for token in self._trigram_tokens.get(gram, ()):
+                    overlap[token] += 1
+            for token, shared in overlap.items():
+                if token in matches:
+                    continue
+                similarity = shared / len(query_grams)
+                if similarity >= MIN_FUZZY_SIMILARITY:
+                    matches[token] = FUZZY * similarity
+        return matches.items()
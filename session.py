@@ -0,0 +1,78 @@
+from PyQt5.QtCore import QObject
+
+from database import category_cache, inventory_repo, table_repo
+from workers import QueryRunner
+
+
+class SessionContext(QObject):
+    """
+    Everything known about the logged-in restaurant.
+
+    Keeps the row fetched while checking the login, and starts every tab's
+    first query in parallel as soon as the credentials are verified. Tabs
+    ask for their data with request(): the callback runs immediately when the
+    result is already in, or when it arrives.
+    """
+
+    def __init__(self, restaurant, parent=None):
+        super().__init__(parent)
+        self.restaurant_id = restaurant["restaurant_id"]
+        self.restaurant_name = restaurant["restaurant_name"]
+        self.profile = restaurant
+        self.query_runner = QueryRunner(self)
+        self._results = {"profile": (True, restaurant)}
+        self._waiting = {}
+
+    def prefetch(self):
+        """Start loading categories and the first page of tables and inventory at the same time."""
+        queries = {
+            "tables": (table_repo.page, self.restaurant_id),
+            "categories": (category_cache.categories,),
+            "inventory": (inventory_repo.page, self.restaurant_id),
+        }
+        for key, (fn, *args) in queries.items():
+            self.query_runner.submit(
+                key, fn, *args,
+                on_success=lambda result, key=key: self._deliver(key, True, result),
+                on_error=lambda error, key=key: self._deliver(key, False, error),
+            )
+
+    def request(self, key, on_success, on_error=None):
+        """
+        Hand the prefetched result for key to on_success (or the error to
+        on_error). Returns False when there is nothing prefetched for key, in
+        which case the caller should load the data itself.
+        """
+        if key in self._results:
+            self._call(self._results.pop(key), on_success, on_error)
+        elif self.query_runner.is_busy(key):
+            self._waiting[key] = (on_success, on_error)
+        else:
+            return False
+        return True
+
+    def discard(self, key):
+        """Forget a prefetched result that has gone stale."""
+        self._results.pop(key, None)
+        if key not in self._waiting:
+            self.query_runner.cancel(key)
+
+    def cancel(self):
+        self.query_runner.cancel()
+        self._waiting.clear()
+        self._results.clear()
+
+    def _deliver(self, key, ok, value):
+        callbacks = self._waiting.pop(key, None)
+        if callbacks is None:
+            self._results[key] = (ok, value)
+        else:
+            self._call((ok, value), *callbacks)
+
+    @staticmethod
+    def _call(outcome, on_success, on_error):
+        ok, value = outcome
+        if ok:
+            on_success(value)
+        elif on_error is not None:
+            on_error(value)
@@ -4,24 +4,18 @@ from PyQt5.QtWidgets import (
     QFrame, QMessageBox, QHBoxLayout, QComboBox
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon
-import colors
+from theme import set_role
+import assets
 import hashlib
-from supabase import create_client, Client
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(supabase_url, supabase_key)
+from database import restaurant_repo
+from workers import QueryRunner
 
 class SignupScreen(QWidget):
     def __init__(self, switch_to_login):
         super().__init__()
         self.switch_to_login = switch_to_login
         self.password_shown = False
+        self.query_runner = QueryRunner(self)
         self.init_ui()
 
     def init_ui(self):
@@ -30,39 +24,30 @@ class SignupScreen(QWidget):
 
         # Card
         card = QFrame()
-        card.setStyleSheet(f"""
-            background-color: {colors.color_4};
-            border-radius: 10px;
-            padding: 20px;
-            max-width: 500px;
-        """)
+        card.setObjectName("authCard")
         card_layout = QVBoxLayout()
 
         # Title
         title = QLabel("Signup")
-        title.setStyleSheet(f"color: {colors.color_3}; font-size: 32px; font-weight: bold;")
+        title.setObjectName("signupTitle")
         title.setAlignment(Qt.AlignCenter)
         card_layout.addWidget(title)
 
         # Input fields
         self.restaurant_name = QLineEdit()
         self.restaurant_name.setPlaceholderText("Restaurant Name")
-        self.restaurant_name.setStyleSheet(f"background-color: {colors.color_3}; padding: 15px; font-size: 20px;")
         card_layout.addWidget(self.restaurant_name)
 
         self.address = QLineEdit()
         self.address.setPlaceholderText("Address")
-        self.address.setStyleSheet(f"background-color: {colors.color_3}; padding: 15px; font-size: 20px;")
         card_layout.addWidget(self.address)
 
         self.contact = QLineEdit()
         self.contact.setPlaceholderText("Contact Number")
-        self.contact.setStyleSheet(f"background-color: {colors.color_3}; padding: 15px; font-size: 20px;")
         card_layout.addWidget(self.contact)
 
         self.email = QLineEdit()
         self.email.setPlaceholderText("Email")
-        self.email.setStyleSheet(f"background-color: {colors.color_3}; padding: 15px; font-size: 20px;")
         card_layout.addWidget(self.email)
 
         # Password field with toggle visibility button
@@ -70,34 +55,26 @@ class SignupScreen(QWidget):
         self.password = QLineEdit()
         self.password.setPlaceholderText("Password")
         self.password.setEchoMode(QLineEdit.Password)
-        self.password.setStyleSheet(f"background-color: {colors.color_3}; padding: 15px; font-size: 20px;")
         password_layout.addWidget(self.password)
 
         # Eye button for toggling password visibility
         self.toggle_password_button = QPushButton()
-        self.toggle_password_button.setIcon(QIcon("assets/eye_closed.png"))  
+        self.toggle_password_button.setIcon(assets.icon("eye_closed.png"))  
         self.toggle_password_button.setIconSize(self.toggle_password_button.sizeHint())
-        self.toggle_password_button.setStyleSheet(
-            f"""
-            background-color: {colors.color_3};
-            border: 2px solid {colors.color_5};
-            border-radius: 5px;
-            padding: 5px;
-        """
-        )
+        set_role(self.toggle_password_button, "eye")
         self.toggle_password_button.clicked.connect(self.toggle_password_visibility)
         password_layout.addWidget(self.toggle_password_button)
 
         card_layout.addLayout(password_layout)
 
         # Buttons
-        signup_button = QPushButton("Signup")
-        signup_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3}; padding: 15px; font-size: 20px;")
-        signup_button.clicked.connect(self.handle_signup)
-        card_layout.addWidget(signup_button)
+        self.signup_button = QPushButton("Signup")
+        set_role(self.signup_button, "large")
+        self.signup_button.clicked.connect(self.handle_signup)
+        card_layout.addWidget(self.signup_button)
 
         switch_button = QPushButton("Go to Login")
-        switch_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3}; padding: 15px; font-size: 20px;")
+        set_role(switch_button, "large")
         switch_button.clicked.connect(self.switch_to_login)
         card_layout.addWidget(switch_button)
 
@@ -109,10 +86,10 @@ class SignupScreen(QWidget):
         """Toggle password visibility."""
         if self.password_shown:
             self.password.setEchoMode(QLineEdit.Password)
-            self.toggle_password_button.setIcon(QIcon("assets/eye_closed.png"))
+            self.toggle_password_button.setIcon(assets.icon("eye_closed.png"))
         else:
             self.password.setEchoMode(QLineEdit.Normal)
-            self.toggle_password_button.setIcon(QIcon("assets/eye_open.png"))
+            self.toggle_password_button.setIcon(assets.icon("eye_open.png"))
         self.password_shown = not self.password_shown
 
     def handle_signup(self):
@@ -141,26 +118,50 @@ class SignupScreen(QWidget):
             QMessageBox.warning(self, "Input Error", "Please enter a valid email address.")
             return
 
+        new_restaurant = {
+            "restaurant_name": restaurant_name,
+            "address": address,
+            "contact": contact,
+            "email": email,
+            "password": hashed_password
+        }
+        self.set_loading(True)
+        self.query_runner.submit(
+            "signup", self.register_restaurant, new_restaurant,
+            on_success=self.on_signup_result,
+            on_error=self.on_signup_error,
+        )
+
+    @staticmethod
+    def register_restaurant(new_restaurant):
+        """Create the restaurant unless the email is taken. Runs on a worker thread."""
         # Check if email already exists in the database
         try:
-            response = supabase.table("restaurants").select("email").eq("email", email).execute()
-            if response.data:
-                QMessageBox.warning(self, "Error", "This email is already registered.")
-                return
+            if restaurant_repo.email_exists(new_restaurant["email"]):
+                return False
         except Exception as e:
-            QMessageBox.critical(self, "Database Error", f"Error checking email existence: {str(e)}")
-            return
+            raise RuntimeError(f"Error checking email existence: {str(e)}")
 
         # Insert new restaurant into the database
         try:
-            supabase.table("restaurants").insert({
-                "restaurant_name": restaurant_name,
-                "address": address,
-                "contact": contact,
-                "email": email,
-                "password": hashed_password
-            }).execute()
-            QMessageBox.information(self, "Success", "Signup successful! You can now login.")
-            self.switch_to_login()
+            restaurant_repo.create(new_restaurant)
         except Exception as e:
-            QMessageBox.critical(self, "Database Error", f"Error creating account: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Error creating account: {str(e)}")
+        return True
+
+    def on_signup_result(self, created):
+        self.set_loading(False)
+        if not created:
+            QMessageBox.warning(self, "Error", "This email is already registered.")
+            return
+        QMessageBox.information(self, "Success", "Signup successful! You can now login.")
+        self.switch_to_login()
+
+    def on_signup_error(self, error):
+        self.set_loading(False)
+        QMessageBox.critical(self, "Database Error", str(error))
+
+    def set_loading(self, loading):
+        """Show an inline loading state while the account is being created."""
+        self.signup_button.setEnabled(not loading)
+        self.signup_button.setText("Signing up..." if loading else "Signup")
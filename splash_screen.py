@@ -1,12 +1,17 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar
-from PyQt5.QtCore import QTimer, Qt
-from PyQt5.QtGui import QPixmap
-import colors
+from PyQt5.QtCore import Qt
+import assets
+from startup import StartupReport, run_steps, warm_up_steps
+from workers import QueryRunner
 
 class SplashScreen(QWidget):
-    def __init__(self, switch_to_login):
+    """Shown while the app warms up; moves on to login as soon as the warm-up steps finish."""
+
+    def __init__(self, switch_to_login, report=None):
         super().__init__()
         self.switch_to_login = switch_to_login
+        self.report = report or StartupReport()
+        self.query_runner = QueryRunner(self)
         self.init_ui()
 
     def init_ui(self):
@@ -16,51 +21,42 @@ class SplashScreen(QWidget):
 
         # Welcome text
         self.welcome_text = QLabel("Welcome to R.O.M.E. - Restaurant Orders Made Easy")
-        self.welcome_text.setStyleSheet(f"color: {colors.color_1}; font-size: 32px; font-weight: bold; padding: 15px;")
+        self.welcome_text.setObjectName("splashTitle")
         self.welcome_text.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.welcome_text)
 
         # Add a logo
         self.logo = QLabel()
-        self.logo.setPixmap(QPixmap("assets/logo.png"))
-        self.logo.setStyleSheet("padding: 15px;")
+        self.logo.setPixmap(assets.pixmap("logo.png"))
+        self.logo.setObjectName("splashLogo")
         self.logo.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.logo)
 
-        # Add a progress bar for loading animation
+        # Progress through the warm-up steps
         self.progress_bar = QProgressBar()
-        self.progress_bar.setStyleSheet(f"""
-            QProgressBar {{
-                border: 2px solid {colors.color_5};
-                background-color: {colors.color_5};
-                border-radius: 5px;
-                text-align: center;
-                font-size: 18px;
-                color: {colors.color_3};
-                margin: 15px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {colors.color_1};
-                width: 20px;
-            }}
-        """)
-        self.progress_bar.setMaximum(100)
+        self.progress_bar.setObjectName("splashProgress")
         self.progress_bar.setValue(0)
         layout.addWidget(self.progress_bar)
 
-        # Set layout and start loading animation
+        # Set layout and start warming up
         self.setLayout(layout)
         self.start_loading()
 
     def start_loading(self):
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_progress)
-        self.timer.start(50)
-
-    def update_progress(self):
-        value = self.progress_bar.value()
-        if value < 100:
-            self.progress_bar.setValue(value + 1)
-        else:
-            self.timer.stop()
-            self.switch_to_login()
+        steps = warm_up_steps()
+        self.progress_bar.setMaximum(len(steps))
+        self.query_runner.submit(
+            "warm_up", run_steps, steps,
+            on_success=self.on_warmed_up,
+            on_progress=self.update_progress,
+        )
+
+    def update_progress(self, value):
+        done, total, label = value
+        self.progress_bar.setValue(done)
+        self.progress_bar.setFormat(f"{label}...")
+
+    def on_warmed_up(self, steps):
+        self.report.steps = steps
+        self.report.mark("warmed up")
+        self.switch_to_login()
@@ -0,0 +1,201 @@
+import bisect
+import json
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+
+from PyQt5.QtCore import QObject, QTimer
+
+from local_store import data_dir
+
+# The UI thread counts as stalled once it has not run its heartbeat for this long
+STALL_THRESHOLD_MS = float(os.getenv("ROME_STALL_MS", "250"))
+HEARTBEAT_MS = 50
+# Upper bounds of the histogram buckets; longer stalls go in a last, open bucket
+STALL_BUCKETS_MS = (500, 1000, 2000, 5000)
+STALL_LOG = "stalls.json"
+# Innermost frames kept from a stalled stack
+STACK_DEPTH = 12
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Our modules that only pass events on to the handlers that do the work
+DISPATCH_MODULES = ("workers.py", "delegates.py")
+# Calls that run a nested event loop (modal dialogs, message boxes, file
+# pickers); events handled inside one are a new dispatch from Qt
+NESTED_LOOP_CALL = re.compile(
+    r"\.exec_?\(|processEvents\(|\bQMessageBox\.\w+\(|\b(?:QFileDialog|QInputDialog|QColorDialog)\.get\w+\("
+)
+
+
+def bucket_label(ms):
+    index = bisect.bisect_left(STALL_BUCKETS_MS, ms)
+    if index == len(STALL_BUCKETS_MS):
+        return f">{STALL_BUCKETS_MS[-1]:g}ms"
+    return f"<={STALL_BUCKETS_MS[index]:g}ms"
+
+
+def bucket_order(label):
+    """Sort key for a bucket label: by its threshold, the open "> x" bucket after "<= x"."""
+    try:
+        return float(label.strip("<=>ms")), label.startswith(">")
+    except ValueError:
+        return float("inf"), True
+
+
+def is_app_frame(frame):
+    return frame.filename.startswith(APP_DIR) and frame.name != "<module>"
+
+
+def is_handler_frame(frame):
+    return os.path.basename(frame.filename) not in DISPATCH_MODULES and frame.name != "<lambda>"
+
+
+def runs_nested_loop(frame):
+    return bool(frame.line and NESTED_LOOP_CALL.search(frame.line))
+
+
+def describe_frame(frame):
+    return f"{os.path.relpath(frame.filename, APP_DIR)}:{frame.lineno} {frame.name}"
+
+
+class StallHistogram:
+    """
+    Stall durations per handler, kept across runs in stalls.json in the data
+    directory so the worst offenders in the field can be ranked.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), STALL_LOG)
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.handlers = json.load(f)
+        except (OSError, ValueError):
+            self.handlers = {}
+
+    def add(self, handler, ms, stack):
+        entry = self.handlers.setdefault(handler, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": {}, "stack": []})
+        entry["count"] += 1
+        entry["total_ms"] = round(entry["total_ms"] + ms, 1)
+        label = bucket_label(ms)
+        entry["buckets"][label] = entry["buckets"].get(label, 0) + 1
+        if ms >= entry["max_ms"]:
+            entry["max_ms"] = round(ms, 1)
+            entry["stack"] = stack
+
+    def worst(self, limit=10):
+        """Handlers by the total time they have blocked the UI, worst first."""
+        return sorted(self.handlers.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:limit]
+
+    def save(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.handlers, f, indent=1)
+        except OSError as e:
+            print(f"Could not write stall histogram: {e}")
+
+
+class StallWatchdog(QObject):
+    """
+    Notices when the Qt event loop stops turning. A timer on the UI thread
+    beats every HEARTBEAT_MS; a watchdog thread checks the beat and, once it
+    is more than threshold_ms late, samples the UI thread's Python stack with
+    sys._current_frames(). When the beat resumes the stall is added to the
+    histogram under the app function that was handling the event, with the
+    sampled stack alongside. That is the outermost frame of our own code
+    below the innermost nested event loop: a slot running inside a dialog's
+    exec_() is charged for its own stall, not the handler that opened it.
+    ROME_STALL_MS sets the threshold; 0 turns the watchdog off.
+    """
+
+    def __init__(self, threshold_ms=STALL_THRESHOLD_MS, histogram=None, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.histogram = histogram or StallHistogram()
+        self.enabled = threshold_ms > 0 and hasattr(sys, "_current_frames")
+        self._ui_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._sample = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self.beat)
+
+    def start(self):
+        if not self.enabled:
+            return
+        self._last_beat = time.monotonic()
+        self.heartbeat.start()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.heartbeat.stop()
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(1)
+            self._thread = None
+
+    def beat(self):
+        now = time.monotonic()
+        with self._lock:
+            late = now - self._last_beat - HEARTBEAT_MS / 1000
+            self._last_beat = now
+            sample, self._sample = self._sample, None
+        if late > self.threshold:
+            self.record(late * 1000, sample)
+
+    def record(self, ms, sample):
+        if sample is None:
+            # Over before the watchdog looked; all we know is that it happened
+            handler, stack = "(not sampled)", []
+        else:
+            handler, stack = sample
+        print(f"UI stalled for {ms:.0f} ms in {handler}")
+        self.histogram.add(handler, ms, stack)
+        self.histogram.save()
+
+    def _watch(self):
+        while not self._stopping.wait(self.threshold / 4):
+            with self._lock:
+                stalled = time.monotonic() - self._last_beat - HEARTBEAT_MS / 1000 > self.threshold
+                if not stalled or self._sample is not None:
+                    continue
+            sample = self._sample_ui_thread()
+            with self._lock:
+                # Keep it only if the same stall is still going
+                if time.monotonic() - self._last_beat > self.threshold:
+                    self._sample = sample
+
+    def _sample_ui_thread(self):
+        frame = sys._current_frames().get(self._ui_thread_id)
+        if frame is None:
+            return None
+        frames = traceback.extract_stack(frame)
+        app_frames = [frame for frame in frames if is_app_frame(frame)]
+        # Frames above the last call into a nested event loop (a dialog's
+        # exec_(), a message box) are waiting on it, not doing the work
+        nested = [index for index, frame in enumerate(app_frames) if runs_nested_loop(frame)]
+        if nested:
+            app_frames = app_frames[nested[-1] + 1:]
+        # The outermost remaining frame of our code, past the query callbacks
+        # and button delegates that dispatch to it, is the slot or handler Qt
+        # called; with none, the time went in Qt itself (layout, painting, ...)
+        handlers = [frame for frame in app_frames if is_handler_frame(frame)] or app_frames
+        handler = f"{os.path.relpath(handlers[0].filename, APP_DIR)}:{handlers[0].name}" if handlers else "(Qt)"
+        return handler, [describe_frame(frame) for frame in frames[-STACK_DEPTH:]]
+
+
+if __name__ == "__main__":
+    # Rank the handlers in a stalls.json, e.g. one sent in from the field
+    histogram = StallHistogram(sys.argv[1] if len(sys.argv) > 1 else None)
+    for handler, entry in histogram.worst(20):
+        buckets = ", ".join(
+            f"{label} x{count}" for label, count in sorted(entry["buckets"].items(), key=lambda item: bucket_order(item[0]))
+        )
+        print(f"{entry['total_ms']:>10.0f} ms  {entry['count']:>5} stalls  max {entry['max_ms']:>7.0f} ms  {handler}  ({buckets})")
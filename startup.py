@@ -0,0 +1,101 @@
+import json
+import os
+import time
+from datetime import datetime
+
+from local_store import data_dir
+
+STARTUP_LOG = "startup.jsonl"
+# Launches kept in the startup log
+STARTUP_LOG_ENTRIES = 200
+
+
+def load_screens():
+    """Import the login and signup screens and decode the images they show."""
+    import assets
+    import login  # noqa: F401
+    import signup  # noqa: F401
+
+    assets.preload()
+
+
+def warm_up_steps():
+    """The work done behind the splash screen, in order, as (label, function) pairs."""
+    import database
+    import device_session
+
+    return [
+        ("Reading configuration", database.load_config),
+        ("Connecting to the server", database.get_client),
+        ("Loading screens", load_screens),
+        ("Restoring session", device_session.restored_profile),
+        ("Checking the connection", database.probe),
+    ]
+
+
+def run_steps(steps, progress=None):
+    """
+    Run the warm-up steps in order and time each of them. A failing step is
+    recorded and the rest still run: the login screen reports real problems
+    far better than the splash screen can. Runs on a worker thread.
+    """
+    results = []
+    for done, (label, step) in enumerate(steps):
+        if progress is not None:
+            progress((done, len(steps), label))
+        started = time.perf_counter()
+        error = None
+        try:
+            outcome = step()
+        except Exception as e:
+            outcome, error = None, str(e)
+        results.append({
+            "step": label,
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+            "ok": error is None and outcome is not False,
+            "error": error,
+        })
+    if progress is not None:
+        progress((len(steps), len(steps), "Ready"))
+    return results
+
+
+class StartupReport:
+    """
+    How long startup took, milestone by milestone, measured from the moment
+    main.py began importing. Each launch is appended to startup.jsonl in the
+    data directory so regressions show up over time; set ROME_STARTUP_REPORT=1
+    to also print it.
+    """
+
+    def __init__(self, started_at=None):
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.marks = {}
+        self.steps = []
+
+    def mark(self, name):
+        self.marks[name] = round((time.perf_counter() - self.started_at) * 1000, 1)
+
+    def as_dict(self):
+        return {"at": datetime.now().isoformat(timespec="seconds"), "marks_ms": self.marks, "steps": self.steps}
+
+    def summary(self):
+        parts = [f"{name} {ms:.0f} ms" for name, ms in self.marks.items()]
+        parts += [f"{step['step']} {step['ms']:.0f} ms{'' if step['ok'] else ' (failed)'}" for step in self.steps]
+        return "Startup: " + ", ".join(parts)
+
+    def save(self, path=None):
+        path = path or os.path.join(data_dir(), STARTUP_LOG)
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()[-(STARTUP_LOG_ENTRIES - 1):]
+        except OSError:
+            lines = []
+        lines.append(json.dumps(self.as_dict()))
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print(f"Could not write startup report: {e}")
+        if os.getenv("ROME_STARTUP_REPORT") == "1":
+            print(self.summary())
@@ -0,0 +1,92 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from database import is_offline_error, sync_restaurant
+from local_store import get_store
+from workers import QueryRunner
+
+SYNC_INTERVAL_MS = 60 * 1000
+OFFLINE_RETRY_MS = 15 * 1000
+# Syncs between full primary-key checks for rows deleted while realtime
+# events were not arriving (about every half hour at the default interval)
+RECONCILE_EVERY = 30
+
+
+class SyncService(QObject):
+    """
+    Keeps the local mirror in step with Supabase for one restaurant: replays
+    the outbox and pulls deltas in the background on a timer, and retries
+    sooner while the connection is down. The first sync of a session, and
+    every RECONCILE_EVERY-th after it, also looks for deleted rows.
+    """
+
+    synced = pyqtSignal(list)  # tables whose mirrored rows changed
+    status_changed = pyqtSignal(bool, int)  # online, queued writes
+
+    def __init__(self, restaurant_id, interval_ms=SYNC_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.restaurant_id = restaurant_id
+        self.interval_ms = interval_ms
+        self.online = True
+        self.syncs_since_reconcile = RECONCILE_EVERY
+        # Set when a sync is asked for while one is running; it runs once that ends
+        self.sync_again = False
+        self.reconcile_requested = False
+        self.query_runner = QueryRunner(self)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.sync_now)
+
+    def start(self):
+        # Catch up right away: with a mirror from an earlier session this pulls
+        # the deltas, on a new device it fills the mirror while the tabs show
+        # their first pages straight from Supabase
+        self.sync_now()
+
+    def stop(self):
+        self.timer.stop()
+        self.query_runner.cancel()
+
+    def sync_now(self):
+        self.timer.stop()
+        if self.query_runner.is_busy("sync"):
+            # Resubmitting can't stop a sync that has already started
+            self.sync_again = True
+            return
+        self.sync_again = False
+        reconcile = self.reconcile_requested or self.syncs_since_reconcile >= RECONCILE_EVERY
+        self.reconcile_requested = False
+        self.query_runner.submit(
+            "sync", sync_restaurant, self.restaurant_id, reconcile,
+            on_success=lambda changed_tables: self.on_synced(changed_tables, reconcile),
+            on_error=self.on_sync_failed,
+        )
+
+    def reconcile_now(self):
+        """Sync now, checking for deletes too (e.g. after realtime events may have been missed)."""
+        self.reconcile_requested = True
+        self.sync_now()
+
+    def on_synced(self, changed_tables, reconciled=False):
+        self.syncs_since_reconcile = 0 if reconciled else self.syncs_since_reconcile + 1
+        self.set_online(True)
+        if changed_tables:
+            self.synced.emit(changed_tables)
+        self.schedule(self.interval_ms)
+
+    def on_sync_failed(self, error):
+        if is_offline_error(error):
+            self.set_online(False)
+            self.schedule(OFFLINE_RETRY_MS)
+        else:
+            print(f"Sync failed: {error}")
+            self.schedule(self.interval_ms)
+
+    def schedule(self, delay_ms):
+        if self.sync_again:
+            self.sync_now()
+        else:
+            self.timer.start(delay_ms)
+
+    def set_online(self, online):
+        self.online = online
+        self.status_changed.emit(online, get_store().pending_count())
@@ -0,0 +1,154 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+from delegates import ID_ROLE
+
+# Positions of the fields kept for every row in the model's row store
+TABLE_ID, TABLE_NUMBER, QR_CODE_DATA = range(3)
+
+COLUMNS = ["Table Number", "QR Code Data", "", "", ""]
+VIEW_COLUMN, DOWNLOAD_COLUMN, DELETE_COLUMN = 2, 3, 4
+BUTTON_LABELS = {VIEW_COLUMN: "View QR Code", DOWNLOAD_COLUMN: "Download QR Code", DELETE_COLUMN: "Delete Table"}
+
+
+def to_row(table):
+    """Pack a table record from Supabase into a compact tuple."""
+    return (table["table_id"], str(table["table_number"]), table["qr_code_data"])
+
+
+class TableListModel(QAbstractTableModel):
+    """
+    Table model over the restaurant's tables, one plain tuple per row.
+    The button columns are painted by ButtonDelegate and report the table_id
+    of the clicked row, so nothing per row holds on to a record.
+
+    Tables arrive a page at a time: while `cursor` is set the view's
+    fetchMore() asks for the next page through fetch_more_requested.
+    """
+
+    fetch_more_requested = pyqtSignal(object)  # cursor of the last loaded page
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_of = {}
+        self.cursor = None
+        self._fetching = False
+
+    def set_tables(self, tables, cursor=None):
+        self.beginResetModel()
+        self._rows = [to_row(table) for table in tables]
+        self._reindex()
+        self.cursor = cursor
+        self._fetching = False
+        self.endResetModel()
+
+    def append_tables(self, tables, cursor=None):
+        """Add the next page of tables after the loaded ones."""
+        values = [row for row in map(to_row, tables) if row[TABLE_ID] not in self._row_of]
+        self.cursor = cursor
+        self._fetching = False
+        if not values:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(values) - 1)
+        self._rows.extend(values)
+        self._reindex(first)
+        self.endInsertRows()
+
+    def fetch_failed(self):
+        """Let the view ask for the next page again."""
+        self._fetching = False
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.cursor is not None and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._fetching = True
+            self.fetch_more_requested.emit(self.cursor)
+
+    def _reindex(self, start=0):
+        if start == 0:
+            self._row_of = {}
+        for row in range(start, len(self._rows)):
+            self._row_of[self._rows[row][TABLE_ID]] = row
+
+    @staticmethod
+    def _sort_key(values):
+        # Same order as the tables query: table number, then table_id
+        return values[TABLE_NUMBER], values[TABLE_ID]
+
+    def upsert_table(self, table):
+        """
+        Insert or replace a single table, keeping the table number order.
+        Returns False if it belongs to a page that has not been loaded yet.
+        """
+        values = to_row(table)
+        self.remove_table(values[TABLE_ID])
+        key = self._sort_key(values)
+        if self.cursor is not None and self._rows and key > self._sort_key(self._rows[-1]):
+            return False
+        row = next((row for row, existing in enumerate(self._rows) if self._sort_key(existing) > key), len(self._rows))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, values)
+        self._reindex(row)
+        self.endInsertRows()
+        return True
+
+    def remove_table(self, table_id):
+        row = self._row_of.get(table_id)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        del self._row_of[table_id]
+        self._reindex(row)
+        self.endRemoveRows()
+        return True
+
+    def has(self, table_id):
+        return table_id in self._row_of
+
+    def table(self, table_id):
+        """Return the table as a dict shaped like the Supabase record."""
+        values = self._rows[self._row_of[table_id]]
+        return {"table_id": values[TABLE_ID], "table_number": values[TABLE_NUMBER], "qr_code_data": values[QR_CODE_DATA]}
+
+    def tables(self):
+        """Every loaded table as a dict, in display order."""
+        return [
+            {"table_id": values[TABLE_ID], "table_number": values[TABLE_NUMBER], "qr_code_data": values[QR_CODE_DATA]}
+            for values in self._rows
+        ]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        values = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return values[TABLE_NUMBER]
+            if column == 1:
+                return values[QR_CODE_DATA]
+            return BUTTON_LABELS.get(column)
+        if role == ID_ROLE:
+            return values[TABLE_ID]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
@@ -1,33 +1,65 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel,
-    QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView, QDialog, QFileDialog
+    QMessageBox, QTableView, QHeaderView, QDialog, QFileDialog, QProgressDialog, QCheckBox,
+    QFormLayout, QDoubleSpinBox, QSpinBox, QComboBox
 )
-from PyQt5.QtGui import QPixmap, QColor
 from PyQt5.QtCore import Qt
-from dotenv import load_dotenv
-from supabase import create_client, Client
-import os
-import colors
-import qrcode
-from io import BytesIO
-import zipfile
+from theme import set_role, theme
+from database import table_repo
+from workers import QueryRunner
+from table_model import TableListModel, VIEW_COLUMN, DOWNLOAD_COLUMN, DELETE_COLUMN
+from delegates import ButtonDelegate
+from qr_cache import qr_cache
+from qr_vector import DEFAULT_VECTOR_OPTIONS, SHEET_LAYOUTS, render_svg, write_qr_pdf, write_qr_sheet
+from qr_cache import ERROR_CORRECTION_LEVELS
+import threading
 import re
 
-# Load environment variables
-load_dotenv()
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(supabase_url, supabase_key)
-
-
-def create_table_tab(restaurant_id):
+QR_BASE_URL = "https://rome-website-customer-admin.onrender.com/"
+TABLE_RANGE = re.compile(r"^\s*([A-Za-z]*)(\d+)\s*[-–—]\s*([A-Za-z]*)(\d+)\s*$")
+MAX_TABLES_PER_RANGE = 500
+
+
+def parse_table_numbers(text):
+    """
+    Expand "12", "1-120" or "A1-A40" into a list of table numbers.
+    Leading zeros on the first number ("A01-A40") are kept for every number.
+    Raises ValueError for a malformed range.
+    """
+    match = TABLE_RANGE.match(text)
+    if not match:
+        return [text.strip()]
+    prefix, start, end_prefix, end = match.groups()
+    if end_prefix and end_prefix.lower() != prefix.lower():
+        raise ValueError(f"Both ends of the range must start with '{prefix}'.")
+    first, last = int(start), int(end)
+    if first > last:
+        raise ValueError("The range must go from the lower number to the higher one.")
+    if last - first + 1 > MAX_TABLES_PER_RANGE:
+        raise ValueError(f"A range can create at most {MAX_TABLES_PER_RANGE} tables at once.")
+    width = len(start) if start.startswith("0") else 0
+    return [f"{prefix}{number:0{width}d}" for number in range(first, last + 1)]
+
+
+def qr_code_url(table_number, restaurant_id):
+    return f"{QR_BASE_URL}{table_number}/{restaurant_id}"
+
+
+def create_table_tab(restaurant_id, session=None):
     class TableManagementTab(QWidget):
         def __init__(self):
             super().__init__()
             self.restaurant_id = restaurant_id
-            self.setStyleSheet("background-color: white;")
+            self.query_runner = QueryRunner(self)
+            self.total_tables = None
+            self.qr_options = dict(DEFAULT_VECTOR_OPTIONS)
+            set_role(self, "page")
             self.init_ui()
-            self.load_tables()
+            if session is None or not session.request(
+                "tables", self.on_tables_loaded,
+                on_error=lambda e: self.show_error("Failed to load tables", e),
+            ):
+                self.load_tables()
 
         def init_ui(self):
             layout = QVBoxLayout()
@@ -36,117 +68,196 @@ def create_table_tab(restaurant_id):
             input_layout = QHBoxLayout()
 
             self.table_number_input = QLineEdit()
-            self.table_number_input.setPlaceholderText("Enter Table Number")
+            self.table_number_input.setPlaceholderText("Enter Table Number or Range (e.g. 1-120, A1-A40)")
             self.table_number_input.setFixedHeight(45)
             input_layout.addWidget(self.table_number_input)
 
             add_button = QPushButton("Add Table")
             add_button.setFixedHeight(45)
-            add_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3};")
+            set_role(add_button, "primary")
             add_button.clicked.connect(self.add_table)
             input_layout.addWidget(add_button)
 
+            self.prerender_checkbox = QCheckBox("Pre-render QR codes")
+            self.prerender_checkbox.setChecked(True)
+            input_layout.addWidget(self.prerender_checkbox)
+
             download_all_button = QPushButton("Download All QR Codes")
             download_all_button.setFixedHeight(45)
-            download_all_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3};")
+            set_role(download_all_button, "primary")
             download_all_button.clicked.connect(self.download_all_qr_codes)
             input_layout.addWidget(download_all_button)
 
+            print_sheet_button = QPushButton("Print QR Sheet")
+            print_sheet_button.setFixedHeight(45)
+            set_role(print_sheet_button, "primary")
+            print_sheet_button.clicked.connect(self.print_qr_sheet)
+            input_layout.addWidget(print_sheet_button)
+
+            qr_options_button = QPushButton("QR Options")
+            qr_options_button.setFixedHeight(45)
+            set_role(qr_options_button, "primary")
+            qr_options_button.clicked.connect(self.show_qr_options_dialog)
+            input_layout.addWidget(qr_options_button)
+
             layout.addLayout(input_layout)
 
-            # Table to display the data
-            self.table_widget = QTableWidget()
-            self.table_widget.setColumnCount(5)
-            self.table_widget.setRowCount(1)  # Start with just the custom header
-            self.table_widget.setHorizontalHeaderLabels(["", "", "", "", ""])  # Remove default headers
-            self.table_widget.horizontalHeader().setVisible(False)  # Hide header completely
-            self.table_widget.verticalHeader().setVisible(False)  # Hide row headers
+            # Inline loading state, and how many of the tables are loaded
+            status_layout = QHBoxLayout()
+            self.status_label = QLabel()
+            status_layout.addWidget(self.status_label)
+            self.count_label = QLabel()
+            self.count_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            status_layout.addWidget(self.count_label)
+            layout.addLayout(status_layout)
+
+            # Table setup: a model/view grid with painted buttons, so rows cost nothing until they are painted
+            self.table_model = TableListModel(self)
+            self.table_model.fetch_more_requested.connect(self.load_more_tables)
+
+            self.table_view = QTableView()
+            self.table_view.setModel(self.table_model)
+            self.table_view.verticalHeader().setVisible(False)
+            self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+            self.table_view.verticalHeader().setDefaultSectionSize(40)
+            self.table_view.setSelectionBehavior(QTableView.SelectRows)
 
             # Spread columns evenly
-            header = self.table_widget.horizontalHeader()
+            header = self.table_view.horizontalHeader()
             header.setSectionResizeMode(QHeaderView.Stretch)
 
-            # Add custom header row
-            header_items = ["Table Number", "QR Code Data", "", "", ""]
-            for col, header_text in enumerate(header_items):
-                header_item = QTableWidgetItem(header_text)
-                header_item.setTextAlignment(Qt.AlignCenter)
-                header_item.setFlags(Qt.ItemIsEnabled)  # Non-editable
-                header_item.setBackground(QColor(colors.color_1))
-                header_item.setForeground(QColor(colors.color_3))
-                self.table_widget.setItem(0, col, header_item)
-
-            layout.addWidget(self.table_widget)
+            self.view_delegate = ButtonDelegate(self.table_view)
+            self.view_delegate.clicked.connect(lambda table_id: self.view_qr_code(self.qr_of(table_id)[0]))
+            self.table_view.setItemDelegateForColumn(VIEW_COLUMN, self.view_delegate)
+
+            self.download_delegate = ButtonDelegate(self.table_view)
+            self.download_delegate.clicked.connect(lambda table_id: self.download_qr_code(*self.qr_of(table_id)))
+            self.table_view.setItemDelegateForColumn(DOWNLOAD_COLUMN, self.download_delegate)
+
+            self.delete_delegate = ButtonDelegate(self.table_view)
+            self.delete_delegate.clicked.connect(lambda table_id: self.delete_table(table_id, self.table_model.table(table_id)["table_number"]))
+            self.table_view.setItemDelegateForColumn(DELETE_COLUMN, self.delete_delegate)
+            # The delegates paint with theme colours, which the stylesheet doesn't reach
+            theme.changed.connect(self.repaint_buttons)
+
+            layout.addWidget(self.table_view)
             self.setLayout(layout)
 
+        def qr_of(self, table_id):
+            table = self.table_model.table(table_id)
+            return table["qr_code_data"], table["table_number"]
+
         def load_tables(self):
-            """Load tables from the database."""
-            response = supabase.table("tables").select("*").eq("restaurant_id", self.restaurant_id).order("table_number", desc=False).execute()
-            
-            tables = response.data or []
-            self.table_widget.setRowCount(len(tables) + 1)
-
-            # Add rows for tables
-            for row, table in enumerate(tables, start=1):
-                self.table_widget.setItem(row, 0, QTableWidgetItem(str(table["table_number"])))
-                self.table_widget.setItem(row, 1, QTableWidgetItem(table["qr_code_data"]))
-
-                # View QR Code button
-                view_button = QPushButton("View QR Code")
-                view_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3};")
-                view_button.clicked.connect(lambda _, t=table: self.view_qr_code(t["qr_code_data"]))
-                self.table_widget.setCellWidget(row, 2, view_button)
-
-                # Download QR Code button
-                download_button = QPushButton("Download QR Code")
-                download_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3};")
-                download_button.clicked.connect(lambda _, t=table: self.download_qr_code(t["qr_code_data"], t["table_number"]))
-                self.table_widget.setCellWidget(row, 3, download_button)
-
-                # Delete Table button
-                delete_button = QPushButton("Delete Table")
-                delete_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3};")
-                delete_button.clicked.connect(lambda _, t=table: self.delete_table(t["table_id"], t["table_number"]))
-                self.table_widget.setCellWidget(row, 4, delete_button)
+            """Load the first page of tables from the database."""
+            self.status_label.setText("Loading tables...")
+            self.query_runner.cancel("more_tables")
+            self.query_runner.submit(
+                "load_tables", table_repo.page, self.restaurant_id,
+                on_success=self.on_tables_loaded,
+                on_error=lambda e: self.show_error("Failed to load tables", e),
+            )
+
+        def on_tables_loaded(self, page):
+            self.status_label.clear()
+            self.total_tables = page.total
+            self.table_model.set_tables(page.rows, page.cursor)
+            self.update_count_label()
+
+        def load_more_tables(self, cursor):
+            """Load the page of tables after cursor."""
+            self.query_runner.submit(
+                "more_tables", table_repo.page, self.restaurant_id, cursor,
+                on_success=self.on_more_tables_loaded,
+                on_error=self.on_more_tables_failed,
+            )
+
+        def on_more_tables_loaded(self, page):
+            self.table_model.append_tables(page.rows, page.cursor)
+            self.update_count_label()
+
+        def on_more_tables_failed(self, error):
+            self.table_model.fetch_failed()
+            self.show_error("Failed to load more tables", error)
+
+        def repaint_buttons(self, _theme_name=None):
+            self.table_view.viewport().update()
+
+        def update_count_label(self):
+            loaded = self.table_model.rowCount()
+            total = max(self.total_tables or 0, loaded)
+            self.count_label.setText(f"{total} tables" if loaded == total else f"Showing {loaded} of {total} tables")
 
         def add_table(self):
-            """Add a table to the database."""
-            table_number = self.table_number_input.text().strip()
-            if not table_number:
+            """Add a table, or a range of tables, to the database."""
+            text = self.table_number_input.text().strip()
+            if not text:
                 QMessageBox.warning(self, "Error", "Table Number cannot be empty.")
                 return
+            try:
+                table_numbers = parse_table_numbers(text)
+            except ValueError as e:
+                QMessageBox.warning(self, "Error", str(e))
+                return
 
-            # Check for duplicate table number
-            response = supabase.table("tables").select("table_id").eq("restaurant_id", self.restaurant_id).eq("table_number", table_number).execute()
-            if response.data:
-                QMessageBox.warning(self, "Error", f"Table Number {table_number} already exists.")
+            self.status_label.setText(f"Adding {len(table_numbers)} table(s)..." if len(table_numbers) > 1 else "Adding table...")
+            self.query_runner.submit(
+                "add_table", self.create_tables, table_numbers,
+                on_success=lambda result: self.on_tables_added(table_numbers, *result),
+                on_error=lambda e: self.show_error("Failed to add table", e),
+            )
+
+        def create_tables(self, table_numbers):
+            """
+            Insert every table number that is not taken yet, in one batch.
+            Returns (created rows, skipped numbers). Runs on a worker thread.
+            """
+            # Check for duplicate table numbers
+            taken = table_repo.existing_numbers(self.restaurant_id, table_numbers)
+            new_rows = [
+                {
+                    "restaurant_id": self.restaurant_id,
+                    "table_number": table_number,
+                    "qr_code_data": qr_code_url(table_number, restaurant_id),
+                }
+                for table_number in table_numbers if table_number not in taken
+            ]
+            created = table_repo.create_many(new_rows) if new_rows else []
+            return created, [table_number for table_number in table_numbers if table_number in taken]
+
+        def on_tables_added(self, table_numbers, created, skipped):
+            self.status_label.clear()
+            if not created:
+                if len(table_numbers) == 1:
+                    QMessageBox.warning(self, "Error", f"Table Number {table_numbers[0]} already exists.")
+                else:
+                    QMessageBox.warning(self, "Error", "All of these tables already exist.")
                 return
 
-            # Add table to the database
-            base_url = "https://rome-website-customer-admin.onrender.com/"
-            qr_code_data = f"{base_url}{table_number}/{restaurant_id}"
-            supabase.table("tables").insert({
-                "restaurant_id": self.restaurant_id,
-                "table_number": table_number,
-                "qr_code_data": qr_code_data
-            }).execute()
-            QMessageBox.information(self, "Success", "Table added successfully.")
+            if len(table_numbers) == 1:
+                QMessageBox.information(self, "Success", "Table added successfully.")
+            else:
+                message = f"{len(created)} tables added successfully."
+                if skipped:
+                    message += f"\nSkipped existing table(s): {', '.join(skipped)}"
+                QMessageBox.information(self, "Success", message)
             self.table_number_input.clear()
             self.load_tables()
 
+            if self.prerender_checkbox.isChecked():
+                # Warm the QR cache so viewing and exporting are instant later
+                self.query_runner.submit(
+                    f"prerender_qr:{created[0]['table_id']}", qr_cache.warm,
+                    [row["qr_code_data"] for row in created], **self.png_options(),
+                )
+
         def view_qr_code(self, qr_code_data):
             """Display QR Code for a table."""
             dialog = QDialog(self)
             dialog.setWindowTitle("QR Code Viewer")
             layout = QVBoxLayout()
 
-            qr_image = qrcode.make(qr_code_data)
-            buffer = BytesIO()
-            qr_image.save(buffer, format="PNG")
-            pixmap = QPixmap()
-            pixmap.loadFromData(buffer.getvalue())
             label = QLabel()
-            label.setPixmap(pixmap)
+            label.setPixmap(qr_cache.pixmap(qr_code_data, **self.png_options()))
             layout.addWidget(label)
 
             dialog.setLayout(layout)
@@ -154,16 +265,65 @@ def create_table_tab(restaurant_id):
 
         def download_qr_code(self, qr_code_data, table_number):
             """Download the QR code for the specific table."""
-            qr_image = qrcode.make(qr_code_data)
-
             # Replace invalid filename characters
-            safe_qr_code_data = re.sub(r'[<>:"/\\|?*]', '_', qr_code_data)
+            safe_table_number = re.sub(r'[<>:"/\\|?*]', '_', str(table_number))
 
-            filename = f"Table Number - {table_number}.png"
-            qr_image.save(filename)
+            filename, _ = QFileDialog.getSaveFileName(
+                self, "Save QR Code", f"Table Number - {safe_table_number}.png",
+                "PNG Image (*.png);;SVG Vector (*.svg)"
+            )
+            if not filename:
+                return
+            if filename.lower().endswith(".svg"):
+                with open(filename, "w", encoding="utf-8") as f:
+                    f.write(render_svg(qr_code_data, **self.qr_options))
+            else:
+                with open(filename, "wb") as f:
+                    f.write(qr_cache.png(qr_code_data, **self.png_options()))
 
             QMessageBox.information(self, "Success", "QR Code downloaded successfully.")
 
+        def png_options(self):
+            """The QR options that apply to PNG output (size is fixed by the pixel grid)."""
+            return {"error_correction": self.qr_options["error_correction"], "border": self.qr_options["border"]}
+
+        def show_qr_options_dialog(self):
+            """Edit the size, error correction and quiet zone used for QR downloads."""
+            dialog = QDialog(self)
+            dialog.setWindowTitle("QR Options")
+            layout = QFormLayout()
+
+            size_input = QDoubleSpinBox()
+            size_input.setRange(10, 500)
+            size_input.setSuffix(" mm")
+            size_input.setValue(self.qr_options["size_mm"])
+            layout.addRow("Printed size (SVG/PDF):", size_input)
+
+            error_correction_dropdown = QComboBox()
+            for level, label in zip(ERROR_CORRECTION_LEVELS, ["Low (7%)", "Medium (15%)", "Quartile (25%)", "High (30%)"]):
+                error_correction_dropdown.addItem(label, level)
+            error_correction_dropdown.setCurrentIndex(list(ERROR_CORRECTION_LEVELS).index(self.qr_options["error_correction"]))
+            layout.addRow("Error correction:", error_correction_dropdown)
+
+            border_input = QSpinBox()
+            border_input.setRange(0, 20)
+            border_input.setSuffix(" modules")
+            border_input.setValue(self.qr_options["border"])
+            layout.addRow("Quiet zone:", border_input)
+
+            save_button = QPushButton("Save")
+            set_role(save_button, "primary")
+            save_button.clicked.connect(dialog.accept)
+            layout.addRow(save_button)
+
+            dialog.setLayout(layout)
+            if dialog.exec_() == QDialog.Accepted:
+                self.qr_options = {
+                    "size_mm": size_input.value(),
+                    "error_correction": error_correction_dropdown.currentData(),
+                    "border": border_input.value(),
+                }
+
         def delete_table(self, table_id, table_number):
             """Delete a table from the database with confirmation."""
             confirmation = QMessageBox.question(
@@ -172,36 +332,127 @@ def create_table_tab(restaurant_id):
                 QMessageBox.Yes | QMessageBox.No
             )
             if confirmation == QMessageBox.Yes:
-                supabase.table("tables").delete().eq("table_id", table_id).execute()
-                QMessageBox.information(self, "Success", f"Table {table_number} deleted successfully.")
-                self.load_tables()
+                self.status_label.setText(f"Deleting table {table_number}...")
+                self.query_runner.submit(
+                    f"delete_table:{table_id}", table_repo.delete, table_id,
+                    on_success=lambda _: self.on_table_deleted(table_number),
+                    on_error=lambda e: self.show_error("Failed to delete table", e),
+                )
+
+        def on_table_deleted(self, table_number):
+            self.status_label.clear()
+            QMessageBox.information(self, "Success", f"Table {table_number} deleted successfully.")
+            self.load_tables()
 
         def download_all_qr_codes(self):
             """Download all QR Codes as a ZIP file."""
-            response = supabase.table("tables").select("*").eq("restaurant_id", self.restaurant_id).order("table_number").execute()
-            if not response.data:
+            if not self.table_model.rowCount():
                 QMessageBox.warning(self, "Error", "No tables to download.")
                 return
+            save_path, _ = QFileDialog.getSaveFileName(
+                self, "Save QR Codes", "qr_codes.zip", "ZIP of PNG Images (*.zip);;Vector PDF (*.pdf)"
+            )
+            if save_path:
+                self.start_export("Download All QR Codes", save_path, self.save_qr_codes_zip)
+
+        def print_qr_sheet(self):
+            """Lay the loaded tables' QR codes out on printable label sheets."""
+            if not self.table_model.rowCount():
+                QMessageBox.warning(self, "Error", "No tables to print.")
+                return
+
+            dialog = QDialog(self)
+            dialog.setWindowTitle("Print QR Sheet")
+            layout = QFormLayout()
+            layout_dropdown = QComboBox()
+            layout_dropdown.addItems(SHEET_LAYOUTS)
+            layout.addRow("Label layout:", layout_dropdown)
+            next_button = QPushButton("Save PDF")
+            set_role(next_button, "primary")
+            next_button.clicked.connect(dialog.accept)
+            layout.addRow(next_button)
+            dialog.setLayout(layout)
+            if dialog.exec_() != QDialog.Accepted:
+                return
 
-            # Create an in-memory ZIP file
-            zip_buffer = BytesIO()
-            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                for table in response.data:
-                    qr_image = qrcode.make(table["qr_code_data"])
-                    qr_buffer = BytesIO()
-                    qr_image.save(qr_buffer, format="PNG")
-                    qr_buffer.seek(0)
-
-                    # Add the QR code to the ZIP file
-                    qr_filename = f"Table_{table['table_number']}.png"
-                    zip_file.writestr(qr_filename, qr_buffer.getvalue())
-
-            # Write the ZIP file to the user's chosen location
-            zip_buffer.seek(0)
-            save_path, _ = QFileDialog.getSaveFileName(self, "Save QR Codes ZIP", "qr_codes.zip", "ZIP files (*.zip)")
+            save_path, _ = QFileDialog.getSaveFileName(self, "Save QR Sheet", "qr_sheet.pdf", "PDF files (*.pdf)")
             if save_path:
-                with open(save_path, "wb") as f:
-                    f.write(zip_buffer.getvalue())
-                QMessageBox.information(self, "Success", f"QR Codes saved as {save_path}.")
+                # Use the tables already on screen, unless some are not loaded yet
+                tables = self.table_model.tables() if self.table_model.cursor is None else None
+                sheet_layout = layout_dropdown.currentText()
+                self.start_export(
+                    "Print QR Sheet", save_path,
+                    lambda path, progress=None, cancelled=None: write_qr_sheet(
+                        tables if tables is not None else table_repo.list(self.restaurant_id),
+                        path, sheet_layout, progress=progress, cancelled=cancelled, **self.qr_options
+                    ),
+                )
+
+        def start_export(self, title, save_path, export):
+            """Run export(save_path) on a worker thread behind a cancellable progress dialog."""
+            self.export_cancelled = threading.Event()
+            self.export_progress = QProgressDialog("Rendering QR codes...", "Cancel", 0, max(self.total_tables or 0, self.table_model.rowCount()), self)
+            self.export_progress.setWindowTitle(title)
+            self.export_progress.setWindowModality(Qt.WindowModal)
+            self.export_progress.setMinimumDuration(0)
+            self.export_progress.canceled.connect(self.export_cancelled.set)
+            self.export_progress.show()
+
+            self.query_runner.submit(
+                "export", export, save_path, cancelled=self.export_cancelled.is_set,
+                on_success=lambda count: self.on_qr_codes_saved(save_path, count),
+                on_error=self.on_qr_export_failed,
+                on_progress=self.on_export_progress,
+            )
+
+        def save_qr_codes_zip(self, save_path, progress=None, cancelled=None):
+            """
+            Render the restaurant's QR codes into a ZIP of PNGs, or a vector PDF
+            with one code per page when save_path ends in .pdf. Runs on a worker thread.
+            """
+            from qr_export import export_qr_zip  # Pulls in zipfile and multiprocessing; only needed here
+
+            tables = table_repo.list(self.restaurant_id)
+            if save_path.lower().endswith(".pdf"):
+                return write_qr_pdf(tables, save_path, progress=progress, cancelled=cancelled, **self.qr_options)
+            return export_qr_zip(tables, save_path, progress=progress, cancelled=cancelled, **self.png_options())
+
+        def on_export_progress(self, value):
+            done, total = value
+            self.export_progress.setMaximum(total)
+            self.export_progress.setValue(done)
+
+        def on_qr_codes_saved(self, save_path, count):
+            self.export_progress.close()
+            QMessageBox.information(self, "Success", f"{count} QR Codes saved as {save_path}.")
+
+        def on_qr_export_failed(self, error):
+            from qr_export import ExportCancelled
+
+            self.export_progress.close()
+            if not isinstance(error, ExportCancelled):
+                self.show_error("Failed to save QR codes", error)
+
+        def apply_remote_change(self, event_type, record, old_record):
+            """Apply an insert/update/delete pushed by another terminal."""
+            changed_id = (old_record if event_type == "DELETE" else record).get("table_id")
+            if changed_id is None:
+                return
+            known = self.table_model.has(changed_id)
+            if self.total_tables is not None:
+                if event_type == "DELETE" and known:
+                    self.total_tables -= 1
+                elif event_type == "INSERT" and not known:
+                    self.total_tables += 1
+            if event_type == "DELETE":
+                self.table_model.remove_table(changed_id)
+            else:
+                # Tables past the last loaded one arrive with a later page
+                self.table_model.upsert_table(record)
+            self.update_count_label()
+
+        def show_error(self, message, error):
+            self.status_label.clear()
+            QMessageBox.critical(self, "Error", f"{message}: {str(error)}")
 
     return TableManagementTab()
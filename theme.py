@@ -0,0 +1,113 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+import colors
+
+# Each theme maps the roles used in the stylesheet to colours.
+# "Classic" is the original palette from colors.py.
+THEMES = {
+    "Classic": {
+        "accent": colors.color_1,
+        "highlight": colors.color_2,
+        "background": colors.color_3,
+        "surface": colors.color_4,
+        "accent_dark": colors.color_5,
+        "on_accent": colors.color_3,
+        "on_surface": colors.color_3,
+        "page": "#FFFFFF",
+        "text": "#000000",
+    },
+    "Dark": {
+        "accent": "#C0392B",
+        "highlight": "#FF7043",
+        "background": "#1E1E1E",
+        "surface": "#121212",
+        "accent_dark": "#7B1F1F",
+        "on_accent": "#FDF5E6",
+        "on_surface": "#FDF5E6",
+        "page": "#2A2A2A",
+        "text": "#EEEEEE",
+    },
+}
+DEFAULT_THEME = "Classic"
+
+# Widgets opt in to these rules with set_role() or an object name
+STYLESHEET = """
+QWidget {{ background-color: {background}; color: {text}; }}
+QWidget[role="page"], QWidget[role="page"] QWidget {{ background-color: {page}; }}
+QTabWidget::pane {{ padding: 10px; }}
+QHeaderView::section {{ background-color: {accent}; color: {on_accent}; }}
+
+QWidget QPushButton[role="primary"], QWidget QPushButton[role="action"], QWidget QPushButton[role="large"] {{
+    background-color: {accent}; color: {on_accent};
+}}
+QPushButton[role="action"] {{ border-radius: 5px; padding: 5px; }}
+QPushButton[role="large"] {{ padding: 15px; font-size: 20px; }}
+QWidget QPushButton[role="eye"] {{
+    background-color: {background}; border: 2px solid {accent_dark}; border-radius: 5px; padding: 5px;
+}}
+
+QLabel[role="field-label"] {{ color: {accent}; font-size: 20px; }}
+QLineEdit[role="field"] {{ font-size: 20px; }}
+QLabel[role="status"] {{ color: {surface}; font-size: 16px; }}
+
+QFrame#authCard {{ background-color: {surface}; border-radius: 10px; padding: 20px; max-width: 500px; }}
+QFrame#authCard QLabel {{ background-color: {surface}; color: {on_surface}; font-weight: bold; }}
+QFrame#authCard QLineEdit {{ background-color: {background}; padding: 15px; font-size: 20px; border-radius: 10px; }}
+QLabel#loginTitle {{ font-size: 28px; }}
+QLabel#signupTitle {{ font-size: 32px; }}
+
+QFrame#homeHeader {{ background-color: {surface}; padding: 10px; border-radius: 5px; }}
+QLabel#restaurantName {{ background-color: {surface}; color: {on_surface}; font-size: 20px; font-weight: bold; }}
+QLabel#syncStatus {{ background-color: {surface}; color: {highlight}; font-size: 16px; }}
+QComboBox#themeSelector {{ background-color: {surface}; color: {on_surface}; padding: 10px; }}
+QPushButton#logoutButton {{ padding: 10px; }}
+QPushButton#updateProfileButton {{ padding: 10px; font-size: 20px; }}
+
+QLabel#splashTitle {{ color: {accent}; font-size: 32px; font-weight: bold; padding: 15px; }}
+QLabel#splashLogo {{ padding: 15px; }}
+QProgressBar#splashProgress {{
+    border: 2px solid {accent_dark}; background-color: {accent_dark}; border-radius: 5px;
+    text-align: center; font-size: 18px; color: {on_accent}; margin: 15px;
+}}
+QProgressBar#splashProgress::chunk {{ background-color: {accent}; width: 20px; }}
+"""
+
+
+def set_role(widget, role):
+    """Tag a widget with a stylesheet role, e.g. set_role(button, "primary")."""
+    widget.setProperty("role", role)
+    return widget
+
+
+class ThemeManager(QObject):
+    """
+    Compiles the application stylesheet once per theme and installs it on the
+    QApplication, so individual widgets never parse a stylesheet of their own.
+    Code that paints with theme colours directly listens to `changed`.
+    """
+
+    changed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.name = DEFAULT_THEME
+        self._compiled = {}
+
+    def color(self, role):
+        return THEMES[self.name][role]
+
+    def stylesheet(self, name):
+        if name not in self._compiled:
+            self._compiled[name] = STYLESHEET.format(**THEMES[name])
+        return self._compiled[name]
+
+    def apply(self, name=DEFAULT_THEME):
+        """Switch the whole application to the named theme."""
+        if name not in THEMES:
+            name = DEFAULT_THEME
+        self.name = name
+        QApplication.instance().setStyleSheet(self.stylesheet(name))
+        self.changed.emit(name)
+
+
+theme = ThemeManager()
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QHBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem, QVBoxLayout, QWidget
+
+from theme import set_role
+from tracing import COUNT_BYTES, tracer
+
+REFRESH_MS = 500
+COLUMNS = ["Action / call", "Round trips", "ms", "Rows", "Bytes", "Sent", "Error"]
+
+
+class TraceOverlay(QWidget):
+    """
+    Developer window listing recent actions, newest first, with the Supabase
+    calls each one made. Toggled with Ctrl+Shift+D; redraws while visible.
+    Payload sizes are measured while it is open (or with ROME_TRACE_BYTES=1).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.Tool)
+        self.setWindowTitle("Data access trace")
+        self.resize(900, 500)
+        self.shown_version = -1
+
+        layout = QVBoxLayout()
+        header = QHBoxLayout()
+        self.summary_label = QLabel()
+        set_role(self.summary_label, "status")
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(tracer.clear)
+        header.addWidget(self.summary_label)
+        header.addStretch()
+        header.addWidget(clear_button)
+        layout.addLayout(header)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(COLUMNS)
+        self.tree.setColumnWidth(0, 420)
+        layout.addWidget(self.tree)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+
+    def showEvent(self, event):
+        tracer.count_bytes = True
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        tracer.count_bytes = COUNT_BYTES
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        if tracer.version == self.shown_version:
+            return
+        self.shown_version = tracer.version
+        actions = tracer.actions()
+        expanded = {
+            self.tree.topLevelItem(index).data(0, Qt.UserRole)
+            for index in range(self.tree.topLevelItemCount())
+            if self.tree.topLevelItem(index).isExpanded()
+        }
+
+        self.tree.clear()
+        for action in reversed(actions):
+            at = datetime.fromtimestamp(action.started_at).strftime("%H:%M:%S")
+            item = QTreeWidgetItem([
+                f"{at}  {action.name}", str(action.round_trips), f"{action.total_ms:.0f}",
+                str(action.rows), str(action.bytes), "", "",
+            ])
+            item.setData(0, Qt.UserRole, action.id)
+            for call in list(action.calls):
+                item.addChild(QTreeWidgetItem([
+                    f"{call['op']} {call['table']} {' '.join(call['filters'])}", "", f"{call['ms']:.0f}",
+                    str(call["rows"]), str(call["bytes"]), str(call["sent"]), call["error"] or "",
+                ]))
+            self.tree.addTopLevelItem(item)
+            item.setExpanded(action.id in expanded)
+
+        calls = sum(action.round_trips for action in actions)
+        self.summary_label.setText(f"{len(actions)} action(s), {calls} round trip(s)")
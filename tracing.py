@@ -0,0 +1,302 @@
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+from local_store import data_dir
+
+TRACE_LOG = "trace.log"
+# The log rolls over at this size, keeping a few older files next to it
+TRACE_LOG_BYTES = 1024 * 1024
+TRACE_LOG_BACKUPS = 3
+# Actions kept in memory for the developer overlay
+RECENT_ACTIONS = 100
+# Builder methods that pick the kind of request rather than narrow it
+OPERATIONS = ("select", "insert", "update", "upsert", "delete")
+# Longest filter argument kept in a trace, e.g. for in_() over many keys
+MAX_FILTER_CHARS = 80
+# Columns whose filter values are never traced: the log is meant to be shared
+SENSITIVE_COLUMNS = ("email", "password", "password_hash")
+REDACTED = "***"
+# column.operator.value terms over those columns inside an or_() filter
+SENSITIVE_TERM = re.compile(rf'\b({"|".join(SENSITIVE_COLUMNS)})\.(\w+)\.("(?:[^"\\]|\\.)*"|[^,()]*)')
+# Postgres quotes the offending value in constraint errors: Key (email)=(...) already exists
+SENSITIVE_DETAIL = re.compile(rf'\(({"|".join(SENSITIVE_COLUMNS)})\)=\([^)]*\)')
+UNATTRIBUTED = "unattributed"
+# Measuring payloads means serialising every response a second time, so it is
+# off unless asked for here or while the developer overlay is open
+COUNT_BYTES = os.getenv("ROME_TRACE_BYTES") == "1"
+
+_local = threading.local()
+
+
+class RoundTripBudgetExceeded(AssertionError):
+    pass
+
+
+def describe(value):
+    text = repr(value)
+    return text if len(text) <= MAX_FILTER_CHARS else text[:MAX_FILTER_CHARS - 3] + "..."
+
+
+def describe_filter(name, args, kwargs):
+    """name(arguments) as traced, with the values compared against sensitive columns masked."""
+    if args and args[0] in SENSITIVE_COLUMNS:
+        arguments = [describe(args[0])] + [REDACTED] * (len(args) - 1)
+    else:
+        arguments = [describe(SENSITIVE_TERM.sub(rf"\1.\2.{REDACTED}", arg) if isinstance(arg, str) else arg) for arg in args]
+    arguments += [f"{key}={describe(value)}" for key, value in kwargs.items()]
+    return f"{name}({', '.join(arguments)})"
+
+
+def payload_bytes(data):
+    """Size of data as it goes over the wire, give or take the JSON formatting."""
+    if data is None:
+        return 0
+    return len(json.dumps(data, default=str, separators=(",", ":")))
+
+
+class Action:
+    """One user action (or background job) and every Supabase call it caused."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name):
+        self.id = next(self._ids)
+        self.name = name
+        self.started_at = time.time()
+        self.calls = []
+
+    @property
+    def round_trips(self):
+        return len(self.calls)
+
+    @property
+    def total_ms(self):
+        return sum(call["ms"] for call in self.calls)
+
+    @property
+    def rows(self):
+        return sum(call["rows"] for call in self.calls)
+
+    @property
+    def bytes(self):
+        return sum(call["bytes"] + call["sent"] for call in self.calls)
+
+    def summary(self):
+        return f"{self.name}: {self.round_trips} round trip(s), {self.total_ms:.0f} ms, {self.rows} row(s), {self.bytes} bytes"
+
+
+class Tracer:
+    """
+    Records every Supabase call against the action that caused it.
+
+    The action is carried per thread: action() sets it on the UI thread, and
+    QueryRunner hands it on to the worker that runs the query and back to the
+    callbacks, so follow-up queries land in the same action. Calls are kept
+    for the developer overlay and appended to a rotating JSON-lines log in
+    the data directory (ROME_TRACE_LOG=0 turns the log off). Payload sizes
+    are only measured while count_bytes is set.
+    """
+
+    def __init__(self):
+        self.recent = deque(maxlen=RECENT_ACTIONS)
+        self.version = 0  # Bumped on every call, so the overlay knows when to redraw
+        self.count_bytes = COUNT_BYTES
+        self._lock = threading.Lock()
+        self._captures = []
+        self._log = None
+        self._log_lock = threading.Lock()
+
+    def start(self, name):
+        action = Action(name)
+        with self._lock:
+            self.recent.append(action)
+            for capture in self._captures:
+                capture.append(action)
+        return action
+
+    def record(self, call):
+        action = current_action()
+        if action is None:
+            action = self.start(UNATTRIBUTED)
+        with self._lock:
+            action.calls.append(call)
+            self.version += 1
+        self._write(dict(call, action=action.name, action_id=action.id))
+
+    def actions(self):
+        with self._lock:
+            return list(self.recent)
+
+    def clear(self):
+        with self._lock:
+            self.recent.clear()
+            self.version += 1
+
+    def _write(self, entry):
+        if self._log is None:
+            if os.getenv("ROME_TRACE_LOG") == "0":
+                return
+            self._open_log()
+        self._log.info(json.dumps(entry, default=str))
+
+    def _open_log(self):
+        # Calls finish on several worker threads; only one may add the handler
+        with self._log_lock:
+            if self._log is not None:
+                return
+            log = logging.getLogger("rome.trace")
+            log.propagate = False
+            log.setLevel(logging.INFO)
+            try:
+                handler = RotatingFileHandler(
+                    os.path.join(data_dir(), TRACE_LOG), maxBytes=TRACE_LOG_BYTES,
+                    backupCount=TRACE_LOG_BACKUPS, encoding="utf-8",
+                )
+            except OSError as e:
+                print(f"Could not open the trace log: {e}")
+                handler = logging.NullHandler()
+            log.addHandler(handler)
+            self._log = log
+
+
+tracer = Tracer()
+
+
+def current_action():
+    return getattr(_local, "action", None)
+
+
+@contextmanager
+def activate(action):
+    """Attribute calls made on this thread to action for the duration of the block."""
+    previous = current_action()
+    _local.action = action
+    try:
+        yield action
+    finally:
+        _local.action = previous
+
+
+@contextmanager
+def action(name):
+    """Start a new action for the calls made (and queries submitted) inside the block."""
+    with activate(tracer.start(name)) as started:
+        yield started
+
+
+@contextmanager
+def span(table, op, filters=(), sent=0):
+    """Time one call to Supabase. The block sets `rows` and `bytes` on the dict it is given."""
+    call = {"table": table, "op": op, "filters": list(filters), "ms": 0.0, "rows": 0, "bytes": 0, "sent": sent, "error": None}
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception as e:
+        call["error"] = SENSITIVE_DETAIL.sub(rf"(\1)=({REDACTED})", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        call["ms"] = round((time.perf_counter() - started) * 1000, 2)
+        tracer.record(call)
+
+
+class TracedQuery:
+    """
+    Wraps a postgrest request builder: notes the operation and filters as
+    they are chained on, and traces execute().
+    """
+
+    def __init__(self, builder, table):
+        self._builder = builder
+        self._table = table
+        self._op = "select"
+        self._filters = []
+        self._sent = 0
+
+    def __getattr__(self, name):
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            return attribute
+
+        def chained(*args, **kwargs):
+            if name in OPERATIONS:
+                self._op = name
+                if name != "select" and args and tracer.count_bytes:
+                    self._sent = payload_bytes(args[0])
+            else:
+                self._filters.append(describe_filter(name, args, kwargs))
+            self._builder = attribute(*args, **kwargs)
+            return self
+
+        return chained
+
+    def execute(self):
+        with span(self._table, self._op, self._filters, self._sent) as call:
+            response = self._builder.execute()
+            data = response.data
+            call["rows"] = len(data) if isinstance(data, list) else int(data is not None)
+            if tracer.count_bytes:
+                call["bytes"] = payload_bytes(data)
+        return response
+
+
+class Capture:
+    """The actions started while capture() was active."""
+
+    def __init__(self):
+        self.actions = []
+
+    def append(self, action):
+        self.actions.append(action)
+
+    def named(self, name):
+        return [action for action in self.actions if action.name == name]
+
+    def round_trips(self, name=None):
+        actions = self.actions if name is None else self.named(name)
+        return sum(action.round_trips for action in actions)
+
+    def check(self, budgets):
+        """
+        Raise RoundTripBudgetExceeded when an action made more calls than its
+        budget in {action name: round trips}. Each run of an action is checked
+        separately.
+        """
+        over = [
+            action for action in self.actions
+            if action.name in budgets and action.round_trips > budgets[action.name]
+        ]
+        if over:
+            lines = []
+            for action in over:
+                lines.append(f"{action.summary()} (budget {budgets[action.name]})")
+                lines += [f"    {call['op']} {call['table']} {' '.join(call['filters'])}" for call in action.calls]
+            raise RoundTripBudgetExceeded("\n".join(lines))
+
+
+@contextmanager
+def capture():
+    """
+    Collect the actions started inside the block, e.g. to hold them to a
+    round-trip budget once their queries have finished:
+
+        with tracing.capture() as trace:
+            tab.add_table()
+            ...wait for the tab's query_runner to go idle...
+        trace.check({"add table": 2})
+    """
+    captured = Capture()
+    with tracer._lock:
+        tracer._captures.append(captured)
+    try:
+        yield captured
+    finally:
+        with tracer._lock:
+            tracer._captures.remove(captured)
@@ -2,25 +2,20 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox, QFrame
 )
 from PyQt5.QtCore import Qt
-from supabase import create_client, Client
 import hashlib
-import os
-from dotenv import load_dotenv
-import colors
+from theme import set_role
+from database import restaurant_repo
+from workers import QueryRunner
 
-# Load environment variables
-load_dotenv()
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(supabase_url, supabase_key)
-
-def create_profile_tab(restaurant_id):
+def create_profile_tab(restaurant_id, session=None):
     class ProfileTab(QWidget):
         def __init__(self, restaurant_id):
             super().__init__()
             self.restaurant_id = restaurant_id
+            self.query_runner = QueryRunner(self)
             self.init_ui()
-            self.load_profile()
+            if session is None or not session.request("profile", self.display_profile, on_error=self.on_load_error):
+                self.load_profile()
 
         def init_ui(self):
             layout = QVBoxLayout()
@@ -35,9 +30,9 @@ def create_profile_tab(restaurant_id):
             # Name
             name_layout = QHBoxLayout()
             self.name_label = QLabel("Name:")
-            self.name_label.setStyleSheet(f"color: {colors.color_1}; font-size: 20px;")
+            set_role(self.name_label, "field-label")
             self.name_input = QLineEdit()
-            self.name_input.setStyleSheet("font-size: 20px;")
+            set_role(self.name_input, "field")
             name_layout.addWidget(self.name_label)
             name_layout.addWidget(self.name_input)
             form_layout.addLayout(name_layout)
@@ -45,9 +40,9 @@ def create_profile_tab(restaurant_id):
             # Address
             address_layout = QHBoxLayout()
             self.address_label = QLabel("Address:")
-            self.address_label.setStyleSheet(f"color: {colors.color_1}; font-size: 20px;")
+            set_role(self.address_label, "field-label")
             self.address_input = QLineEdit()
-            self.address_input.setStyleSheet("font-size: 20px;")
+            set_role(self.address_input, "field")
             address_layout.addWidget(self.address_label)
             address_layout.addWidget(self.address_input)
             form_layout.addLayout(address_layout)
@@ -55,18 +50,24 @@ def create_profile_tab(restaurant_id):
             # Contact
             contact_layout = QHBoxLayout()
             self.contact_label = QLabel("Contact:")
-            self.contact_label.setStyleSheet(f"color: {colors.color_1}; font-size: 20px;")
+            set_role(self.contact_label, "field-label")
             self.contact_input = QLineEdit()
-            self.contact_input.setStyleSheet("font-size: 20px;")
+            set_role(self.contact_input, "field")
             contact_layout.addWidget(self.contact_label)
             contact_layout.addWidget(self.contact_input)
             form_layout.addLayout(contact_layout)
 
             # Update Button
-            update_button = QPushButton("Update Profile")
-            update_button.setStyleSheet(f"background-color: {colors.color_1}; color: {colors.color_3}; padding: 10px; font-size: 20px;")
-            update_button.clicked.connect(self.update_profile)
-            form_layout.addWidget(update_button)
+            self.update_button = QPushButton("Update Profile")
+            self.update_button.setObjectName("updateProfileButton")
+            set_role(self.update_button, "primary")
+            self.update_button.clicked.connect(self.update_profile)
+            form_layout.addWidget(self.update_button)
+
+            # Inline loading / saving state
+            self.status_label = QLabel()
+            set_role(self.status_label, "status")
+            form_layout.addWidget(self.status_label)
 
             card.setLayout(form_layout)
             layout.addWidget(card)
@@ -74,34 +75,54 @@ def create_profile_tab(restaurant_id):
 
         def load_profile(self):
             """Load restaurant profile data from the database"""
-            try:
-                response = supabase.table("restaurants").select("*").eq("restaurant_id", self.restaurant_id).execute()
-                if response.data:
-                    restaurant = response.data[0]
-                    self.name_input.setText(restaurant["restaurant_name"])
-                    self.address_input.setText(restaurant["address"])
-                    self.contact_input.setText(restaurant["contact"])
-                else:
-                    print("No data found for the given restaurant_id")
-            except Exception as e:
-                print(f"Error loading profile: {str(e)}")
+            self.status_label.setText("Loading profile...")
+            self.query_runner.submit(
+                "load_profile", restaurant_repo.get_profile, self.restaurant_id,
+                on_success=self.display_profile,
+                on_error=self.on_load_error,
+            )
+
+        def display_profile(self, restaurant):
+            self.status_label.clear()
+            if restaurant:
+                self.name_input.setText(restaurant["restaurant_name"])
+                self.address_input.setText(restaurant["address"])
+                self.contact_input.setText(restaurant["contact"])
+            else:
+                print("No data found for the given restaurant_id")
+
+        def on_load_error(self, error):
+            self.status_label.setText("Could not load profile.")
+            print(f"Error loading profile: {str(error)}")
 
         def update_profile(self):
             """Update restaurant profile data in the database"""
-            try:
-                name = self.name_input.text().strip()
-                address = self.address_input.text().strip()
-                contact = self.contact_input.text().strip()
-
-                updated_data = {
-                    "restaurant_name": name,
-                    "address": address,
-                    "contact": contact,
-                }
-
-                supabase.table("restaurants").update(updated_data).eq("restaurant_id", self.restaurant_id).execute()
-                QMessageBox.information(self, "Success", "Profile updated successfully!")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to update profile: {str(e)}")
+            name = self.name_input.text().strip()
+            address = self.address_input.text().strip()
+            contact = self.contact_input.text().strip()
+
+            updated_data = {
+                "restaurant_name": name,
+                "address": address,
+                "contact": contact,
+            }
+
+            self.update_button.setEnabled(False)
+            self.status_label.setText("Saving...")
+            self.query_runner.submit(
+                "update_profile", restaurant_repo.update_profile, self.restaurant_id, updated_data,
+                on_success=self.on_profile_updated,
+                on_error=self.on_update_error,
+            )
+
+        def on_profile_updated(self, _):
+            self.update_button.setEnabled(True)
+            self.status_label.clear()
+            QMessageBox.information(self, "Success", "Profile updated successfully!")
+
+        def on_update_error(self, error):
+            self.update_button.setEnabled(True)
+            self.status_label.clear()
+            QMessageBox.critical(self, "Error", f"Failed to update profile: {str(error)}")
 
     return ProfileTab(restaurant_id)
\ No newline at end of file
@@ -0,0 +1,155 @@
+import itertools
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+import tracing
+
+
+# Queries spend their time waiting on the network, not the CPU, so size the
+# pool for concurrent requests rather than for the number of cores
+QUERY_POOL_THREADS = 8
+
+_query_pool = None
+
+
+def query_pool():
+    """Return the thread pool shared by every QueryRunner."""
+    global _query_pool
+    if _query_pool is None:
+        _query_pool = QThreadPool()
+        _query_pool.setMaxThreadCount(max(QUERY_POOL_THREADS, QThreadPool.globalInstance().maxThreadCount()))
+    return _query_pool
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object, int, object)  # key, generation, result
+    failed = pyqtSignal(object, int, object)  # key, generation, exception
+    progress = pyqtSignal(object, int, object)  # key, generation, progress value
+
+
+class QueryWorker(QRunnable):
+    """Runs a single blocking call on a pool thread and reports back through signals."""
+
+    def __init__(self, key, generation, fn, args, kwargs, action=None):
+        super().__init__()
+        self.key = key
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.action = action
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            with tracing.activate(self.action):
+                result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.key, self.generation, e)
+        else:
+            self.signals.finished.emit(self.key, self.generation, result)
+
+
+def action_name(key):
+    """Name of the action a submit key starts, e.g. "delete item" for "delete_item:42"."""
+    # Per-record keys would otherwise give every click its own action name
+    return str(key).split(":", 1)[0].replace("_", " ")
+
+
+class QueryRunner(QObject):
+    """
+    Runs data-access calls off the UI thread and delivers results back on it.
+
+    Every submission is tagged with a key. Submitting again under the same key
+    makes the earlier request stale: if it has not started it is dropped from
+    the pool, otherwise its result is ignored when it arrives.
+
+    Queries are traced under the action that submitted them; one submitted
+    outside any action starts its own, named after its key.
+    """
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or query_pool()
+        self._generations = {}
+        self._pending = {}
+        self._counter = itertools.count(1)
+
+    def submit(self, key, fn, *args, on_success=None, on_error=None, on_progress=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) on the pool and pass its result to on_success.
+        When on_progress is given, fn also receives a `progress` callable whose
+        values are delivered to on_progress on the UI thread.
+        """
+        self.cancel(key)
+        generation = next(self._counter)
+        self._generations[key] = generation
+
+        action = tracing.current_action() or tracing.tracer.start(action_name(key))
+        worker = QueryWorker(key, generation, fn, args, kwargs, action)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        if on_progress is not None:
+            signals = worker.signals
+            kwargs["progress"] = lambda value: signals.progress.emit(key, generation, value)
+            signals.progress.connect(self._on_progress)
+        was_busy = self.is_busy()
+        self._pending[key] = (worker, on_success, on_error, on_progress)
+        self.pool.start(worker)
+        if not was_busy:
+            self.busy_changed.emit(True)
+        return generation
+
+    def cancel(self, key=None):
+        """Drop the request for key, or every outstanding request when key is None."""
+        keys = list(self._pending) if key is None else [key]
+        was_busy = self.is_busy()
+        for k in keys:
+            self._generations.pop(k, None)
+            pending = self._pending.pop(k, None)
+            if pending is not None:
+                try:
+                    self.pool.tryTake(pending[0])
+                except RuntimeError:
+                    pass  # Already finished and deleted by the pool
+        if was_busy and not self.is_busy():
+            self.busy_changed.emit(False)
+
+    def is_busy(self, key=None):
+        if key is None:
+            return bool(self._pending)
+        return key in self._pending
+
+    def _take(self, key, generation):
+        if self._generations.get(key) != generation:
+            return None
+        del self._generations[key]
+        pending = self._pending.pop(key)
+        if not self._pending:
+            self.busy_changed.emit(False)
+        return pending
+
+    @pyqtSlot(object, int, object)
+    def _on_finished(self, key, generation, result):
+        pending = self._take(key, generation)
+        if pending is not None and pending[1] is not None:
+            with tracing.activate(pending[0].action):
+                pending[1](result)
+
+    @pyqtSlot(object, int, object)
+    def _on_progress(self, key, generation, value):
+        if self._generations.get(key) == generation:
+            self._pending[key][3](value)
+
+    @pyqtSlot(object, int, object)
+    def _on_failed(self, key, generation, error):
+        pending = self._take(key, generation)
+        if pending is None:
+            return
+        if pending[2] is not None:
+            with tracing.activate(pending[0].action):
+                pending[2](error)
+        else:
+            print(f"Background query '{key}' failed: {error}")